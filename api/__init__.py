@@ -3,5 +3,7 @@ API 패키지 초기화
 """
 from .store_routes import router as store_router
 from .check_company import router as company_router
+from .admin_routes import router as admin_router
+from .metrics_routes import router as metrics_router, PrometheusMiddleware
 
-__all__ = ["store_router", "company_router"]
+__all__ = ["store_router", "company_router", "admin_router", "metrics_router", "PrometheusMiddleware"]
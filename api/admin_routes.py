@@ -0,0 +1,70 @@
+import asyncio
+import hmac
+from typing import List
+from fastapi import APIRouter, Depends, Header, HTTPException
+from models.schemas import (
+    SnapshotInfo,
+    SnapshotCreateRequest,
+    SnapshotRestoreRequest,
+    VectorDBStatsResponse,
+    CompactionResponse
+)
+from services.vectordb_service import VectorDBAdminError
+from api.dependencies import get_vectordb_service
+from config import get_settings
+
+settings = get_settings()
+
+
+def verify_admin_token(x_admin_token: str = Header(default="")):
+    """
+    관리자 토큰 확인 (X-Admin-Token 헤더)
+    
+    ADMIN_TOKEN이 설정되지 않으면 관리자 API는 모두 거부됩니다.
+    """
+    if not settings.admin_token:
+        raise HTTPException(status_code=403, detail="관리자 API가 비활성화되어 있습니다. (ADMIN_TOKEN 미설정)")
+    if not hmac.compare_digest(x_admin_token, settings.admin_token):
+        raise HTTPException(status_code=401, detail="관리자 토큰이 올바르지 않습니다.")
+
+
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(verify_admin_token)])
+
+
+@router.get("/vectordb", response_model=VectorDBStatsResponse)
+async def get_vectordb_stats():
+    """벡터 DB에 저장된 가게 수와 벡터 수 조회"""
+    return VectorDBStatsResponse(**await asyncio.to_thread(get_vectordb_service().stats))
+
+
+@router.get("/snapshots", response_model=List[SnapshotInfo])
+async def list_snapshots():
+    """벡터 DB 스냅샷 목록 조회"""
+    return [SnapshotInfo(**snapshot) for snapshot in get_vectordb_service().list_snapshots()]
+
+
+@router.post("/snapshots", response_model=SnapshotInfo)
+async def create_snapshot(request: SnapshotCreateRequest):
+    """벡터 DB 스냅샷 생성"""
+    try:
+        return SnapshotInfo(**await asyncio.to_thread(get_vectordb_service().create_snapshot, request.name))
+    except VectorDBAdminError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/snapshots/restore", response_model=VectorDBStatsResponse)
+async def restore_snapshot(request: SnapshotRestoreRequest):
+    """스냅샷으로 벡터 DB 복원"""
+    try:
+        return VectorDBStatsResponse(**await asyncio.to_thread(get_vectordb_service().restore_snapshot, request.name))
+    except VectorDBAdminError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/compact", response_model=CompactionResponse)
+async def compact_vectordb():
+    """벡터 DB 온라인 압축"""
+    try:
+        return CompactionResponse(**await asyncio.to_thread(get_vectordb_service().compact))
+    except VectorDBAdminError as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -1,12 +1,33 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File
+import json
+import logging
+from typing import List
+from fastapi import APIRouter, HTTPException, UploadFile, File, Query
+from fastapi.responses import StreamingResponse
 from config import get_settings
-from services.ocr_service import get_ocr_service
-from models.schemas import OCRResponse, PDFOCRResponse, BusinessInfoResponse
+from services.metrics import observe_stage
+from services.ocr_pool import OCRQueueFullError, OCRTimeoutError
+from services.service_registry import ServiceNotReadyError
+from api.dependencies import get_ocr_cache, get_ocr_pool
+from services.pdf_service import PDFOCRService
+from models.schemas import (
+  OCRResponse,
+  PDFOCRResponse,
+  PDFPageResult,
+  BusinessInfoResponse,
+  BatchBusinessInfoResult,
+  BatchBusinessInfoResponse
+)
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/company", tags=["company"])
 
 settings = get_settings()
 
+# 사업자등록증 이미지 업로드 제한
+MAX_IMAGE_FILE_SIZE = 10 * 1024 * 1024
+SUPPORTED_IMAGE_FORMATS = ['image/jpeg', 'image/png', 'image/gif', 'image/bmp']
+
 @router.post("/ocr", response_model=BusinessInfoResponse)
 async def extract_text_from_image(file: UploadFile = File(...)):
   """
@@ -23,38 +44,208 @@ async def extract_text_from_image(file: UploadFile = File(...)):
   """
   try:
     # 파일 크기 확인 (최대 10MB)
-    max_file_size = 10 * 1024 * 1024
-    file_content = await file.read()
+    with observe_stage("ocr", "upload"):
+      file_content = await file.read()
     
-    if len(file_content) > max_file_size:
+    if len(file_content) > MAX_IMAGE_FILE_SIZE:
       raise HTTPException(
         status_code=400,
         detail="파일 크기가 너무 큽니다. (최대 10MB)"
       )
     
     # 지원 형식 확인
-    supported_formats = ['image/jpeg', 'image/png', 'image/gif', 'image/bmp']
-    if file.content_type not in supported_formats:
+    if file.content_type not in SUPPORTED_IMAGE_FORMATS:
       raise HTTPException(
         status_code=400,
-        detail=f"지원하지 않는 형식입니다. 지원 형식: {supported_formats}"
+        detail=f"지원하지 않는 형식입니다. 지원 형식: {SUPPORTED_IMAGE_FORMATS}"
       )
     
-    # OCR 서비스 인스턴스 획득
-    ocr_service = get_ocr_service()
-    
-    # OCR 수행
-    ocr_result = ocr_service.extract_text_from_image(file_content)
-    
-    # OCR 텍스트에서 사업자등록증 정보 파싱
-    parsed_info = ocr_service.parse_business_registration_info(ocr_result['text'])
+    # 같은 이미지면 캐시된 결과 반환, 아니면 OCR 워커 풀에서 OCR 수행 및 사업자등록증 정보 파싱
+    # (동시에 올라온 같은 이미지는 OCR 작업 하나로 합침)
+    parsed_info = await get_ocr_cache().get_or_extract(
+      file_content,
+      lambda image_bytes: get_ocr_pool().extract_business_info(image_bytes)
+    )
     
     return BusinessInfoResponse(**parsed_info)
   
-  except HTTPException:
+  except (HTTPException, ServiceNotReadyError):
     raise
+  except OCRQueueFullError as e:
+    raise HTTPException(
+      status_code=503,
+      detail="OCR 요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요.",
+      headers={"Retry-After": str(e.retry_after)}
+    )
+  except OCRTimeoutError as e:
+    raise HTTPException(
+      status_code=504,
+      detail=str(e)
+    )
   except Exception as e:
     raise HTTPException(
       status_code=500,
       detail=f"OCR 처리 중 오류가 발생했습니다: {str(e)}"
-    )
\ No newline at end of file
+    )
+
+
+@router.post("/ocr/batch", response_model=BatchBusinessInfoResponse)
+async def extract_text_from_images(files: List[UploadFile] = File(...)):
+  """
+  여러 사진 파일에서 사업자등록증 정보를 한 번에 추출
+  
+  - 이미지를 OCR_BATCH_SIZE개씩 묶어 워커에서 배치로 검출/인식합니다.
+  - 결과는 업로드 순서대로 반환하며, 파일별로 실패하면 해당 항목에 error가 채워집니다.
+  - 이미 인식한 이미지는 OCR 결과 캐시에서 바로 반환합니다.
+  
+  Args:
+      files: 업로드된 이미지 파일 목록 (최대 OCR_BATCH_MAX_FILES개)
+      
+  Returns:
+      BatchBusinessInfoResponse: 파일별 사업자등록증 정보 또는 에러
+  """
+  if len(files) > settings.ocr_batch_max_files:
+    raise HTTPException(
+      status_code=400,
+      detail=f"파일이 너무 많습니다. (최대 {settings.ocr_batch_max_files}개)"
+    )
+  
+  results = [BatchBusinessInfoResult(index=index, filename=file.filename) for index, file in enumerate(files)]
+  
+  # 파일별 크기/형식 확인 (잘못된 파일은 해당 항목만 실패 처리)
+  contents = {}
+  with observe_stage("ocr_batch", "upload"):
+    for index, file in enumerate(files):
+      if file.content_type not in SUPPORTED_IMAGE_FORMATS:
+        results[index].error = f"지원하지 않는 형식입니다. 지원 형식: {SUPPORTED_IMAGE_FORMATS}"
+        continue
+      file_content = await file.read()
+      if len(file_content) > MAX_IMAGE_FILE_SIZE:
+        results[index].error = "파일 크기가 너무 큽니다. (최대 10MB)"
+        continue
+      contents[index] = file_content
+  
+  if contents:
+    try:
+      entries = await get_ocr_cache().get_or_extract_many(
+        list(contents.values()),
+        lambda images: get_ocr_pool().extract_business_info_batch(images)
+      )
+    except ServiceNotReadyError:
+      raise
+    except OCRQueueFullError as e:
+      raise HTTPException(
+        status_code=503,
+        detail="OCR 요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요.",
+        headers={"Retry-After": str(e.retry_after)}
+      )
+    except OCRTimeoutError as e:
+      raise HTTPException(status_code=504, detail=str(e))
+    except Exception as e:
+      raise HTTPException(
+        status_code=500,
+        detail=f"OCR 처리 중 오류가 발생했습니다: {str(e)}"
+      )
+    
+    for index, entry in zip(contents, entries):
+      if entry["error"] is not None:
+        results[index].error = entry["error"]
+      else:
+        results[index].info = BusinessInfoResponse(**entry["info"])
+  
+  return BatchBusinessInfoResponse(results=results)
+
+
+@router.post("/pdf-ocr", response_model=PDFOCRResponse)
+async def extract_text_from_pdf(
+  file: UploadFile = File(...),
+  stream: bool = Query(False, description="페이지별 결과를 NDJSON으로 스트리밍")
+):
+  """
+  PDF 파일의 모든 페이지에서 OCR로 텍스트 추출
+  
+  - 페이지를 한 장씩 래스터화해서 OCR 워커들이 병렬로 인식합니다.
+  - stream=true이면 페이지가 인식되는 대로 PDFPageResult를 한 줄씩(application/x-ndjson) 반환합니다.
+  
+  Args:
+      file: 업로드된 PDF 파일
+      stream: 페이지별 스트리밍 여부
+      
+  Returns:
+      PDFOCRResponse: 전체 텍스트와 페이지별 결과
+  """
+  max_file_size = settings.pdf_ocr_max_file_size_mb * 1024 * 1024
+  with observe_stage("pdf_ocr", "upload"):
+    file_content = await file.read()
+  
+  if len(file_content) > max_file_size:
+    raise HTTPException(
+      status_code=400,
+      detail=f"파일 크기가 너무 큽니다. (최대 {settings.pdf_ocr_max_file_size_mb}MB)"
+    )
+  
+  if file.content_type != 'application/pdf':
+    raise HTTPException(
+      status_code=400,
+      detail="지원하지 않는 형식입니다. 지원 형식: ['application/pdf']"
+    )
+  
+  pages = PDFOCRService(get_ocr_pool()).iter_pages(file_content)
+  
+  try:
+    # 첫 페이지까지 처리해서 대기열 초과, 손상된 PDF 등을 응답 전에 확인
+    with observe_stage("pdf_ocr", "first_page"):
+      first_page = await pages.__anext__()
+  except StopAsyncIteration:
+    first_page = None
+  except OCRQueueFullError as e:
+    raise HTTPException(
+      status_code=503,
+      detail="OCR 요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요.",
+      headers={"Retry-After": str(e.retry_after)}
+    )
+  except OCRTimeoutError as e:
+    raise HTTPException(status_code=504, detail=str(e))
+  except Exception as e:
+    raise HTTPException(
+      status_code=500,
+      detail=f"PDF OCR 처리 중 오류가 발생했습니다: {str(e)}"
+    )
+  
+  if stream:
+    async def page_stream():
+      try:
+        if first_page is not None:
+          yield PDFPageResult(**first_page).model_dump_json() + "\n"
+          async for page in pages:
+            yield PDFPageResult(**page).model_dump_json() + "\n"
+      except Exception as e:
+        logger.error(f"PDF OCR 스트리밍 중 에러: {str(e)}")
+        yield json.dumps({"error": str(e)}, ensure_ascii=False) + "\n"
+      finally:
+        await pages.aclose()
+    
+    return StreamingResponse(page_stream(), media_type="application/x-ndjson")
+  
+  page_results = []
+  try:
+    if first_page is not None:
+      page_results.append(PDFPageResult(**first_page))
+      async for page in pages:
+        page_results.append(PDFPageResult(**page))
+  except Exception as e:
+    logger.error(f"PDF OCR 처리 중 에러: {str(e)}")
+    return PDFOCRResponse(
+      success=False,
+      text="\n".join(page.text for page in page_results),
+      pages=page_results,
+      error=str(e)
+    )
+  finally:
+    await pages.aclose()
+  
+  return PDFOCRResponse(
+    success=True,
+    text="\n".join(page.text for page in page_results),
+    pages=page_results
+  )
@@ -0,0 +1,182 @@
+"""
+API에서 사용하는 서비스 인스턴스 관리
+
+모델과 클라이언트는 main.py의 lifespan에서 registry.load_all()로 병렬 로드됩니다.
+라우터는 아래 get_* 함수로 인스턴스를 가져오며, 아직 준비되지 않았으면
+ServiceNotReadyError(503)가 발생합니다.
+
+INFERENCE_SERVER_ENABLED=true이면 임베딩/OCR은 워커에서 로드하지 않고
+공유 추론 서버(python -m services.inference_server)에 요청하는 구현으로 대체됩니다.
+"""
+from config import get_settings
+from services.answer_cache import AnswerCache
+from services.context_builder import ContextBuilder
+from services.keyed_lock import KeyedLock
+from services.service_registry import ServiceRegistry
+from services.single_flight import SingleFlight
+
+settings = get_settings()
+registry = ServiceRegistry()
+
+# 모델 로드가 필요 없는 가벼운 구성 요소
+answer_cache = AnswerCache()
+context_builder = ContextBuilder()
+# 같은 가게에 대한 같은 질문이 동시에 들어오면 답변 생성을 한 번만 수행
+question_flight = SingleFlight("question")
+# 같은 가게의 등록(변경분 계산 -> 임베딩 -> 반영)을 직렬화
+store_write_lock = KeyedLock()
+
+_embedding_batcher = None
+_sentence_parser = None
+_ocr_cache = None
+_inference_client = None
+_registration_jobs = None
+
+
+def _get_inference_client():
+    """임베딩/OCR이 함께 쓰는 추론 서버 클라이언트 (연결 풀 공유)"""
+    global _inference_client
+    if _inference_client is None:
+        from services.inference_client import InferenceClient
+        _inference_client = InferenceClient()
+    return _inference_client
+
+
+def _load_gemma():
+    from services.gemma_service import GemmaService
+    return GemmaService()
+
+
+def _load_embedding():
+    if settings.inference_server_enabled:
+        from services.inference_client import RemoteEmbeddingService
+        return RemoteEmbeddingService(_get_inference_client())
+    from services.embedding_service import EmbeddingService
+    return EmbeddingService()
+
+
+def _load_vectordb():
+    from services.vectordb_service import VectorDBService
+    service = VectorDBService()
+    # 가게 문서가 바뀌면 해당 가게의 답변 캐시 무효화
+    service.add_change_listener(answer_cache.invalidate)
+    return service
+
+
+def _load_ocr():
+    if settings.inference_server_enabled:
+        from services.inference_client import RemoteOCRPool
+        return RemoteOCRPool(_get_inference_client())
+    from services.ocr_pool import OCRWorkerPool
+    return OCRWorkerPool()
+
+
+async def _warmup_gemma(service) -> None:
+    await service.warmup()
+
+
+async def _close_gemma(service) -> None:
+    await service.aclose()
+
+
+def _warmup_embedding(service) -> None:
+    service.warmup()
+
+
+async def _warmup_ocr(pool) -> None:
+    await pool.warmup()
+
+
+def _close_ocr(pool) -> None:
+    pool.shutdown()
+
+
+registry.register("gemma", _load_gemma, warmup=_warmup_gemma, closer=_close_gemma)
+registry.register("embedding", _load_embedding, warmup=_warmup_embedding)
+registry.register("vectordb", _load_vectordb)
+registry.register("ocr", _load_ocr, warmup=_warmup_ocr, closer=_close_ocr)
+
+
+def get_gemma_service():
+    """GemmaService 인스턴스"""
+    return registry.get("gemma")
+
+
+def get_embedding_service():
+    """EmbeddingService 인스턴스 (추론 서버 사용 시 RemoteEmbeddingService)"""
+    return registry.get("embedding")
+
+
+def get_vectordb_service():
+    """VectorDBService 인스턴스"""
+    return registry.get("vectordb")
+
+
+def get_ocr_pool():
+    """OCRWorkerPool 인스턴스 (추론 서버 사용 시 RemoteOCRPool)"""
+    return registry.get("ocr")
+
+
+def get_embedding_batcher():
+    """EmbeddingService 앞단의 EmbeddingBatcher 인스턴스"""
+    global _embedding_batcher
+    if _embedding_batcher is None:
+        from services.embedding_batcher import EmbeddingBatcher
+        _embedding_batcher = EmbeddingBatcher(get_embedding_service())
+    return _embedding_batcher
+
+
+def get_sentence_parser():
+    """SentenceParser 인스턴스"""
+    global _sentence_parser
+    if _sentence_parser is None:
+        from services.sentence_segmenter import SentenceParser
+        _sentence_parser = SentenceParser(get_gemma_service())
+    return _sentence_parser
+
+
+def get_ocr_cache():
+    """OCRResultCache 인스턴스 (disk 백엔드의 디렉토리 스캔을 첫 사용 시점으로 미룸)"""
+    global _ocr_cache
+    if _ocr_cache is None:
+        from services.ocr_cache import OCRResultCache
+        _ocr_cache = OCRResultCache()
+    return _ocr_cache
+
+
+def get_registration_jobs():
+    """RegistrationJobQueue 인스턴스 (SQLite 파일은 첫 사용 시점에 열림)"""
+    global _registration_jobs
+    if _registration_jobs is None:
+        from services.registration_jobs import RegistrationJobQueue
+        _registration_jobs = RegistrationJobQueue()
+    return _registration_jobs
+
+
+def get_loaded_components() -> dict:
+    """
+    이미 만들어진 구성 요소만 반환 (메트릭 수집용, 로드나 생성을 유발하지 않음)
+    
+    Returns:
+        {"embedding": EmbeddingService | None, "ocr": OCRWorkerPool | None,
+         "embedding_batcher": EmbeddingBatcher | None, "ocr_cache": OCRResultCache | None,
+         "registration_jobs": RegistrationJobQueue | None}
+    """
+    return {
+        "embedding": registry.get_if_loaded("embedding"),
+        "ocr": registry.get_if_loaded("ocr"),
+        "embedding_batcher": _embedding_batcher,
+        "ocr_cache": _ocr_cache,
+        "registration_jobs": _registration_jobs
+    }
+
+
+async def shutdown() -> None:
+    """배치/등록 작업 워커와 로드된 구성 요소 종료"""
+    if _registration_jobs is not None:
+        await _registration_jobs.aclose()
+    if _embedding_batcher is not None:
+        await _embedding_batcher.aclose()
+    await registry.close_all()
+    if _inference_client is not None:
+        _inference_client.close()
@@ -0,0 +1,104 @@
+"""
+Prometheus 메트릭 엔드포인트와 HTTP 요청 계측 미들웨어
+"""
+import time
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.registry import Collector
+from services.metrics import HTTP_REQUEST_LATENCY, HTTP_REQUESTS_IN_FLIGHT
+from api.dependencies import answer_cache, get_loaded_components, registry
+
+router = APIRouter(tags=["metrics"])
+
+
+class PrometheusMiddleware:
+    """
+    요청별 처리 시간과 처리 중인 요청 수 기록 (순수 ASGI 미들웨어)
+
+    route 라벨은 경로 템플릿(예: /store/question)을 사용해서 라벨 수가 늘어나지 않게 합니다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            route = scope.get("route")
+            HTTP_REQUEST_LATENCY.labels(
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                str(status_code)
+            ).observe(time.perf_counter() - started)
+
+
+class ServiceStatsCollector(Collector):
+    """
+    서비스가 이미 집계하고 있는 캐시/대기열 통계를 /metrics 조회 시점에 읽어 오는 수집기
+
+    요청 처리 경로에서 따로 카운터를 올리지 않으므로 오버헤드가 없습니다.
+    """
+
+    def collect(self):
+        components = get_loaded_components()
+
+        cache_hits = CounterMetricFamily("chatbot_cache_hits", "캐시 적중 수", labels=["cache"])
+        cache_misses = CounterMetricFamily("chatbot_cache_misses", "캐시 미스 수", labels=["cache"])
+        cache_entries = GaugeMetricFamily("chatbot_cache_entries", "캐시 항목 수", labels=["cache"])
+        caches = {"answer": answer_cache.stats()}
+        if components["embedding"] is not None:
+            caches["query_embedding"] = components["embedding"].cache_stats()
+        if components["ocr_cache"] is not None:
+            caches["ocr"] = components["ocr_cache"].stats()
+        for name, stats in caches.items():
+            cache_hits.add_metric([name], stats["hits"])
+            cache_misses.add_metric([name], stats["misses"])
+            cache_entries.add_metric([name], stats["entries"])
+        yield cache_hits
+        yield cache_misses
+        yield cache_entries
+
+        queue_depth = GaugeMetricFamily("chatbot_queue_depth", "대기열에 쌓인 작업 수", labels=["queue"])
+        queue_capacity = GaugeMetricFamily("chatbot_queue_capacity", "대기열 최대 작업 수", labels=["queue"])
+        if components["embedding_batcher"] is not None:
+            queue_depth.add_metric(["embedding_batcher"], components["embedding_batcher"].stats()["queue_depth"])
+        if components["ocr"] is not None:
+            # 실행 중 + 대기 중인 OCR 작업 (capacity를 넘으면 503)
+            queue_depth.add_metric(["ocr"], components["ocr"].pending)
+            queue_capacity.add_metric(["ocr"], components["ocr"].capacity)
+        if components["registration_jobs"] is not None:
+            # 파일 큐 기준이므로 다른 워커 프로세스가 넣은 작업도 포함
+            queue_depth.add_metric(["register_jobs"], components["registration_jobs"].store.counts()["queued"])
+        yield queue_depth
+        yield queue_capacity
+
+        ready = GaugeMetricFamily("chatbot_component_ready", "구성 요소 준비 여부 (1: ready)", labels=["component"])
+        for name, state in registry.status().items():
+            ready.add_metric([name], 1 if state["status"] == "ready" else 0)
+        yield ready
+
+
+REGISTRY.register(ServiceStatsCollector())
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus 텍스트 형식 메트릭"""
+    return Response(generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
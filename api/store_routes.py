@@ -1,57 +1,190 @@
+import asyncio
+import json
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import JSONResponse, StreamingResponse
 from models import (
     StoreRegistrationRequest,
     StoreRegistrationResponse,
+    RegistrationJobAccepted,
+    RegistrationJobStatus,
+    StoreBatchRegistrationRequest,
+    StoreBatchRegistrationItem,
+    StoreBatchRegistrationResponse,
     QuestionRequest,
     QuestionResponse
 )
-from services import GemmaService, EmbeddingService, VectorDBService
+from services.answer_cache import AnswerCache
+from services.faq import faq_documents, faq_store_id, is_faq_store_id, split_faq_document
+from services.metrics import QUESTION_ANSWERS, observe_stage
+from services.service_registry import ServiceNotReadyError
+from services.text_utils import normalize_text
+from services.vectordb_service import StoreDocumentDiff
+from api.dependencies import (
+    answer_cache,
+    context_builder,
+    question_flight,
+    store_write_lock,
+    get_gemma_service,
+    get_embedding_service,
+    get_embedding_batcher,
+    get_vectordb_service,
+    get_sentence_parser,
+    get_registration_jobs
+)
 from config import get_settings
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/store", tags=["store"])
 
-# 서비스 인스턴스
-gemma_service = GemmaService()
-embedding_service = EmbeddingService()
-vectordb_service = VectorDBService()
 settings = get_settings()
 
 
-@router.post("/register", response_model=StoreRegistrationResponse)
+async def _embed_added(diffs: List[StoreDocumentDiff], batch_size: int = None) -> dict:
+    """
+    변경분 중 새로 추가되는 문장만 임베딩
+    
+    Args:
+        diffs: 가게별 문서 변경분
+        batch_size: 지정하면 배칭 큐를 거치지 않고 이 배치 크기로 한 번에 임베딩
+        
+    Returns:
+        {문서 ID: 임베딩 벡터}
+    """
+    added_ids = [doc_id for diff in diffs for doc_id in diff.added]
+    if not added_ids:
+        return {}
+    
+    # FAQ 문서("질문\n답변")는 질문만 임베딩
+    added_sentences = [
+        split_faq_document(diff.added[doc_id])[0] if is_faq_store_id(diff.store_id) else diff.added[doc_id]
+        for diff in diffs
+        for doc_id in diff.added
+    ]
+    if batch_size:
+        embeddings = await asyncio.to_thread(get_embedding_service().encode, added_sentences, batch_size)
+    else:
+        embeddings = await get_embedding_batcher().encode(added_sentences)
+    return dict(zip(added_ids, embeddings.tolist()))
+
+
+async def _save_sentences(store_id: str, sentences: List[str], faqs: List[str] = None) -> StoreDocumentDiff:
+    """
+    파싱된 문장과 FAQ를 벡터 DB에 반영 (바뀐 문장만 임베딩/추가/삭제)
+    
+    Args:
+        store_id: 가게 ID
+        sentences: 파싱된 문장 리스트
+        faqs: FAQ 문서 리스트 (None이면 기존 FAQ 유지)
+        
+    Returns:
+        가게 문장의 StoreDocumentDiff
+    """
+    store_documents = {store_id: sentences}
+    if faqs is not None:
+        store_documents[faq_store_id(store_id)] = faqs
+    
+    async with store_write_lock.hold(store_documents):
+        with observe_stage("register", "plan"):
+            diffs = await asyncio.to_thread(get_vectordb_service().plan_updates, store_documents)
+        with observe_stage("register", "embed"):
+            embeddings = await _embed_added(list(diffs.values()))
+        with observe_stage("register", "write"):
+            await asyncio.to_thread(get_vectordb_service().apply_updates, list(diffs.values()), embeddings)
+    return diffs[store_id]
+
+
+def _validate_store_id(store_id: str) -> None:
+    """FAQ 저장용 가게 ID와 겹치는 가게 ID 거부"""
+    if is_faq_store_id(store_id):
+        raise HTTPException(
+            status_code=400,
+            detail=f"가게 ID는 '{faq_store_id('')}'로 끝날 수 없습니다."
+        )
+
+
+async def _register(request: StoreRegistrationRequest) -> StoreRegistrationResponse:
+    """문장 분리 -> 변경분 임베딩 -> 벡터 DB 반영 (동기 등록과 등록 작업 워커가 함께 사용)"""
+    faqs = faq_documents(request.faqs) if request.faqs is not None else None
+    
+    # 1. 텍스트를 의미 단위로 파싱
+    with observe_stage("register", "parse"):
+        sentences, segmentation_mode = await get_sentence_parser().parse(request.description)
+    
+    if not sentences:
+        raise HTTPException(
+            status_code=400,
+            detail="텍스트 파싱 결과가 비어있습니다."
+        )
+    
+    # 2. 변경된 문장만 임베딩하여 ChromaDB에 반영
+    diff = await _save_sentences(request.store_id, sentences, faqs)
+    
+    return StoreRegistrationResponse(
+        store_id=request.store_id,
+        parsed_sentences=sentences,
+        message=f"가게 정보가 성공적으로 등록되었습니다. (총 {len(sentences)}개 문장)",
+        segmentation_mode=segmentation_mode,
+        added_count=len(diff.added),
+        kept_count=len(diff.kept),
+        removed_count=len(diff.removed),
+        faq_count=len(faqs) if faqs is not None else None
+    )
+
+
+async def run_registration_job(request_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    등록 작업 워커에서 저장된 요청 하나를 처리
+    
+    Returns:
+        작업 결과로 저장할 StoreRegistrationResponse
+    """
+    try:
+        response = await _register(StoreRegistrationRequest(**request_data))
+    except HTTPException as e:
+        raise ValueError(e.detail)
+    return response.model_dump()
+
+
+@router.post(
+    "/register",
+    response_model=StoreRegistrationResponse,
+    responses={202: {"model": RegistrationJobAccepted, "description": "등록 작업 접수 (REGISTER_JOBS_ENABLED=true)"}}
+)
 async def register_store(request: StoreRegistrationRequest):
     """
     소상공인 가게 정보를 등록하는 API
     
-    1. Gemma API를 사용하여 가게 소개를 의미 단위로 파싱
-    2. 각 문장을 임베딩하여 ChromaDB에 저장
+    1. 가게 소개를 문장 단위로 분리 (규칙 기반, 비정형 텍스트는 Gemma API)
+    2. 기존에 등록된 문장과 비교해서 새 문장만 임베딩하여 ChromaDB에 저장하고,
+       없어진 문장은 삭제
+    3. faqs가 있으면 FAQ 질문을 임베딩해서 함께 저장 (생략하면 기존 FAQ 유지)
+    
+    REGISTER_JOBS_ENABLED=true이면 요청을 작업 큐에 넣고 202와 작업 ID를 바로 반환합니다.
+    진행 상황과 결과는 GET /store/register/{job_id}로 조회합니다.
     """
     try:
-        # 1. 텍스트를 의미 단위로 파싱
-        sentences = gemma_service.parse_text_to_sentences(request.description)
+        _validate_store_id(request.store_id)
         
-        if not sentences:
-            raise HTTPException(
-                status_code=400,
-                detail="텍스트 파싱 결과가 비어있습니다."
+        if settings.register_jobs_enabled:
+            job = await get_registration_jobs().enqueue(request.store_id, request.model_dump())
+            return JSONResponse(
+                status_code=202,
+                content=RegistrationJobAccepted(
+                    job_id=job.job_id,
+                    store_id=job.store_id,
+                    status=job.status
+                ).model_dump()
             )
         
-        # 2. 각 문장을 임베딩
-        embeddings = embedding_service.encode(sentences)
+        return await _register(request)
         
-        # 3. ChromaDB에 저장
-        vectordb_service.add_documents(
-            store_id=request.store_id,
-            documents=sentences,
-            embeddings=embeddings.tolist()
-        )
-        
-        return StoreRegistrationResponse(
-            store_id=request.store_id,
-            parsed_sentences=sentences,
-            message=f"가게 정보가 성공적으로 등록되었습니다. (총 {len(sentences)}개 문장)"
-        )
-        
-    except HTTPException:
+    except (HTTPException, ServiceNotReadyError):
         raise
     except Exception as e:
         raise HTTPException(
@@ -60,50 +193,411 @@ async def register_store(request: StoreRegistrationRequest):
         )
 
 
+@router.get("/register/{job_id}", response_model=RegistrationJobStatus)
+async def get_registration_job(job_id: str):
+    """
+    가게 정보 등록 작업 상태 조회
+    
+    status는 queued | running | succeeded | failed이며, 성공하면 result에
+    동기 등록 응답과 같은 내용(parsed_sentences 등)이, 실패하면 error에 사유가 담깁니다.
+    """
+    if not settings.register_jobs_enabled:
+        raise HTTPException(status_code=404, detail="등록 작업 모드가 꺼져 있습니다.")
+    
+    job = await get_registration_jobs().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"등록 작업을 찾을 수 없습니다: {job_id}")
+    
+    return RegistrationJobStatus(
+        job_id=job.job_id,
+        store_id=job.store_id,
+        status=job.status,
+        attempts=job.attempts,
+        created_at=datetime.fromtimestamp(job.created_at).isoformat(),
+        updated_at=datetime.fromtimestamp(job.updated_at).isoformat(),
+        result=StoreRegistrationResponse(**job.result) if job.result is not None else None,
+        error=job.error
+    )
+
+
+@router.post("/register-batch", response_model=StoreBatchRegistrationResponse)
+async def register_stores_batch(request: StoreBatchRegistrationRequest):
+    """
+    여러 가게 정보를 한 번에 등록하는 API
+    
+    1. 문장 분리를 병렬로 수행 (Gemma API 호출은 동시 실행 수 제한)
+    2. 모든 가게의 새 문장을 큰 배치로 한 번에 임베딩
+    3. ChromaDB에 일괄 삭제 1회, 일괄 추가 1회로 저장
+    
+    가게별 성공/실패 여부를 반환합니다.
+    """
+    semaphore = asyncio.Semaphore(settings.register_batch_parse_concurrency)
+    
+    async def parse(store: StoreRegistrationRequest):
+        if is_faq_store_id(store.store_id):
+            raise ValueError(f"가게 ID는 '{faq_store_id('')}'로 끝날 수 없습니다.")
+        async with semaphore:
+            sentences, segmentation_mode = await get_sentence_parser().parse(store.description)
+        if not sentences:
+            raise ValueError("텍스트 파싱 결과가 비어있습니다.")
+        return sentences, segmentation_mode
+    
+    # 1. 병렬 파싱 (가게별 예외는 결과로 수집)
+    with observe_stage("register_batch", "parse"):
+        parsed = await asyncio.gather(
+            *(parse(store) for store in request.stores),
+            return_exceptions=True
+        )
+    
+    items = []
+    store_sentences = {}
+    for store, result in zip(request.stores, parsed):
+        if isinstance(result, Exception):
+            items.append(StoreBatchRegistrationItem(
+                store_id=store.store_id,
+                success=False,
+                error=f"가게 등록 중 오류 발생: {str(result)}"
+            ))
+        else:
+            # 같은 store_id가 여러 번 오면 마지막 요청이 반영됨
+            sentences, segmentation_mode = result
+            store_sentences[store.store_id] = sentences
+            faqs = None
+            if store.faqs is not None:
+                faqs = faq_documents(store.faqs)
+                store_sentences[faq_store_id(store.store_id)] = faqs
+            else:
+                store_sentences.pop(faq_store_id(store.store_id), None)
+            items.append(StoreBatchRegistrationItem(
+                store_id=store.store_id,
+                success=True,
+                parsed_sentences=sentences,
+                segmentation_mode=segmentation_mode,
+                faq_count=len(faqs) if faqs is not None else None
+            ))
+    
+    try:
+        if store_sentences:
+            async with store_write_lock.hold(store_sentences):
+                # 2. 변경분 계산 후 새 문장만 한 번에 임베딩
+                with observe_stage("register_batch", "plan"):
+                    diffs = await asyncio.to_thread(get_vectordb_service().plan_updates, store_sentences)
+                with observe_stage("register_batch", "embed"):
+                    embeddings = await _embed_added(
+                        list(diffs.values()),
+                        batch_size=settings.register_batch_embedding_batch_size
+                    )
+                
+                # 3. 일괄 반영
+                with observe_stage("register_batch", "write"):
+                    await asyncio.to_thread(get_vectordb_service().apply_updates, list(diffs.values()), embeddings)
+            
+            for item in items:
+                if item.success:
+                    diff = diffs[item.store_id]
+                    item.added_count = len(diff.added)
+                    item.kept_count = len(diff.kept)
+                    item.removed_count = len(diff.removed)
+    except Exception as e:
+        logger.error(f"일괄 등록 저장 중 오류: {str(e)}")
+        for item in items:
+            if item.success:
+                item.success = False
+                item.parsed_sentences = []
+                item.error = f"가게 등록 중 오류 발생: {str(e)}"
+    
+    succeeded = sum(1 for item in items if item.success)
+    return StoreBatchRegistrationResponse(
+        results=items,
+        succeeded=succeeded,
+        failed=len(items) - succeeded
+    )
+
+
+@dataclass
+class RetrievedContext:
+    """질문에 대한 검색 결과"""
+    context: str
+    question_embedding: np.ndarray
+    document_ids: List[str]
+    stats: Dict[str, int] = field(default_factory=dict)  # ContextBuilder 문장 선택 통계
+    
+    @property
+    def cache_key(self) -> str:
+        return AnswerCache.make_context_key(self.document_ids)
+
+
+async def _embed_question(question: str, operation: str = "question") -> np.ndarray:
+    """질문 임베딩"""
+    with observe_stage(operation, "embed"):
+        return await get_embedding_batcher().encode_single(question)
+
+
+async def _match_faq(store_id: str, question_embedding: np.ndarray, operation: str = "question") -> Optional[str]:
+    """
+    가장 가까운 FAQ 질문과의 코사인 유사도가 임계값 이상이면 그 FAQ 답변 반환
+    
+    Returns:
+        FAQ 답변 (FAQ 비활성화, FAQ 없음, 임계값 미만이면 None)
+    """
+    if not settings.faq_enabled:
+        return None
+    with observe_stage(operation, "faq_lookup"):
+        # numpy 백엔드는 행렬 스캔이므로 이벤트 루프 밖에서 검색
+        results = await asyncio.to_thread(
+            get_vectordb_service().search_similar,
+            store_id=faq_store_id(store_id),
+            query_embedding=[question_embedding.tolist()],
+            n_results=1
+        )
+    if not results['documents'] or not results['documents'][0]:
+        return None
+    if 1.0 - results['distances'][0][0] < settings.faq_similarity_threshold:
+        return None
+    return split_faq_document(results['documents'][0][0])[1]
+
+
+async def _retrieve_context(
+    store_id: str,
+    question: str,
+    operation: str = "question",
+    question_embedding: np.ndarray = None
+) -> RetrievedContext:
+    """
+    질문과 관련된 가게 정보를 검색하여 컨텍스트 구성
+    
+    Args:
+        store_id: 가게 ID
+        question: 사용자 질문
+        operation: 단계별 지연 메트릭에 사용할 요청 이름
+        question_embedding: 이미 계산한 질문 임베딩 (없으면 새로 임베딩)
+        
+    Returns:
+        답변 생성에 사용할 컨텍스트와 질문 임베딩, 컨텍스트에 사용한 문서 ID
+    """
+    # 1. 질문 임베딩
+    if question_embedding is None:
+        question_embedding = await _embed_question(question, operation)
+    
+    # 2. 벡터 DB에서 관련 정보 검색
+    with observe_stage(operation, "search"):
+        results = await asyncio.to_thread(
+            get_vectordb_service().search_similar,
+            store_id=store_id,
+            query_embedding=[question_embedding.tolist()],
+            n_results=settings.search_n_results,
+            include_embeddings=True
+        )
+    
+    # 3. 검색 결과 확인
+    if not results['documents'] or not results['documents'][0]:
+        raise HTTPException(
+            status_code=404,
+            detail=f"가게 ID '{store_id}'에 대한 정보를 찾을 수 없습니다."
+        )
+    
+    # 4. 컨텍스트 구성 (먼 문장/중복 문장 제외, 토큰 예산 적용)
+    with observe_stage(operation, "context"):
+        embeddings = results.get('embeddings')
+        built = context_builder.build(
+            ids=results['ids'][0],
+            documents=results['documents'][0],
+            distances=results['distances'][0],
+            embeddings=embeddings[0] if embeddings is not None else None
+        )
+    return RetrievedContext(
+        context=built.context,
+        question_embedding=question_embedding,
+        document_ids=built.document_ids,
+        stats=built.stats
+    )
+
+
+def _log_prompt_stats(store_id: str, retrieved: RetrievedContext, prompt_stats: dict) -> None:
+    """요청별 컨텍스트 선택 결과와 프롬프트 길이/프리필 시간 기록"""
+    stats = retrieved.stats
+    logger.info(
+        f"답변 생성 - 가게: {store_id}, 문장 {stats.get('kept')}/{stats.get('retrieved')} "
+        f"(거리 제외 {stats.get('dropped_distance')}, 중복 제외 {stats.get('dropped_duplicate')}, "
+        f"예산 제외 {stats.get('dropped_budget')}), 컨텍스트 추정 {stats.get('context_tokens')}토큰, "
+        f"프롬프트 {prompt_stats.get('prompt_chars')}자/{prompt_stats.get('prompt_tokens')}토큰, "
+        f"프리필 {prompt_stats.get('prefill_ms')}ms"
+    )
+
+
+def _lookup_cached_answer(store_id: str, retrieved: RetrievedContext) -> str:
+    """답변 캐시 조회 (비활성화 시 None)"""
+    if not settings.answer_cache_enabled:
+        return None
+    return answer_cache.lookup(store_id, retrieved.question_embedding, retrieved.cache_key)
+
+
+def _store_cached_answer(store_id: str, retrieved: RetrievedContext, answer: str, generation: tuple) -> None:
+    """생성된 답변을 캐시에 저장"""
+    if settings.answer_cache_enabled and answer:
+        answer_cache.store(
+            store_id, retrieved.question_embedding, retrieved.cache_key, answer, generation=generation
+        )
+
+
+async def _answer_question(store_id: str, question: str) -> Tuple[str, str]:
+    """
+    FAQ 조회 -> 검색 -> 답변 캐시 조회 -> Gemma 답변 생성 (앞 단계에서 답이 나오면 중단)
+    
+    Returns:
+        (답변, 답변 경로: faq | cache | llm)
+    """
+    generation = answer_cache.generation(store_id)
+    question_embedding = await _embed_question(question)
+    
+    answer = await _match_faq(store_id, question_embedding)
+    if answer is not None:
+        source = "faq"
+    else:
+        retrieved = await _retrieve_context(store_id, question, question_embedding=question_embedding)
+        
+        with observe_stage("question", "cache_lookup"):
+            answer = _lookup_cached_answer(store_id, retrieved)
+        source = "cache"
+        if answer is None:
+            # Gemma API로 답변 생성
+            prompt_stats = {}
+            with observe_stage("question", "generate"):
+                answer = await get_gemma_service().generate_answer(retrieved.context, question, stats=prompt_stats)
+            _log_prompt_stats(store_id, retrieved, prompt_stats)
+            _store_cached_answer(store_id, retrieved, answer, generation)
+            source = "llm"
+    
+    QUESTION_ANSWERS.labels("question", source).inc()
+    return answer, source
+
+
+def _sse_event(data: dict, event: str = None) -> str:
+    """Server-Sent Events 형식의 메시지 생성"""
+    message = f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
+    if event:
+        message = f"event: {event}\n" + message
+    return message
+
+
 @router.post("/question", response_model=QuestionResponse)
 async def ask_question(request: QuestionRequest):
     """
     특정 가게에 대한 질문에 답변하는 API
     
     1. 질문을 임베딩
-    2. ChromaDB에서 해당 가게의 관련 정보 검색
-    3. Gemma API를 사용하여 답변 생성
+    2. 가게 FAQ 질문과 충분히 비슷하면 FAQ 답변을 그대로 반환 (source=faq)
+    3. ChromaDB에서 해당 가게의 관련 정보 검색
+    4. 답변 캐시에 유사한 질문이 있으면 재사용(source=cache), 없으면 Gemma API로 답변 생성(source=llm)
+    
+    같은 가게에 대한 같은 질문(정규화 기준)이 처리 중이면 새로 계산하지 않고 그 결과를 함께 받습니다.
     """
     try:
-        # 1. 질문 임베딩
-        question_embedding = embedding_service.encode_single(request.question)
-        
-        # 2. ChromaDB에서 관련 정보 검색
-        results = vectordb_service.search_similar(
-            store_id=request.store_id,
-            query_embedding=question_embedding.tolist(),
-            n_results=settings.search_n_results
+        answer, source = await question_flight.do(
+            (request.store_id, normalize_text(request.question)),
+            lambda: _answer_question(request.store_id, request.question)
         )
         
-        # 3. 검색 결과 확인
-        if not results['documents'] or not results['documents'][0]:
-            raise HTTPException(
-                status_code=404,
-                detail=f"가게 ID '{request.store_id}'에 대한 정보를 찾을 수 없습니다."
-            )
-        
-        # 4. 컨텍스트 구성
-        relevant_info = results['documents'][0]
-        context = "\n".join(relevant_info)
-        
-        # 5. Gemma API로 답변 생성
-        answer = gemma_service.generate_answer(context, request.question)
-        
         return QuestionResponse(
             store_id=request.store_id,
             question=request.question,
-            answer=answer
+            answer=answer,
+            source=source
         )
         
-    except HTTPException:
+    except (HTTPException, ServiceNotReadyError):
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"질문 처리 중 오류 발생: {str(e)}"
+        )
+
+
+@router.post("/question/stream")
+async def ask_question_stream(request: QuestionRequest):
+    """
+    특정 가게에 대한 질문에 답변을 스트리밍하는 API (text/event-stream)
+    
+    검색까지는 일반 질문 API와 동일하며, Gemma가 생성하는 토큰을
+    도착하는 즉시 `data: {"token": ...}` 이벤트로 전달합니다.
+    FAQ나 답변 캐시에서 답을 찾으면 답변 전체를 토큰 하나로 보냅니다.
+    생성이 끝나면 전체 답변과 답변 경로(source)를 담은 `done` 이벤트를,
+    생성 중 오류가 나면 `error` 이벤트를 보냅니다.
+    """
+    try:
+        generation = answer_cache.generation(request.store_id)
+        question_embedding = await _embed_question(request.question, operation="question_stream")
+        retrieved = None
+        cached_answer = await _match_faq(request.store_id, question_embedding, operation="question_stream")
+        source = "faq"
+        if cached_answer is None:
+            retrieved = await _retrieve_context(
+                request.store_id, request.question,
+                operation="question_stream", question_embedding=question_embedding
+            )
+            with observe_stage("question_stream", "cache_lookup"):
+                cached_answer = _lookup_cached_answer(request.store_id, retrieved)
+            source = "cache" if cached_answer is not None else "llm"
+    except (HTTPException, ServiceNotReadyError):
         raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"질문 처리 중 오류 발생: {str(e)}"
         )
+    
+    async def event_stream():
+        tokens = []
+        try:
+            if cached_answer is not None:
+                tokens.append(cached_answer)
+                yield _sse_event({"token": cached_answer})
+            else:
+                prompt_stats = {}
+                with observe_stage("question_stream", "generate"):
+                    async for token in get_gemma_service().stream_answer(
+                        retrieved.context, request.question, stats=prompt_stats
+                    ):
+                        tokens.append(token)
+                        yield _sse_event({"token": token})
+                _log_prompt_stats(request.store_id, retrieved, prompt_stats)
+            
+            answer = "".join(tokens).strip()
+            if cached_answer is None:
+                _store_cached_answer(request.store_id, retrieved, answer, generation)
+            QUESTION_ANSWERS.labels("question_stream", source).inc()
+            yield _sse_event({
+                "store_id": request.store_id,
+                "question": request.question,
+                "answer": answer,
+                "source": source
+            }, event="done")
+        except Exception as e:
+            logger.error(f"답변 스트리밍 중 오류: {str(e)}")
+            yield _sse_event({"detail": f"질문 처리 중 오류 발생: {str(e)}"}, event="error")
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/stats")
+async def get_stats():
+    """임베딩 배칭, 캐시 등 내부 통계 조회"""
+    stats = {
+        "embedding_batcher": None,
+        "query_embedding_cache": None,
+        "answer_cache": answer_cache.stats(),
+        "question_single_flight": question_flight.stats()
+    }
+    if settings.register_jobs_enabled:
+        stats["register_jobs"] = await asyncio.to_thread(get_registration_jobs().stats)
+    try:
+        stats["embedding_batcher"] = get_embedding_batcher().stats()
+        stats["query_embedding_cache"] = get_embedding_service().cache_stats()
+    except ServiceNotReadyError:
+        pass
+    return stats
@@ -0,0 +1,174 @@
+"""
+임베딩 백엔드 벤치마크
+
+백엔드별로 별도 프로세스에서 모델을 로드해 로드 시간, 단일 문장 지연(p50/p95),
+배치 처리량, 메모리(RSS)를 측정하고 torch 출력과의 일치도를 비교합니다.
+
+사용법:
+    python -m benchmarks.embedding_backends --onnx-model-path ./models/kr-sbert-onnx
+    python -m benchmarks.embedding_backends --backends torch onnx-int8 --threads 4
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+from benchmarks.utils import memory_kb, percentile
+
+SAMPLE_SENTENCES = [
+    "영업시간이 어떻게 되나요?",
+    "주차 가능한가요?",
+    "우리 가게는 30년 전통의 한식 전문점입니다.",
+    "매일 아침 신선한 재료를 직접 시장에서 구매하여 준비합니다.",
+    "할머니의 비법 된장으로 만든 된장찌개가 시그니처 메뉴입니다.",
+    "가족 단위 손님들이 많이 찾아주시며, 넓은 좌석과 주차 공간을 제공합니다.",
+    "매주 월요일은 정기 휴무입니다.",
+    "예약은 전화로만 받습니다.",
+    "포장 주문 시 10% 할인해 드립니다.",
+    "반려동물 동반 가능한 테라스 좌석이 있습니다."
+]
+
+
+def run_backend(args) -> None:
+    """자식 프로세스: 백엔드 하나를 측정하고 결과를 JSON 파일로 저장"""
+    if args.threads:
+        import torch
+        torch.set_num_threads(args.threads)
+
+    from services.embedding_service import load_sentence_transformer
+
+    baseline = memory_kb()
+    started = time.perf_counter()
+    model = load_sentence_transformer(
+        args.model,
+        backend=args.backend,
+        onnx_model_path=args.onnx_model_path,
+        quantization_config=args.quantization_config
+    )
+    load_seconds = time.perf_counter() - started
+    after_load = memory_kb()
+
+    model.encode(SAMPLE_SENTENCES[:1])
+
+    # 단일 문장 지연 (질문 임베딩 경로)
+    latencies = []
+    for i in range(args.single_iterations):
+        sentence = SAMPLE_SENTENCES[i % len(SAMPLE_SENTENCES)]
+        started = time.perf_counter()
+        model.encode([sentence])
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    # 배치 처리량 (가게 등록 경로)
+    corpus = [
+        f"{SAMPLE_SENTENCES[i % len(SAMPLE_SENTENCES)]} ({i})"
+        for i in range(args.batch_sentences)
+    ]
+    started = time.perf_counter()
+    model.encode(corpus, batch_size=args.batch_size)
+    batch_seconds = time.perf_counter() - started
+
+    embeddings = model.encode(SAMPLE_SENTENCES)
+    np.save(args.embeddings_out, np.asarray(embeddings, dtype=np.float32))
+
+    result = {
+        "backend": args.backend,
+        "load_seconds": round(load_seconds, 3),
+        "single_latency_ms": {
+            "p50": round(percentile(latencies, 50), 3),
+            "p95": round(percentile(latencies, 95), 3),
+            "mean": round(float(np.mean(latencies)), 3)
+        },
+        "batch": {
+            "sentences": args.batch_sentences,
+            "batch_size": args.batch_size,
+            "seconds": round(batch_seconds, 3),
+            "sentences_per_second": round(args.batch_sentences / batch_seconds, 1)
+        },
+        "memory_kb": {
+            "baseline_rss": baseline["rss_kb"],
+            "after_load_rss": after_load["rss_kb"],
+            "peak_rss": memory_kb()["peak_rss_kb"]
+        }
+    }
+    with open(args.result_out, "w") as f:
+        json.dump(result, f)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="임베딩 백엔드 벤치마크")
+    parser.add_argument("--backends", nargs="+", default=["torch", "onnx", "onnx-int8"])
+    parser.add_argument("--model", default=None, help="임베딩 모델 이름 (기본값: EMBEDDING_MODEL_NAME)")
+    parser.add_argument("--onnx-model-path", default=None)
+    parser.add_argument("--quantization-config", default="avx2")
+    parser.add_argument("--single-iterations", type=int, default=200)
+    parser.add_argument("--batch-sentences", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--threads", type=int, default=None, help="torch 스레드 수")
+    # 자식 프로세스용 내부 인자
+    parser.add_argument("--backend", help=argparse.SUPPRESS)
+    parser.add_argument("--embeddings-out", help=argparse.SUPPRESS)
+    parser.add_argument("--result-out", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.model is None:
+        from config import get_settings
+        args.model = get_settings().embedding_model_name
+
+    if args.backend:
+        run_backend(args)
+        return 0
+
+    from services.embedding_service import compare_embeddings
+
+    env = dict(os.environ)
+    if args.threads:
+        env["OMP_NUM_THREADS"] = str(args.threads)
+
+    results = []
+    embeddings = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        # 백엔드마다 새 프로세스에서 측정해 메모리 사용량이 섞이지 않게 함
+        for backend in args.backends:
+            embeddings_out = os.path.join(tmp, f"{backend}.npy")
+            result_out = os.path.join(tmp, f"{backend}.json")
+            command = [
+                sys.executable, "-m", "benchmarks.embedding_backends",
+                "--backend", backend,
+                "--model", args.model,
+                "--quantization-config", args.quantization_config,
+                "--single-iterations", str(args.single_iterations),
+                "--batch-sentences", str(args.batch_sentences),
+                "--batch-size", str(args.batch_size),
+                "--embeddings-out", embeddings_out,
+                "--result-out", result_out
+            ]
+            if args.onnx_model_path:
+                command += ["--onnx-model-path", args.onnx_model_path]
+            if args.threads:
+                command += ["--threads", str(args.threads)]
+
+            completed = subprocess.run(command, env=env)
+            if completed.returncode != 0:
+                results.append({"backend": backend, "error": f"exit code {completed.returncode}"})
+                continue
+
+            with open(result_out) as f:
+                results.append(json.load(f))
+            embeddings[backend] = np.load(embeddings_out)
+
+    if "torch" in embeddings:
+        for result in results:
+            if result["backend"] in embeddings and result["backend"] != "torch":
+                result["parity_vs_torch"] = compare_embeddings(
+                    embeddings["torch"], embeddings[result["backend"]]
+                )
+
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
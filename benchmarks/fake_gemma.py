@@ -0,0 +1,135 @@
+"""
+벤치마크용 가짜 Ollama 서버
+/api/generate만 흉내 내며, 프리필 지연과 토큰 생성 속도를 설정할 수 있습니다.
+모델 없이 CPU만으로 오프라인 실행됩니다.
+
+사용법:
+    python -m benchmarks.fake_gemma --port 11500 --prefill-ms 300 --tokens-per-second 30
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+# 답변에 사용할 토큰 (띄어쓰기 포함 어절 단위)
+ANSWER_TOKENS = [
+    "네, ", "저희 ", "가게는 ", "매일 ", "오전 ", "11시부터 ", "오후 ", "9시까지 ", "영업합니다. ",
+    "주차는 ", "가게 ", "앞 ", "공영주차장을 ", "이용하시면 ", "됩니다. ",
+    "예약은 ", "전화로 ", "가능하며, ", "단체 ", "손님도 ", "환영합니다. "
+]
+
+
+def create_app(
+    prefill_ms: float,
+    prefill_ms_per_kchar: float,
+    tokens_per_second: float,
+    answer_tokens: int,
+    error_rate: float
+) -> FastAPI:
+    """
+    Args:
+        prefill_ms: 첫 토큰까지의 고정 지연
+        prefill_ms_per_kchar: 프롬프트 1000자당 추가 프리필 지연
+        tokens_per_second: 토큰 생성 속도 (0이면 지연 없음)
+        answer_tokens: 답변 토큰 수
+        error_rate: 503으로 응답할 확률 (재시도 경로 측정용)
+    """
+    app = FastAPI(title="fake-ollama")
+
+    def prefill_seconds(prompt: str) -> float:
+        return (prefill_ms + prefill_ms_per_kchar * len(prompt) / 1000) / 1000
+
+    def token_interval() -> float:
+        return 1 / tokens_per_second if tokens_per_second > 0 else 0
+
+    def generate_tokens(prompt: str):
+        # 문장 파싱 프롬프트에는 소개글을 줄 단위로 돌려줌
+        if "가게 소개:" in prompt:
+            description = prompt.split("가게 소개:", 1)[1].split("출력 형식 예시:", 1)[0]
+            lines = [line.strip() for line in description.replace(". ", ".\n").splitlines() if line.strip()]
+            return [f"{line}\n" for line in lines]
+        return [ANSWER_TOKENS[i % len(ANSWER_TOKENS)] for i in range(answer_tokens)]
+
+    def stats(prompt: str, tokens: list, prefill: float, started: float) -> dict:
+        """Ollama 응답의 통계 필드 (토큰 수는 글자 수 기반 근사치)"""
+        return {
+            "total_duration": int((time.perf_counter() - started) * 1e9),
+            "prompt_eval_count": max(1, len(prompt) // 2),
+            "prompt_eval_duration": int(prefill * 1e9),
+            "eval_count": len(tokens),
+            "eval_duration": int(len(tokens) * token_interval() * 1e9)
+        }
+
+    @app.post("/api/generate")
+    async def generate(request: Request):
+        started = time.perf_counter()
+        body = await request.json()
+        model = body.get("model", "")
+        prompt = body.get("prompt")
+
+        # 프롬프트 없는 호출은 모델 로드(워밍업)
+        if not prompt:
+            return {"model": model, "response": "", "done": True, "done_reason": "load"}
+
+        if error_rate and random.random() < error_rate:
+            return JSONResponse(status_code=503, content={"error": "server busy"})
+
+        tokens = generate_tokens(prompt)
+        prefill = prefill_seconds(prompt)
+        interval = token_interval()
+
+        if not body.get("stream", True):
+            await asyncio.sleep(prefill + interval * len(tokens))
+            return {
+                "model": model,
+                "response": "".join(tokens),
+                "done": True,
+                **stats(prompt, tokens, prefill, started)
+            }
+
+        async def stream():
+            await asyncio.sleep(prefill)
+            for token in tokens:
+                if interval:
+                    await asyncio.sleep(interval)
+                yield json.dumps({"model": model, "response": token, "done": False}, ensure_ascii=False) + "\n"
+            yield json.dumps({
+                "model": model,
+                "response": "",
+                "done": True,
+                **stats(prompt, tokens, prefill, started)
+            }) + "\n"
+
+        return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+    return app
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="벤치마크용 가짜 Ollama 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11500)
+    parser.add_argument("--prefill-ms", type=float, default=200)
+    parser.add_argument("--prefill-ms-per-kchar", type=float, default=50)
+    parser.add_argument("--tokens-per-second", type=float, default=30)
+    parser.add_argument("--answer-tokens", type=int, default=40)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    app = create_app(
+        prefill_ms=args.prefill_ms,
+        prefill_ms_per_kchar=args.prefill_ms_per_kchar,
+        tokens_per_second=args.tokens_per_second,
+        answer_tokens=args.answer_tokens,
+        error_rate=args.error_rate
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,491 @@
+"""
+부하 벤치마크
+가짜 Ollama 서버(benchmarks.fake_gemma)와 앱을 로컬에서 띄우고 가상 가게 N개를 /store/register로 등록한 뒤,
+등록/질문/OCR 요청을 목표 동시성으로 섞어 보내 엔드포인트별 지연(p50/p95/p99), 처리량, 최대 RSS를
+JSON으로 기록합니다. 커밋 간 비교를 위해 결과에 git 커밋과 실행 설정이 함께 저장됩니다.
+
+CPU만 있는 Linux에서 오프라인으로 실행됩니다. 단, 임베딩 모델(EMBEDDING_MODEL_NAME)과
+EasyOCR 모델은 미리 로컬 캐시에 받아 두어야 합니다. (OCR 없이 측정하려면 --mix에서 ocr=0)
+
+사용법:
+    python -m benchmarks.load_test --stores 200 --concurrency 16 --duration 60 --output results.json
+    python -m benchmarks.load_test --mix register=1,question=8,question_stream=1,ocr=0 \\
+        --app-env VECTOR_STORE_BACKEND=numpy --tokens-per-second 50
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional
+import httpx
+from benchmarks.utils import percentile
+
+ENDPOINTS = ("register", "question", "question_stream", "ocr")
+
+# 가상 가게 소개글 재료
+_STORE_KINDS = ["한식당", "카페", "베이커리", "분식집", "치킨집", "꽃집", "미용실", "정육점", "국밥집", "피자집"]
+_SENTENCE_TEMPLATES = [
+    "저희 {name}은 {year}년부터 한자리를 지켜 온 {kind}입니다.",
+    "영업시간은 오전 {open}시부터 오후 {close}시까지입니다.",
+    "매주 {holiday}요일은 정기 휴무입니다.",
+    "가게 앞 공영주차장에 {parking}대까지 주차할 수 있습니다.",
+    "대표 메뉴는 {menu}이며 가격은 {price}원입니다.",
+    "예약은 전화로만 받고 있으며 단체 손님은 하루 전까지 연락 부탁드립니다.",
+    "포장 주문 시 {discount}% 할인해 드립니다.",
+    "반려동물 동반은 테라스 좌석에서만 가능합니다.",
+    "모든 재료는 매일 아침 {market}에서 직접 구매합니다.",
+    "와이파이와 콘센트가 있어 오래 머무르기 좋습니다."
+]
+_MENUS = ["된장찌개", "아메리카노", "소금빵", "떡볶이", "양념치킨", "꽃다발", "커트", "한우 등심", "순대국밥", "마르게리타"]
+_QUESTIONS = [
+    "영업시간이 어떻게 되나요?",
+    "주차 가능한가요?",
+    "쉬는 날이 언제예요?",
+    "대표 메뉴가 뭐예요?",
+    "예약할 수 있나요?",
+    "포장하면 할인되나요?",
+    "강아지 데리고 가도 되나요?",
+    "재료는 어디서 사오나요?"
+]
+
+
+def synthetic_description(rng: random.Random, index: int) -> str:
+    """가상 가게 소개글 (문장 순서/값이 매번 조금씩 달라 재등록 시 일부 문장만 바뀜)"""
+    kind = _STORE_KINDS[index % len(_STORE_KINDS)]
+    values = {
+        "name": f"{kind} {index}호점",
+        "kind": kind,
+        "year": rng.randint(1990, 2023),
+        "open": rng.randint(7, 11),
+        "close": rng.randint(8, 11),
+        "holiday": rng.choice("월화수목금토일"),
+        "parking": rng.randint(2, 30),
+        "menu": _MENUS[index % len(_MENUS)],
+        "price": rng.randint(5, 40) * 1000,
+        "discount": rng.choice([5, 10, 15]),
+        "market": rng.choice(["가락시장", "노량진시장", "동네 시장"])
+    }
+    templates = rng.sample(_SENTENCE_TEMPLATES, k=rng.randint(6, len(_SENTENCE_TEMPLATES)))
+    return " ".join(template.format(**values) for template in templates)
+
+
+def synthetic_business_card() -> bytes:
+    """사업자등록증 모양의 PNG 이미지 (OCR 부하용, 기본 글꼴)"""
+    from PIL import Image, ImageDraw
+
+    image = Image.new("RGB", (1240, 1754), "white")
+    draw = ImageDraw.Draw(image)
+    lines = [
+        "BUSINESS REGISTRATION CERTIFICATE",
+        "Registration No: 123-45-67890",
+        "Company: BENCHMARK STORE",
+        "Representative: HONG GILDONG",
+        "Opening date: 2020. 01. 15",
+        "Address: 1 Benchmark-ro, Seoul"
+    ]
+    for i, line in enumerate(lines):
+        draw.text((120, 160 + i * 90), line, fill="black")
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class ProcessTreeMonitor:
+    """앱 프로세스와 자식 프로세스(OCR 워커 등)의 RSS 합계를 주기적으로 샘플링"""
+
+    def __init__(self, pid: int, interval: float = 0.2):
+        self.pid = pid
+        self.interval = interval
+        self.phase_peak_kb = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    @staticmethod
+    def _children_map() -> Dict[int, List[int]]:
+        children: Dict[int, List[int]] = {}
+        for entry in os.listdir("/proc"):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f"/proc/{entry}/stat") as f:
+                    # "pid (comm) state ppid ..." (comm에 공백이 있을 수 있어 마지막 ')' 기준)
+                    ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+            except (OSError, IndexError, ValueError):
+                continue
+            children.setdefault(ppid, []).append(int(entry))
+        return children
+
+    @staticmethod
+    def _rss_kb(pid: int) -> int:
+        try:
+            with open(f"/proc/{pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        return int(line.split()[1])
+        except OSError:
+            pass
+        return 0
+
+    def sample(self) -> int:
+        """프로세스 트리 전체 RSS (kB)"""
+        children = self._children_map()
+        total, stack = 0, [self.pid]
+        while stack:
+            pid = stack.pop()
+            total += self._rss_kb(pid)
+            stack.extend(children.get(pid, []))
+        return total
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.phase_peak_kb = max(self.phase_peak_kb, self.sample())
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def reset_phase(self) -> None:
+        self.phase_peak_kb = self.sample()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+
+class EndpointStats:
+    """엔드포인트별 요청 결과"""
+
+    def __init__(self):
+        self.latencies_ms: List[float] = []
+        self.ttft_ms: List[float] = []
+        self.status_codes: Counter = Counter()
+        self.errors = 0
+
+    def record(self, status: str, latency_ms: float, ttft_ms: float = None) -> None:
+        self.status_codes[status] += 1
+        if status != "200":
+            self.errors += 1
+            return
+        self.latencies_ms.append(latency_ms)
+        if ttft_ms is not None:
+            self.ttft_ms.append(ttft_ms)
+
+    def summary(self, duration: float) -> Dict:
+        def distribution(values: List[float]) -> Dict:
+            return {
+                "p50": round(percentile(values, 50), 2),
+                "p95": round(percentile(values, 95), 2),
+                "p99": round(percentile(values, 99), 2),
+                "mean": round(sum(values) / len(values), 2) if values else 0.0,
+                "max": round(max(values), 2) if values else 0.0
+            }
+
+        summary = {
+            "requests": sum(self.status_codes.values()),
+            "succeeded": len(self.latencies_ms),
+            "errors": self.errors,
+            "status_codes": dict(self.status_codes),
+            "throughput_rps": round(len(self.latencies_ms) / duration, 2) if duration else 0.0,
+            "latency_ms": distribution(self.latencies_ms)
+        }
+        if self.ttft_ms:
+            summary["time_to_first_token_ms"] = distribution(self.ttft_ms)
+        return summary
+
+
+class LoadDriver:
+    """엔드포인트별 요청 생성과 폐쇄 루프(closed-loop) 부하 실행"""
+
+    def __init__(self, client: httpx.AsyncClient, stores: int, seed: int):
+        self.client = client
+        self.stores = stores
+        self.rng = random.Random(seed)
+        self.ocr_image = None
+
+    async def send(self, endpoint: str, stats: EndpointStats, store_index: int = None) -> None:
+        if store_index is None:
+            store_index = self.rng.randrange(self.stores)
+        store_id = f"bench_store_{store_index}"
+        started = time.perf_counter()
+        ttft = None
+        try:
+            if endpoint == "register":
+                response = await self.client.post("/store/register", json={
+                    "store_id": store_id,
+                    "description": synthetic_description(self.rng, store_index)
+                })
+                status = str(response.status_code)
+            elif endpoint == "question":
+                response = await self.client.post("/store/question", json={
+                    "store_id": store_id,
+                    "question": self.rng.choice(_QUESTIONS)
+                })
+                status = str(response.status_code)
+            elif endpoint == "question_stream":
+                payload = {"store_id": store_id, "question": self.rng.choice(_QUESTIONS)}
+                async with self.client.stream("POST", "/store/question/stream", json=payload) as response:
+                    status = str(response.status_code)
+                    async for line in response.aiter_lines():
+                        if ttft is None and line.startswith("data:"):
+                            ttft = (time.perf_counter() - started) * 1000
+                        elif line.startswith("event: error"):
+                            status = "stream_error"
+            elif endpoint == "ocr":
+                if self.ocr_image is None:
+                    self.ocr_image = synthetic_business_card()
+                response = await self.client.post(
+                    "/company/ocr",
+                    files={"file": ("card.png", self.ocr_image, "image/png")}
+                )
+                status = str(response.status_code)
+            else:
+                raise ValueError(f"알 수 없는 엔드포인트: {endpoint}")
+        except httpx.HTTPError as e:
+            status = type(e).__name__
+        stats.record(status, (time.perf_counter() - started) * 1000, ttft)
+
+    async def run(
+        self,
+        mix: Dict[str, float],
+        concurrency: int,
+        duration: float,
+        max_requests: int = None
+    ) -> Dict[str, EndpointStats]:
+        """
+        concurrency개의 가상 사용자가 duration초 동안(또는 max_requests개까지) 쉬지 않고 요청
+
+        Args:
+            mix: {엔드포인트: 가중치}
+        """
+        endpoints = [name for name, weight in mix.items() if weight > 0]
+        weights = [mix[name] for name in endpoints]
+        stats = {name: EndpointStats() for name in endpoints}
+        deadline = time.perf_counter() + duration
+        issued = 0
+
+        async def user():
+            nonlocal issued
+            while time.perf_counter() < deadline and (max_requests is None or issued < max_requests):
+                issued += 1
+                endpoint = self.rng.choices(endpoints, weights)[0]
+                await self.send(endpoint, stats[endpoint])
+
+        await asyncio.gather(*(user() for _ in range(concurrency)))
+        return stats
+
+    async def seed(self, concurrency: int) -> Dict[str, EndpointStats]:
+        """가게 stores개를 /store/register로 등록"""
+        stats = {"register": EndpointStats()}
+        indexes = iter(range(self.stores))
+
+        async def user():
+            for store_index in indexes:
+                await self.send("register", stats["register"], store_index)
+
+        await asyncio.gather(*(user() for _ in range(concurrency)))
+        return stats
+
+
+async def _wait_ready(client: httpx.AsyncClient, components: List[str], timeout: float) -> float:
+    """필요한 구성 요소가 준비될 때까지 대기하고 걸린 시간 반환"""
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        try:
+            response = await client.get("/ready")
+            states = response.json().get("components", {})
+            failed = [name for name in components if states.get(name, {}).get("status") == "failed"]
+            if failed:
+                raise RuntimeError(f"구성 요소 로드 실패: {', '.join(failed)} - {states}")
+            if all(states.get(name, {}).get("status") == "ready" for name in components):
+                return time.perf_counter() - started
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.5)
+    raise TimeoutError(f"{timeout}초 안에 앱이 준비되지 않았습니다.")
+
+
+def _parse_mix(text: str) -> Dict[str, float]:
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise argparse.ArgumentTypeError(f"알 수 없는 엔드포인트: {name} (지원: {', '.join(ENDPOINTS)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+async def run_benchmark(args, base_url: str, monitor: ProcessTreeMonitor) -> Dict:
+    limits = httpx.Limits(max_connections=args.concurrency * 2, max_keepalive_connections=args.concurrency * 2)
+    timeout = httpx.Timeout(args.request_timeout)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=timeout) as client:
+        components = ["gemma", "embedding", "vectordb"]
+        if args.mix.get("ocr", 0) > 0:
+            components.append("ocr")
+        startup_seconds = await _wait_ready(client, components, args.startup_timeout)
+
+        driver = LoadDriver(client, args.stores, args.seed)
+        phases = []
+
+        async def phase(name: str, coroutine_factory):
+            monitor.reset_phase()
+            started = time.perf_counter()
+            stats = await coroutine_factory()
+            duration = time.perf_counter() - started
+            phases.append({
+                "name": name,
+                "duration_seconds": round(duration, 2),
+                "peak_rss_kb": monitor.phase_peak_kb,
+                "endpoints": {endpoint: s.summary(duration) for endpoint, s in stats.items()}
+            })
+            print(f"[{name}] {duration:.1f}초, 최대 RSS {monitor.phase_peak_kb / 1024:.0f}MB", file=sys.stderr)
+
+        # 1. 가게 등록
+        await phase("seed", lambda: driver.seed(args.concurrency))
+
+        # 2. 엔드포인트별 단독 부하 (엔드포인트별 최대 RSS 측정용)
+        if args.isolated_seconds > 0:
+            for endpoint, weight in args.mix.items():
+                if weight > 0:
+                    await phase(
+                        f"isolated:{endpoint}",
+                        lambda endpoint=endpoint: driver.run({endpoint: 1}, args.concurrency, args.isolated_seconds)
+                    )
+
+        # 3. 혼합 부하
+        await phase("mixed", lambda: driver.run(args.mix, args.concurrency, args.duration, args.max_requests))
+
+        result = {"app_startup_seconds": round(startup_seconds, 2), "phases": phases}
+        if args.scrape_metrics:
+            result["metrics"] = (await client.get("/metrics")).text
+
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="가짜 Gemma 서버를 사용한 부하 벤치마크")
+    parser.add_argument("--stores", type=int, default=100, help="등록할 가상 가게 수")
+    parser.add_argument("--concurrency", type=int, default=8, help="동시 가상 사용자 수")
+    parser.add_argument("--duration", type=float, default=60, help="혼합 부하 시간 (초)")
+    parser.add_argument("--max-requests", type=int, default=None, help="혼합 부하 최대 요청 수")
+    parser.add_argument("--isolated-seconds", type=float, default=15, help="엔드포인트별 단독 부하 시간 (0이면 생략)")
+    parser.add_argument(
+        "--mix",
+        type=_parse_mix,
+        default=_parse_mix("register=1,question=6,question_stream=2,ocr=1"),
+        help="엔드포인트별 가중치 (예: register=1,question=6,question_stream=2,ocr=1)"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--request-timeout", type=float, default=180)
+    parser.add_argument("--startup-timeout", type=float, default=600)
+    parser.add_argument("--prefill-ms", type=float, default=200, help="가짜 Gemma 첫 토큰 지연")
+    parser.add_argument("--prefill-ms-per-kchar", type=float, default=50, help="프롬프트 1000자당 추가 지연")
+    parser.add_argument("--tokens-per-second", type=float, default=30, help="가짜 Gemma 토큰 생성 속도")
+    parser.add_argument("--answer-tokens", type=int, default=40)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="가짜 Gemma 503 응답 확률")
+    parser.add_argument("--app-env", action="append", default=[], help="앱 환경 변수 (KEY=VALUE, 여러 번 사용 가능)")
+    parser.add_argument("--online", action="store_true", help="모델 다운로드 허용 (기본값: 오프라인)")
+    parser.add_argument("--scrape-metrics", action="store_true", help="종료 전 /metrics 내용을 결과에 포함")
+    parser.add_argument("--output", default=None, help="결과 JSON 파일 (기본값: 표준 출력)")
+    args = parser.parse_args()
+
+    gemma_port, app_port = _free_port(), _free_port()
+    processes = []
+    with tempfile.TemporaryDirectory(prefix="chatbot-bench-") as data_directory:
+        try:
+            # 1. 가짜 Gemma 서버
+            processes.append(subprocess.Popen([
+                sys.executable, "-m", "benchmarks.fake_gemma",
+                "--port", str(gemma_port),
+                "--prefill-ms", str(args.prefill_ms),
+                "--prefill-ms-per-kchar", str(args.prefill_ms_per_kchar),
+                "--tokens-per-second", str(args.tokens_per_second),
+                "--answer-tokens", str(args.answer_tokens),
+                "--error-rate", str(args.error_rate)
+            ]))
+
+            # 2. 앱 (데이터는 임시 디렉토리에 저장)
+            env = dict(os.environ)
+            env.update({
+                "GEMMA_API": f"http://127.0.0.1:{gemma_port}",
+                "GEMMA_MODEL": env.get("GEMMA_MODEL") or "gemma2",
+                "CHROMA_PERSIST_DIRECTORY": os.path.join(data_directory, "chroma_db"),
+                "CHROMA_COLLECTION_NAME": "benchmark",
+                "CHROMA_SNAPSHOT_DIRECTORY": os.path.join(data_directory, "chroma_snapshots"),
+                "NUMPY_STORE_DIRECTORY": os.path.join(data_directory, "numpy_store"),
+                "API_HOST": "127.0.0.1",
+                "API_PORT": str(app_port)
+            })
+            if not args.online:
+                env.update({"HF_HUB_OFFLINE": "1", "TRANSFORMERS_OFFLINE": "1"})
+            for item in args.app_env:
+                key, _, value = item.partition("=")
+                env[key] = value
+
+            app = subprocess.Popen(
+                [
+                    sys.executable, "-m", "uvicorn", "main:app",
+                    "--host", "127.0.0.1", "--port", str(app_port),
+                    "--log-level", "warning"
+                ],
+                env=env
+            )
+            processes.append(app)
+
+            monitor = ProcessTreeMonitor(app.pid)
+            monitor.start()
+            started_at = datetime.now().isoformat()
+            try:
+                result = asyncio.run(run_benchmark(args, f"http://127.0.0.1:{app_port}", monitor))
+            finally:
+                monitor.stop()
+        finally:
+            for process in reversed(processes):
+                process.terminate()
+            for process in processes:
+                try:
+                    process.wait(timeout=30)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+
+    config = {key: value for key, value in vars(args).items() if key != "output"}
+    report = {
+        "started_at": started_at,
+        "git_commit": _git_commit(),
+        "config": config,
+        **result
+    }
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,209 @@
+"""
+OCR 전처리 벤치마크
+
+사업자등록증 샘플 이미지에 전처리 조합(긴 변 크기, 흑백 여부, 자르기 영역)과
+추출 방식(targeted: 라벨 주변 영역만 인식, full: 전체 인식)을 적용해서
+단계별 처리 시간과 필드 추출 정확도를 비교합니다.
+기준(baseline)은 전처리 도입 전 동작(회전 보정 없음, 위쪽 절반, RGB, 축소 없음, 전체 인식)입니다.
+
+샘플 디렉토리에는 이미지와 정답 파일 labels.json을 둡니다.
+    {
+        "sample1.jpg": {
+            "company_name": "테스트상회",
+            "business_number": "1234567890",
+            "representative_name": "홍길동",
+            "opening_date": "20200101"
+        }
+    }
+
+사용법:
+    python -m benchmarks.ocr_preprocessing --samples ./ocr_samples
+    python -m benchmarks.ocr_preprocessing --samples ./ocr_samples --long-edges 0 1600 1200 --crop-regions 0,0,1,0.5 full
+    python -m benchmarks.ocr_preprocessing --samples ./ocr_samples --long-edges 1600 --color-modes gray --modes targeted full
+
+    # 현재 OCR_* 설정으로 단건 순차 인식과 배치 인식(/company/ocr/batch 경로)의 처리량 비교
+    python -m benchmarks.ocr_preprocessing --samples ./ocr_samples --batch-sizes 4 8 16
+"""
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+from typing import Dict, List, Tuple
+from benchmarks.utils import percentile
+
+FIELDS = ("company_name", "business_number", "representative_name", "opening_date")
+
+
+def _normalize(value: str) -> str:
+    return "".join(str(value).split()).replace("-", "")
+
+
+def _variants(args) -> Dict[str, Tuple["PreprocessOptions", str]]:
+    """이름 -> (전처리 옵션, 추출 방식)"""
+    from services.image_preprocess import PreprocessOptions, parse_crop_region
+
+    variants = {
+        "baseline": (
+            PreprocessOptions(
+                exif_transpose=False,
+                crop_region=parse_crop_region("0,0,1,0.5"),
+                max_long_edge=0,
+                grayscale=False
+            ),
+            "full"
+        )
+    }
+    for crop, long_edge, color, mode in itertools.product(
+        args.crop_regions, args.long_edges, args.color_modes, args.modes
+    ):
+        name = f"crop={crop} long_edge={long_edge or 'orig'} {color} {mode}"
+        options = PreprocessOptions(
+            exif_transpose=True,
+            crop_region=parse_crop_region(crop),
+            max_long_edge=long_edge,
+            grayscale=color == "gray"
+        )
+        variants[name] = (options, mode)
+    return variants
+
+
+def _load_samples(directory: str) -> List[Dict]:
+    with open(os.path.join(directory, "labels.json"), encoding="utf-8") as f:
+        labels = json.load(f)
+    samples = []
+    for filename, expected in sorted(labels.items()):
+        with open(os.path.join(directory, filename), "rb") as f:
+            samples.append({"name": filename, "bytes": f.read(), "expected": expected})
+    return samples
+
+
+def run_variant(ocr_service, samples: List[Dict], options, mode: str, repeats: int) -> Dict:
+    """전처리 조합 하나로 모든 샘플을 인식하고 지연/정확도 집계"""
+    totals = []
+    stage_seconds: Dict[str, List[float]] = {}
+    correct = {field: 0 for field in FIELDS}
+    all_correct = 0
+    failures = []
+
+    for sample in samples:
+        info = None
+        for _ in range(repeats):
+            timings = {}
+            started = time.perf_counter()
+            info = ocr_service.extract_business_info(
+                sample["bytes"],
+                preprocess=options,
+                mode=mode,
+                timings=timings
+            )
+            totals.append((time.perf_counter() - started) * 1000)
+            for stage, seconds in timings.items():
+                stage_seconds.setdefault(stage, []).append(seconds * 1000)
+
+        # 인식 결과는 반복해도 같으므로 마지막 결과로 채점
+        wrong = [
+            field for field in FIELDS
+            if field in sample["expected"] and _normalize(info[field]) != _normalize(sample["expected"][field])
+        ]
+        for field in FIELDS:
+            if field in sample["expected"] and field not in wrong:
+                correct[field] += 1
+        if not wrong:
+            all_correct += 1
+        else:
+            failures.append({"sample": sample["name"], "fields": wrong})
+
+    labeled = {field: sum(1 for s in samples if field in s["expected"]) for field in FIELDS}
+    return {
+        "latency_ms": {
+            "p50": round(percentile(totals, 50), 1),
+            "p95": round(percentile(totals, 95), 1),
+            "mean": round(sum(totals) / len(totals), 1)
+        },
+        "stage_mean_ms": {
+            stage: round(sum(values) / len(values), 1) for stage, values in stage_seconds.items()
+        },
+        "field_accuracy": {
+            field: round(correct[field] / labeled[field], 3) for field in FIELDS if labeled[field]
+        },
+        "all_fields_accuracy": round(all_correct / len(samples), 3),
+        "failures": failures
+    }
+
+
+def run_batch_throughput(ocr_service, samples: List[Dict], batch_sizes: List[int]) -> Dict:
+    """현재 설정으로 단건 순차 인식 대비 배치 인식 처리량 (이미지/초)"""
+    from config import get_settings
+    from services.image_preprocess import PreprocessOptions
+
+    options = PreprocessOptions.from_settings()
+    mode = get_settings().ocr_extraction_mode
+    images = [sample["bytes"] for sample in samples]
+
+    started = time.perf_counter()
+    for image_bytes in images:
+        ocr_service.extract_business_info(image_bytes, preprocess=options, mode=mode)
+    sequential = len(images) / (time.perf_counter() - started)
+
+    result = {"mode": mode, "sequential_images_per_second": round(sequential, 2), "batched": []}
+    for batch_size in batch_sizes:
+        started = time.perf_counter()
+        for start in range(0, len(images), batch_size):
+            ocr_service.extract_business_info_batch(images[start:start + batch_size], preprocess=options, mode=mode)
+        throughput = len(images) / (time.perf_counter() - started)
+        result["batched"].append({
+            "batch_size": batch_size,
+            "images_per_second": round(throughput, 2),
+            "speedup": round(throughput / sequential, 2)
+        })
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="OCR 전처리 속도/정확도 벤치마크")
+    parser.add_argument("--samples", required=True, help="이미지와 labels.json이 있는 디렉토리")
+    parser.add_argument("--long-edges", nargs="+", type=int, default=[0, 2400, 1600, 1200, 960])
+    parser.add_argument("--color-modes", nargs="+", choices=["rgb", "gray"], default=["rgb", "gray"])
+    parser.add_argument("--crop-regions", nargs="+", default=["0,0,1,0.5"])
+    parser.add_argument("--modes", nargs="+", choices=["targeted", "full"], default=["targeted", "full"])
+    parser.add_argument("--repeats", type=int, default=1, help="샘플당 반복 횟수 (지연 측정용)")
+    parser.add_argument("--batch-sizes", nargs="*", type=int, default=[], help="배치 인식 처리량을 측정할 배치 크기")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    from services.ocr_service import OCRService
+
+    samples = _load_samples(args.samples)
+    variants = _variants(args)
+
+    started = time.perf_counter()
+    ocr_service = OCRService()
+    ocr_service.warmup()
+    load_seconds = time.perf_counter() - started
+
+    results = []
+    for name, (options, mode) in variants.items():
+        print(f"측정 중: {name}", file=sys.stderr)
+        results.append({"variant": name, **run_variant(ocr_service, samples, options, mode, args.repeats)})
+
+    report = {
+        "samples": len(samples),
+        "repeats": args.repeats,
+        "reader_load_seconds": round(load_seconds, 2),
+        "results": results
+    }
+    if args.batch_sizes:
+        print("측정 중: 배치 인식 처리량", file=sys.stderr)
+        report["batch_throughput"] = run_batch_throughput(ocr_service, samples, args.batch_sizes)
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
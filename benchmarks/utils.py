@@ -0,0 +1,24 @@
+"""
+벤치마크 공용 함수
+"""
+from typing import Dict, List
+import numpy as np
+
+
+def memory_kb() -> Dict[str, int]:
+    """현재 프로세스의 RSS와 최대 RSS (kB, Linux /proc 기준)"""
+    memory = {}
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(("VmRSS:", "VmHWM:")):
+                    key, value = line.split(":", 1)
+                    memory[key] = int(value.split()[0])
+    except OSError:
+        pass
+    return {"rss_kb": memory.get("VmRSS"), "peak_rss_kb": memory.get("VmHWM")}
+
+
+def percentile(values: List[float], q: float) -> float:
+    """백분위수 (값이 없으면 0)"""
+    return float(np.percentile(values, q)) if values else 0.0
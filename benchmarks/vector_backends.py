@@ -0,0 +1,188 @@
+"""
+벡터 저장소 백엔드 벤치마크
+
+가게 수별로 임의의 임베딩을 저장한 뒤 저장 시간, 재시작(다시 열기) 시간,
+가게 단위 검색 지연(p50/p95/p99), 디스크 사용량, 메모리(RSS)를 백엔드별로 측정합니다.
+모델 없이 임의 벡터를 사용하므로 CPU만으로 오프라인 실행됩니다.
+
+사용법:
+    python -m benchmarks.vector_backends --stores 10000 100000
+    python -m benchmarks.vector_backends --backends numpy numpy-float16 --stores 10000 --sentences-per-store 40
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List
+import numpy as np
+from benchmarks.utils import memory_kb, percentile
+
+# 벤치마크 대상 (이름 -> (백엔드, 행렬 타입))
+BACKEND_VARIANTS = {
+    "chroma": ("chroma", None),
+    "numpy": ("numpy", "float32"),
+    "numpy-float16": ("numpy", "float16")
+}
+
+
+def _create_backend(variant: str, directory: str, max_open_stores: int):
+    backend, dtype = BACKEND_VARIANTS[variant]
+    if backend == "chroma":
+        from services.chroma_store import ChromaVectorStore
+        return ChromaVectorStore(persist_directory=directory, collection_name="benchmark", persistent=True)
+
+    from services.numpy_store import NumpyVectorStore
+    return NumpyVectorStore(persist_directory=directory, dtype=dtype, max_open_stores=max_open_stores)
+
+
+def _directory_size(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for filename in files:
+            total += os.path.getsize(os.path.join(root, filename))
+    return total
+
+
+def run_variant(args) -> None:
+    """자식 프로세스: 백엔드 하나를 가게 수 하나로 측정하고 결과를 JSON 파일로 저장"""
+    from services.vector_store import StoreDocumentDiff
+
+    rng = np.random.default_rng(args.seed)
+    directory = os.path.join(args.work_directory, "data")
+    backend = _create_backend(args.variant, directory, args.max_open_stores)
+    backend.open()
+
+    # 1. 저장 (가게 batch_stores개씩 한 번에 반영, 실제 일괄 등록과 같은 경로)
+    started = time.perf_counter()
+    for start in range(0, args.stores, args.batch_stores):
+        diffs: List[StoreDocumentDiff] = []
+        embeddings = {}
+        for store_index in range(start, min(start + args.batch_stores, args.stores)):
+            store_id = f"store_{store_index}"
+            vectors = rng.standard_normal((args.sentences_per_store, args.dim), dtype=np.float32)
+            added = {}
+            for sentence_index, vector in enumerate(vectors):
+                doc_id = f"{store_id}_{sentence_index:016x}"
+                added[doc_id] = f"{store_id}의 {sentence_index}번째 문장입니다."
+                embeddings[doc_id] = vector.tolist()
+            diffs.append(StoreDocumentDiff(store_id=store_id, added=added))
+        backend.apply(diffs, embeddings)
+    insert_seconds = time.perf_counter() - started
+    backend.close()
+
+    # 2. 재시작 시 다시 열기
+    baseline = memory_kb()
+    started = time.perf_counter()
+    backend = _create_backend(args.variant, directory, args.max_open_stores)
+    backend.open()
+    stats = backend.stats()
+    open_seconds = time.perf_counter() - started
+
+    # 3. 무작위 가게 검색 (처음 warmup_queries개는 제외)
+    latencies = []
+    total_queries = args.warmup_queries + args.queries
+    store_indexes = rng.integers(0, args.stores, size=total_queries)
+    queries = rng.standard_normal((total_queries, args.dim), dtype=np.float32)
+    started_all = None
+    for i in range(total_queries):
+        if i == args.warmup_queries:
+            started_all = time.perf_counter()
+        started = time.perf_counter()
+        result = backend.query(f"store_{store_indexes[i]}", [queries[i].tolist()], args.n_results)
+        elapsed = (time.perf_counter() - started) * 1000
+        if i >= args.warmup_queries:
+            latencies.append(elapsed)
+        assert len(result["ids"][0]) == min(args.n_results, args.sentences_per_store)
+    query_seconds = time.perf_counter() - started_all
+
+    memory = memory_kb()
+    backend.close()
+
+    result = {
+        "backend": args.variant,
+        "stores": args.stores,
+        "vectors": stats["vectors"],
+        "insert_seconds": round(insert_seconds, 2),
+        "insert_vectors_per_second": round(stats["vectors"] / insert_seconds, 1),
+        "open_seconds": round(open_seconds, 3),
+        "query_latency_ms": {
+            "p50": round(percentile(latencies, 50), 3),
+            "p95": round(percentile(latencies, 95), 3),
+            "p99": round(percentile(latencies, 99), 3)
+        },
+        "queries_per_second": round(args.queries / query_seconds, 1),
+        "disk_bytes": _directory_size(directory),
+        "memory_kb": {
+            "after_open_rss": baseline["rss_kb"],
+            "after_queries_rss": memory["rss_kb"],
+            "peak_rss": memory["peak_rss_kb"]
+        }
+    }
+    with open(args.result_out, "w") as f:
+        json.dump(result, f)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="벡터 저장소 백엔드 벤치마크")
+    parser.add_argument("--backends", nargs="+", default=list(BACKEND_VARIANTS), choices=list(BACKEND_VARIANTS))
+    parser.add_argument("--stores", nargs="+", type=int, default=[10000, 100000])
+    parser.add_argument("--sentences-per-store", type=int, default=20)
+    parser.add_argument("--dim", type=int, default=768, help="임베딩 차원 (KR-SBERT: 768)")
+    parser.add_argument("--batch-stores", type=int, default=500, help="한 번에 반영할 가게 수")
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--warmup-queries", type=int, default=100)
+    parser.add_argument("--n-results", type=int, default=5)
+    parser.add_argument("--max-open-stores", type=int, default=512)
+    parser.add_argument("--seed", type=int, default=0)
+    # 자식 프로세스용 내부 인자
+    parser.add_argument("--variant", help=argparse.SUPPRESS)
+    parser.add_argument("--work-directory", help=argparse.SUPPRESS)
+    parser.add_argument("--result-out", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.variant:
+        args.stores = args.stores[0]
+        run_variant(args)
+        return 0
+
+    results = []
+    for stores in args.stores:
+        # 가게 수/백엔드 조합마다 새 프로세스와 새 디렉토리에서 측정
+        for variant in args.backends:
+            with tempfile.TemporaryDirectory() as tmp:
+                result_out = os.path.join(tmp, "result.json")
+                command = [
+                    sys.executable, "-m", "benchmarks.vector_backends",
+                    "--variant", variant,
+                    "--work-directory", tmp,
+                    "--result-out", result_out,
+                    "--stores", str(stores),
+                    "--sentences-per-store", str(args.sentences_per_store),
+                    "--dim", str(args.dim),
+                    "--batch-stores", str(args.batch_stores),
+                    "--queries", str(args.queries),
+                    "--warmup-queries", str(args.warmup_queries),
+                    "--n-results", str(args.n_results),
+                    "--max-open-stores", str(args.max_open_stores),
+                    "--seed", str(args.seed)
+                ]
+                completed = subprocess.run(command)
+                if completed.returncode != 0:
+                    results.append({
+                        "backend": variant,
+                        "stores": stores,
+                        "error": f"exit code {completed.returncode}"
+                    })
+                    continue
+                with open(result_out) as f:
+                    results.append(json.load(f))
+
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -14,13 +14,104 @@ class Settings(BaseSettings):
     # Gemma API 설정
     gemma_api: str = os.getenv("GEMMA_API")
     
+    # Gemma HTTP 클라이언트 설정
+    gemma_connect_timeout: float = 5.0
+    gemma_read_timeout: float = 120.0
+    gemma_max_connections: int = 20
+    gemma_max_keepalive_connections: int = 10
+    gemma_max_retries: int = 2
+    gemma_retry_backoff: float = 0.5
+    gemma_max_concurrency: int = 8
+    
     # 모델 설정
     embedding_model_name: str = os.getenv("EMBEDDING_MODEL_NAME")
     gemma_model: str = os.getenv("GEMMA_MODEL")
     
+    # 임베딩 백엔드 설정 (torch | onnx | onnx-int8)
+    embedding_backend: str = "torch"
+    embedding_onnx_model_path: str = ""  # onnx: 비어 있으면 embedding_model_name에서 바로 변환 / onnx-int8: 필수
+    embedding_quantization_config: str = "avx2"  # onnx-int8: avx512_vnni | avx512 | avx2 | arm64
+    
+    # 임베딩 마이크로 배칭 설정
+    embedding_batch_max_size: int = 32
+    embedding_batch_max_wait_ms: float = 5.0
+    
+    # 질문 임베딩 캐시 설정 (max_bytes, ttl은 0이면 제한 없음)
+    query_embedding_cache_max_entries: int = 10000
+    query_embedding_cache_max_bytes: int = 64 * 1024 * 1024
+    query_embedding_cache_ttl_seconds: float = 0
+    
+    # 문장 분리 설정 (local: 규칙 기반, llm: Gemma, auto: 비정형 텍스트만 Gemma)
+    sentence_segmentation_mode: str = "auto"
+    segmenter_min_chars: int = 4
+    segmenter_max_chars: int = 80
+    
+    # 가게 정보 일괄 등록 설정
+    register_batch_parse_concurrency: int = 4
+    register_batch_embedding_batch_size: int = 128
+    
+    # 가게 등록 작업 설정 (true면 /store/register가 202와 작업 ID를 바로 반환하고 백그라운드 워커가 등록)
+    register_jobs_enabled: bool = False
+    register_job_database: str = "./register_jobs.sqlite3"
+    register_job_concurrency: int = 2            # 프로세스당 동시에 실행할 등록 작업 수
+    register_job_poll_interval_seconds: float = 1.0
+    register_job_lease_seconds: float = 600      # 실행 중인 워커가 이 시간 동안 리스를 연장하지 못하면 다시 대기열로
+    register_job_max_attempts: int = 3
+    register_job_retention_seconds: float = 86400  # 끝난 작업 보관 시간 (0이면 삭제 안 함)
+    
+    # 벡터 저장소 백엔드 설정 (chroma: ChromaDB 컬렉션 하나, numpy: 가게별 NumPy 행렬 + 메모리 매핑)
+    vector_store_backend: str = "chroma"
+    numpy_store_directory: str = "./numpy_store"
+    numpy_store_dtype: str = "float32"  # float32 | float16
+    numpy_store_max_open_stores: int = 512  # 메모리 매핑을 유지할 최대 가게 수 (가게당 파일 핸들 1개)
+    
     # ChromaDB 설정
     chroma_persist_directory: str = os.getenv("CHROMA_PERSIST_DIRECTORY")
     chroma_collection_name: str = os.getenv("CHROMA_COLLECTION_NAME")
+    chroma_mode: str = "persistent"  # persistent | memory
+    chroma_snapshot_directory: str = "./chroma_snapshots"  # numpy 백엔드 스냅샷도 여기에 저장
+    
+    # 관리자 API 설정 (비어 있으면 관리자 API 비활성화)
+    admin_token: str = ""
+    
+    # OCR 워커 풀 설정
+    ocr_workers: int = 2
+    ocr_max_queue: int = 8
+    ocr_job_timeout_seconds: float = 60
+    ocr_retry_after_seconds: int = 5
+    ocr_batch_size: int = 8          # 일괄 OCR에서 워커 작업 하나로 함께 검출/인식할 이미지 수
+    ocr_batch_max_files: int = 50    # 일괄 OCR 요청 하나의 최대 파일 수
+    
+    # OCR 전처리 설정 (사업자등록증 이미지)
+    ocr_exif_transpose: bool = True   # EXIF 방향 정보대로 회전 보정
+    ocr_crop_region: str = "0,0,1,0.5"  # 인식할 영역 비율 left,top,right,bottom (full이면 전체)
+    ocr_max_long_edge: int = 1600     # 자른 영역의 긴 변을 이 크기로 축소 (0이면 축소 안 함)
+    ocr_grayscale: bool = True
+    ocr_extraction_mode: str = "targeted"  # targeted(라벨 주변 영역만 인식) | full(전체 인식 후 정규식)
+    
+    # OCR 결과 캐시 (업로드 이미지의 SHA-256 기준, 같은 이미지 재업로드 시 OCR 생략)
+    ocr_cache_backend: str = "memory"  # memory | disk | off
+    ocr_cache_directory: str = "./ocr_cache"
+    ocr_cache_max_entries: int = 1024
+    ocr_cache_max_bytes: int = 16 * 1024 * 1024
+    ocr_cache_ttl_seconds: float = 86400
+    
+    # 공유 추론 서버 설정 (uvicorn 워커 여러 개가 임베딩/OCR 모델을 프로세스 하나에서 공유)
+    inference_server_enabled: bool = False  # true면 API 워커는 모델을 로드하지 않고 추론 서버에 요청
+    inference_server_socket: str = "/tmp/chatbot-inference.sock"
+    inference_server_fallback: bool = True  # 추론 서버에 연결할 수 없으면 워커 프로세스에서 직접 추론
+    inference_server_startup_wait_seconds: float = 60  # 워밍업 시 추론 서버 준비를 기다리는 최대 시간
+    inference_server_metrics_port: int = 0  # 추론 서버 Prometheus 메트릭 포트 (0이면 끔)
+    inference_client_timeout_seconds: float = 120
+    inference_client_max_connections: int = 16  # 워커 프로세스당 추론 서버 최대 연결 수
+    
+    # PDF OCR 설정
+    pdf_ocr_dpi: int = 200
+    pdf_ocr_max_pages_in_flight: int = 2
+    pdf_ocr_max_file_size_mb: int = 50
+    
+    # 시작 설정 (true면 모델 로드/워밍업이 끝난 뒤에 요청을 받음)
+    startup_wait_for_models: bool = False
     
     # API 설정
     api_host: str = os.getenv("API_HOST")
@@ -29,6 +120,23 @@ class Settings(BaseSettings):
     # 검색 설정
     search_n_results: int = 5
     
+    # FAQ 설정 (가장 가까운 FAQ 질문과의 코사인 유사도가 임계값 이상이면 Gemma 없이 FAQ 답변 반환)
+    faq_enabled: bool = True
+    faq_similarity_threshold: float = 0.9
+    
+    # 답변 컨텍스트 설정 (검색 결과 중 관련 있고 겹치지 않는 문장만 토큰 예산 안에서 사용, 0이면 해당 필터 끔)
+    context_max_distance: float = 0.6          # 코사인 거리(1 - 유사도)가 이보다 먼 문장 제외
+    context_duplicate_similarity: float = 0.95  # 이미 고른 문장과 이 유사도 이상이면 중복으로 제외
+    context_token_budget: int = 256            # 컨텍스트 최대 추정 토큰 수
+    context_chars_per_token: float = 1.5       # 토큰 수 추정용 (한국어 기준 근사치)
+    
+    # 답변 캐시 설정 (같은 검색 결과 + 코사인 유사도 임계값 이상이면 이전 답변 재사용)
+    answer_cache_enabled: bool = True
+    answer_cache_similarity_threshold: float = 0.95
+    answer_cache_max_entries_per_store: int = 256
+    answer_cache_max_stores: int = 10000
+    answer_cache_ttl_seconds: float = 3600
+    
     class Config:
         env_file = ".env"
         case_sensitive = False
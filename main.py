@@ -2,25 +2,71 @@
 소상공인 가게 정보 챗봇 API
 모듈화된 FastAPI 애플리케이션
 """
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 import uvicorn
-from api import store_router, company_router
+from api import store_router, company_router, admin_router, metrics_router, PrometheusMiddleware
+from api import dependencies
+from api.store_routes import run_registration_job
+from services.service_registry import ServiceNotReadyError
 from config import get_settings
 
 # 설정 로드
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    모델/클라이언트를 병렬로 로드하고 워밍업
+    
+    기본적으로 로드는 백그라운드에서 진행되어 서버가 바로 요청을 받으며,
+    준비 상태는 GET /ready로 확인합니다.
+    STARTUP_WAIT_FOR_MODELS=true이면 로드가 끝난 뒤에 요청을 받습니다.
+    REGISTER_JOBS_ENABLED=true이면 등록 작업 워커도 시작합니다
+    (모델이 준비되기 전에 가져간 작업은 다시 대기열로 돌려놓고 기다림).
+    """
+    load_task = asyncio.create_task(dependencies.registry.load_all())
+    if settings.startup_wait_for_models:
+        await load_task
+    if settings.register_jobs_enabled:
+        dependencies.get_registration_jobs().start(run_registration_job)
+    try:
+        yield
+    finally:
+        if not load_task.done():
+            await load_task
+        await dependencies.shutdown()
+
+
 # FastAPI 앱 초기화
 app = FastAPI(
     title="소상공인 가게 정보 챗봇 API",
     description="Gemma API와 ChromaDB를 활용한 가게 정보 관리 및 질의응답 시스템",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # 라우터 등록
 app.include_router(store_router)
 app.include_router(company_router)
+app.include_router(admin_router)
+app.include_router(metrics_router)
+
+# 요청별 처리 시간/처리 중인 요청 수 메트릭
+app.add_middleware(PrometheusMiddleware)
+
 
+@app.exception_handler(ServiceNotReadyError)
+async def service_not_ready_handler(request: Request, exc: ServiceNotReadyError):
+    """모델 로드 전 요청은 503으로 응답"""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": "5"}
+    )
 
 
 @app.get("/")
@@ -31,11 +77,21 @@ async def root():
         "status": "running",
         "version": "1.0.0",
         "endpoints": {
-            "POST /store/register": "가게 정보 등록",
+            "POST /store/register": "가게 정보 등록 (작업 모드에서는 202 + 작업 ID)",
+            "GET /store/register/{job_id}": "가게 정보 등록 작업 상태 조회",
+            "POST /store/register-batch": "가게 정보 일괄 등록",
             "POST /store/question": "가게에 대한 질문",
+            "POST /store/question/stream": "가게에 대한 질문 (답변 스트리밍)",
+            "GET /store/stats": "내부 통계 조회",
             "POST /company/ocr": "사진에서 OCR로 텍스트 추출",
+            "POST /company/ocr/batch": "여러 사진에서 사업자등록증 정보 일괄 추출",
             "POST /company/pdf-ocr": "PDF에서 OCR로 텍스트 추출",
+            "POST /admin/snapshots": "벡터 DB 스냅샷 생성 (관리자)",
+            "POST /admin/snapshots/restore": "벡터 DB 스냅샷 복원 (관리자)",
+            "POST /admin/compact": "벡터 DB 압축 (관리자)",
             "GET /health": "서버 상태 확인",
+            "GET /ready": "모델 로드 상태 확인",
+            "GET /metrics": "Prometheus 메트릭",
             "GET /docs": "API 문서 (Swagger UI)"
         }
     }
@@ -43,10 +99,28 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    """서버 상태 확인"""
+    """서버 상태 확인 (프로세스 생존 여부)"""
     return {"status": "healthy"}
 
 
+@app.get("/ready")
+async def readiness_check():
+    """
+    모델 로드 상태 확인
+    
+    모든 구성 요소(Gemma, 임베딩 모델, 벡터 DB, OCR 워커)가 준비되면 200,
+    아니면 503을 반환합니다. 구성 요소별 상태와 로드/워밍업 시간이 포함됩니다.
+    """
+    ready = dependencies.registry.ready
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "status": "ready" if ready else "loading",
+            "components": dependencies.registry.status()
+        }
+    )
+
+
 if __name__ == "__main__":
     uvicorn.run(
         "main:app",
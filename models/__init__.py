@@ -2,15 +2,27 @@
 Models 패키지 초기화
 """
 from .schemas import (
+    FAQEntry,
     StoreRegistrationRequest,
     QuestionRequest,
     StoreRegistrationResponse,
+    RegistrationJobAccepted,
+    RegistrationJobStatus,
+    StoreBatchRegistrationRequest,
+    StoreBatchRegistrationItem,
+    StoreBatchRegistrationResponse,
     QuestionResponse
 )
 
 __all__ = [
+    "FAQEntry",
     "StoreRegistrationRequest",
     "QuestionRequest",
     "StoreRegistrationResponse",
+    "RegistrationJobAccepted",
+    "RegistrationJobStatus",
+    "StoreBatchRegistrationRequest",
+    "StoreBatchRegistrationItem",
+    "StoreBatchRegistrationResponse",
     "QuestionResponse"
 ]
@@ -2,10 +2,17 @@ from pydantic import BaseModel
 from typing import List, Optional
 
 
+class FAQEntry(BaseModel):
+    """가게 FAQ 항목 (질문과 그대로 돌려줄 답변)"""
+    question: str
+    answer: str
+
+
 class StoreRegistrationRequest(BaseModel):
-    """가게 정보 등록 요청"""
+    """가게 정보 등록 요청 (faqs를 생략하면 기존 FAQ 유지, 빈 목록이면 FAQ 삭제)"""
     store_id: str
     description: str
+    faqs: Optional[List[FAQEntry]] = None
 
 
 class QuestionRequest(BaseModel):
@@ -19,6 +26,55 @@ class StoreRegistrationResponse(BaseModel):
     store_id: str
     parsed_sentences: List[str]
     message: str
+    segmentation_mode: Optional[str] = None
+    added_count: int = 0
+    kept_count: int = 0
+    removed_count: int = 0
+    faq_count: Optional[int] = None
+
+
+class RegistrationJobAccepted(BaseModel):
+    """가게 정보 등록 작업 접수 응답 (202)"""
+    job_id: str
+    store_id: str
+    status: str
+
+
+class RegistrationJobStatus(BaseModel):
+    """가게 정보 등록 작업 상태 (status: queued | running | succeeded | failed)"""
+    job_id: str
+    store_id: str
+    status: str
+    attempts: int = 0
+    created_at: str
+    updated_at: str
+    result: Optional[StoreRegistrationResponse] = None
+    error: Optional[str] = None
+
+
+class StoreBatchRegistrationRequest(BaseModel):
+    """가게 정보 일괄 등록 요청"""
+    stores: List[StoreRegistrationRequest]
+
+
+class StoreBatchRegistrationItem(BaseModel):
+    """가게 정보 일괄 등록 결과 (가게별)"""
+    store_id: str
+    success: bool
+    parsed_sentences: List[str] = []
+    segmentation_mode: Optional[str] = None
+    added_count: int = 0
+    kept_count: int = 0
+    removed_count: int = 0
+    faq_count: Optional[int] = None
+    error: Optional[str] = None
+
+
+class StoreBatchRegistrationResponse(BaseModel):
+    """가게 정보 일괄 등록 응답"""
+    results: List[StoreBatchRegistrationItem]
+    succeeded: int
+    failed: int
 
 
 class QuestionResponse(BaseModel):
@@ -26,6 +82,7 @@ class QuestionResponse(BaseModel):
     store_id: str
     question: str
     answer: str
+    source: str = "llm"  # faq: FAQ 답변 그대로 | cache: 답변 캐시 | llm: Gemma 생성
 
 
 # OCR 관련 스키마
@@ -50,6 +107,19 @@ class BusinessInfoResponse(BaseModel):
     parsed: bool
 
 
+class BatchBusinessInfoResult(BaseModel):
+    """일괄 OCR 파일별 결과 (실패하면 info 없이 error)"""
+    index: int
+    filename: Optional[str] = None
+    info: Optional[BusinessInfoResponse] = None
+    error: Optional[str] = None
+
+
+class BatchBusinessInfoResponse(BaseModel):
+    """일괄 OCR 응답 (업로드 순서 유지)"""
+    results: List[BatchBusinessInfoResult]
+
+
 class PDFPageResult(BaseModel):
     """PDF 페이지별 OCR 결과"""
     page_number: int
@@ -63,3 +133,33 @@ class PDFOCRResponse(BaseModel):
     text: str
     pages: List[PDFPageResult] = []
     error: Optional[str] = None
+
+
+# 관리자 API 스키마
+class SnapshotInfo(BaseModel):
+    """벡터 DB 스냅샷 정보"""
+    name: str
+    size_bytes: int
+    created_at: str
+
+
+class SnapshotCreateRequest(BaseModel):
+    """스냅샷 생성 요청"""
+    name: Optional[str] = None
+
+
+class SnapshotRestoreRequest(BaseModel):
+    """스냅샷 복원 요청"""
+    name: str
+
+
+class VectorDBStatsResponse(BaseModel):
+    """벡터 DB 통계"""
+    stores: Optional[int] = None  # chroma 백엔드는 None (모든 메타데이터를 읽어야 해서 세지 않음)
+    vectors: int
+
+
+class CompactionResponse(BaseModel):
+    """벡터 DB 압축 결과"""
+    size_before: int
+    size_after: int
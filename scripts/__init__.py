@@ -0,0 +1,3 @@
+"""
+운영 스크립트
+"""
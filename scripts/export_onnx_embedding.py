@@ -0,0 +1,90 @@
+"""
+임베딩 모델 ONNX 변환 스크립트
+
+EMBEDDING_MODEL_NAME 모델을 ONNX로 내보내고, 선택적으로 int8 동적 양자화 모델을 함께 저장한 뒤
+PyTorch 출력과의 일치도를 검사합니다.
+
+사용법:
+    python -m scripts.export_onnx_embedding --output ./models/kr-sbert-onnx --quantize avx2
+
+이후 .env에 다음을 설정합니다:
+    EMBEDDING_BACKEND=onnx-int8
+    EMBEDDING_ONNX_MODEL_PATH=./models/kr-sbert-onnx
+    EMBEDDING_QUANTIZATION_CONFIG=avx2
+"""
+import argparse
+import json
+import sys
+from config import get_settings
+from services.embedding_service import compare_embeddings, load_sentence_transformer
+
+PARITY_SENTENCES = [
+    "영업시간이 어떻게 되나요?",
+    "주차 가능한가요?",
+    "우리 가게는 30년 전통의 한식 전문점입니다.",
+    "매일 아침 신선한 재료를 직접 시장에서 구매하여 준비합니다.",
+    "할머니의 비법 된장으로 만든 된장찌개가 시그니처 메뉴입니다.",
+    "가족 단위 손님들이 많이 찾아주시며, 넓은 좌석과 주차 공간을 제공합니다.",
+    "매주 월요일은 정기 휴무입니다.",
+    "예약은 전화로만 받습니다."
+]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="임베딩 모델 ONNX 변환 및 출력 일치도 검사")
+    parser.add_argument("--output", required=True, help="ONNX 모델을 저장할 디렉토리")
+    parser.add_argument("--model", default=None, help="임베딩 모델 이름 (기본값: EMBEDDING_MODEL_NAME)")
+    parser.add_argument(
+        "--quantize",
+        default=None,
+        help="int8 동적 양자화 설정 (avx512_vnni, avx512, avx2, arm64). 생략하면 양자화하지 않음"
+    )
+    parser.add_argument("--min-cosine", type=float, default=0.99, help="ONNX 출력 최소 코사인 유사도")
+    parser.add_argument("--min-cosine-int8", type=float, default=0.97, help="int8 출력 최소 코사인 유사도")
+    args = parser.parse_args()
+
+    from sentence_transformers import export_dynamic_quantized_onnx_model
+
+    model_name = args.model or get_settings().embedding_model_name
+
+    # 1. ONNX 변환 후 저장
+    onnx_model = load_sentence_transformer(model_name, backend="onnx")
+    onnx_model.save_pretrained(args.output)
+    print(f"ONNX 모델 저장: {args.output}")
+
+    # 2. int8 동적 양자화
+    if args.quantize:
+        export_dynamic_quantized_onnx_model(onnx_model, args.quantize, args.output)
+        print(f"int8 양자화 모델 저장: {args.output}/onnx/model_qint8_{args.quantize}.onnx")
+
+    # 3. PyTorch 출력과 비교
+    reference = load_sentence_transformer(model_name, backend="torch").encode(PARITY_SENTENCES)
+    report = {
+        "onnx": compare_embeddings(
+            reference,
+            load_sentence_transformer(model_name, backend="onnx", onnx_model_path=args.output)
+            .encode(PARITY_SENTENCES)
+        )
+    }
+    if args.quantize:
+        report["onnx-int8"] = compare_embeddings(
+            reference,
+            load_sentence_transformer(
+                model_name,
+                backend="onnx-int8",
+                onnx_model_path=args.output,
+                quantization_config=args.quantize
+            ).encode(PARITY_SENTENCES)
+        )
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+    passed = report["onnx"]["min_cosine"] >= args.min_cosine and (
+        "onnx-int8" not in report or report["onnx-int8"]["min_cosine"] >= args.min_cosine_int8
+    )
+    if not passed:
+        print("출력 일치도가 기준보다 낮습니다.", file=sys.stderr)
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,29 @@
 """
 Services 패키지 초기화
+
+무거운 의존성(sentence-transformers, chromadb, easyocr 등)을 패키지 import 시점에
+불러오지 않도록 각 클래스는 처음 접근할 때 import합니다.
 """
-from .gemma_service import GemmaService
-from .embedding_service import EmbeddingService
-from .vectordb_service import VectorDBService
-
-__all__ = [
-    "GemmaService",
-    "EmbeddingService",
-    "VectorDBService"
-]
+import importlib
+
+_EXPORTS = {
+    "GemmaService": ".gemma_service",
+    "EmbeddingService": ".embedding_service",
+    "EmbeddingBatcher": ".embedding_batcher",
+    "VectorDBService": ".vectordb_service",
+    "AnswerCache": ".answer_cache",
+    "OCRResultCache": ".ocr_cache",
+    "KoreanSentenceSegmenter": ".sentence_segmenter",
+    "SentenceParser": ".sentence_segmenter",
+    "ServiceRegistry": ".service_registry",
+    "ServiceNotReadyError": ".service_registry"
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(_EXPORTS[name], __name__)
+    return getattr(module, name)
@@ -0,0 +1,184 @@
+"""
+가게별 시맨틱 답변 캐시
+같은 가게에 대한 거의 같은 질문이 같은 검색 결과를 가져오면 이전 답변을 재사용합니다.
+"""
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+import numpy as np
+from config import get_settings
+
+
+@dataclass
+class AnswerCacheEntry:
+    """캐시된 답변"""
+    question_embedding: np.ndarray  # L2 정규화된 질문 임베딩
+    context_key: str                # 검색된 문서 ID 조합
+    answer: str
+    created_at: float
+
+
+class AnswerCache:
+    """store_id + 질문 임베딩 기준 답변 캐시"""
+
+    def __init__(
+        self,
+        similarity_threshold: float = None,
+        max_entries_per_store: int = None,
+        max_stores: int = None,
+        ttl_seconds: float = None
+    ):
+        """
+        Args:
+            similarity_threshold: 캐시 적중으로 볼 최소 코사인 유사도
+            max_entries_per_store: 가게별 최대 캐시 항목 수
+            max_stores: 캐시를 유지할 최대 가게 수
+            ttl_seconds: 항목 유효 시간 (0이면 만료 없음)
+        """
+        settings = get_settings()
+        self.similarity_threshold = (
+            similarity_threshold if similarity_threshold is not None
+            else settings.answer_cache_similarity_threshold
+        )
+        self.max_entries_per_store = max_entries_per_store or settings.answer_cache_max_entries_per_store
+        self.max_stores = max_stores or settings.answer_cache_max_stores
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.answer_cache_ttl_seconds
+
+        self._stores: "OrderedDict[str, List[AnswerCacheEntry]]" = OrderedDict()
+        # 무효화 세대 번호 (생성 중 무효화된 답변이 저장되지 않도록)
+        self._generations: Dict[str, int] = {}
+        self._global_generation = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_context_key(document_ids: List[str]) -> str:
+        """검색된 문서 ID 목록으로 컨텍스트 키 생성"""
+        return "|".join(document_ids)
+
+    @staticmethod
+    def _normalize(embedding: np.ndarray) -> np.ndarray:
+        embedding = np.asarray(embedding, dtype=np.float32).reshape(-1)
+        norm = np.linalg.norm(embedding)
+        return embedding / norm if norm else embedding
+
+    def generation(self, store_id: str) -> tuple:
+        """
+        가게의 현재 무효화 세대 번호
+
+        검색 전에 읽어 두었다가 store()에 넘기면, 그 사이 무효화가 일어난 경우 저장을 건너뜁니다.
+        """
+        with self._lock:
+            return (self._global_generation, self._generations.get(store_id, 0))
+
+    def lookup(self, store_id: str, question_embedding: np.ndarray, context_key: str) -> Optional[str]:
+        """
+        캐시된 답변 조회
+
+        Args:
+            store_id: 가게 ID
+            question_embedding: 질문 임베딩
+            context_key: 현재 검색 결과의 컨텍스트 키
+
+        Returns:
+            캐시된 답변 또는 None
+        """
+        query = self._normalize(question_embedding)
+        now = time.monotonic()
+
+        with self._lock:
+            entries = self._stores.get(store_id)
+            if not entries:
+                self.misses += 1
+                return None
+
+            if self.ttl_seconds:
+                entries[:] = [e for e in entries if now - e.created_at < self.ttl_seconds]
+
+            candidates = [e for e in entries if e.context_key == context_key]
+            if candidates:
+                similarities = np.stack([e.question_embedding for e in candidates]) @ query
+                best = int(np.argmax(similarities))
+                if similarities[best] >= self.similarity_threshold:
+                    entry = candidates[best]
+                    # LRU 순서 갱신
+                    entries.remove(entry)
+                    entries.append(entry)
+                    self._stores.move_to_end(store_id)
+                    self.hits += 1
+                    return entry.answer
+
+            self.misses += 1
+            return None
+
+    def store(
+        self,
+        store_id: str,
+        question_embedding: np.ndarray,
+        context_key: str,
+        answer: str,
+        generation: tuple = None
+    ) -> None:
+        """
+        답변을 캐시에 저장
+
+        Args:
+            store_id: 가게 ID
+            question_embedding: 질문 임베딩
+            context_key: 검색 결과의 컨텍스트 키
+            answer: 생성된 답변
+            generation: 검색 전에 읽은 generation() 값
+        """
+        entry = AnswerCacheEntry(
+            question_embedding=self._normalize(question_embedding),
+            context_key=context_key,
+            answer=answer,
+            created_at=time.monotonic()
+        )
+
+        with self._lock:
+            current = (self._global_generation, self._generations.get(store_id, 0))
+            if generation is not None and generation != current:
+                return
+
+            entries = self._stores.setdefault(store_id, [])
+            entries.append(entry)
+            if len(entries) > self.max_entries_per_store:
+                del entries[0]
+
+            self._stores.move_to_end(store_id)
+            while len(self._stores) > self.max_stores:
+                self._stores.popitem(last=False)
+
+    def invalidate(self, store_id: Optional[str] = None) -> None:
+        """
+        가게의 캐시 항목 무효화
+
+        Args:
+            store_id: 가게 ID (None이면 전체 무효화)
+        """
+        with self._lock:
+            if store_id is None:
+                self._stores.clear()
+                self._global_generation += 1
+            else:
+                self._stores.pop(store_id, None)
+                self._generations[store_id] = self._generations.get(store_id, 0) + 1
+            self.invalidations += 1
+
+    def stats(self) -> Dict:
+        """캐시 통계 반환"""
+        total = self.hits + self.misses
+        return {
+            "stores": len(self._stores),
+            "entries": sum(len(entries) for entries in self._stores.values()),
+            "similarity_threshold": self.similarity_threshold,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_rate": self.hits / total if total else 0.0
+        }
@@ -0,0 +1,281 @@
+"""
+범용 LRU 캐시 (메모리 / 로컬 디스크)
+"""
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_size(value: Any) -> int:
+    """캐시 값의 대략적인 메모리 크기 (바이트)"""
+    nbytes = getattr(value, "nbytes", None)
+    if nbytes is not None:
+        return int(nbytes)
+    return sys.getsizeof(value)
+
+
+class LRUCache:
+    """항목 수, 총 크기, TTL로 제한되는 스레드 안전 LRU 캐시"""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 0,
+        ttl_seconds: float = 0,
+        sizeof: Callable[[Any], int] = estimate_size
+    ):
+        """
+        Args:
+            max_entries: 최대 항목 수
+            max_bytes: 최대 총 크기 (0이면 제한 없음)
+            ttl_seconds: 항목 유효 시간 (0이면 만료 없음)
+            sizeof: 값의 크기를 계산하는 함수
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._sizeof = sizeof
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """캐시 조회 (없거나 만료되면 None)"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, size, expires_at = entry
+            if expires_at and expires_at < time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """캐시 저장 (제한을 넘으면 오래된 항목부터 제거)"""
+        size = self._sizeof(value)
+        if self.max_bytes and size > self.max_bytes:
+            return
+
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else 0
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = (value, size, expires_at)
+            self.current_bytes += size
+
+            while self._data and (
+                len(self._data) > self.max_entries
+                or (self.max_bytes and self.current_bytes > self.max_bytes)
+            ):
+                oldest = next(iter(self._data))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def pop(self, key: Hashable) -> None:
+        """항목 제거"""
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+
+    def clear(self) -> None:
+        """모든 항목 제거"""
+        with self._lock:
+            self._data.clear()
+            self.current_bytes = 0
+
+    def _remove(self, key: Hashable) -> None:
+        _, size, _ = self._data.pop(key)
+        self.current_bytes -= size
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict:
+        """캐시 통계 반환"""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "bytes": self.current_bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / total if total else 0.0
+        }
+
+
+class DiskLRUCache:
+    """
+    JSON으로 직렬화할 수 있는 값을 로컬 디스크에 저장하는 LRU 캐시
+
+    항목마다 파일 하나(directory/ab/abcd....json)를 쓰고, 항목 목록과 사용 순서는 메모리에 둡니다.
+    재시작하면 파일 수정 시각 순서로 목록을 다시 만들며, TTL도 수정 시각(저장 시각) 기준입니다.
+    LRUCache와 같은 get/put/pop/clear/stats 인터페이스를 제공합니다.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_entries: int = 1024,
+        max_bytes: int = 0,
+        ttl_seconds: float = 0
+    ):
+        """
+        Args:
+            directory: 캐시 파일 디렉토리
+            max_entries: 최대 항목 수
+            max_bytes: 최대 총 파일 크기 (0이면 제한 없음)
+            ttl_seconds: 항목 유효 시간 (0이면 만료 없음)
+        """
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        # key -> (파일 크기, 저장 시각)
+        self._index: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def _load_index(self) -> None:
+        """디렉토리를 훑어서 기존 항목 목록 복원 (오래된 것부터)"""
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for filename in files:
+                if not filename.endswith(".json"):
+                    continue
+                try:
+                    stat = os.stat(os.path.join(root, filename))
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, filename[:-len(".json")], stat.st_size))
+        for mtime, key, size in sorted(entries):
+            self._index[key] = (size, mtime)
+            self.current_bytes += size
+        with self._lock:
+            self._evict()
+
+    def _expired(self, stored_at: float) -> bool:
+        return bool(self.ttl_seconds) and stored_at + self.ttl_seconds < time.time()
+
+    def get(self, key: str) -> Optional[Any]:
+        """캐시 조회 (없거나 만료되면 None)"""
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if self._expired(entry[1]):
+                self._remove(key)
+                self.misses += 1
+                return None
+            try:
+                with open(self._path(key), encoding="utf-8") as f:
+                    value = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"디스크 캐시 항목을 읽지 못해 제거합니다 ({key}): {str(e)}")
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._index.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: str, value: Any) -> None:
+        """캐시 저장 (임시 파일에 쓴 뒤 교체, 제한을 넘으면 오래된 항목부터 제거)"""
+        data = json.dumps(value, ensure_ascii=False).encode("utf-8")
+        if self.max_bytes and len(data) > self.max_bytes:
+            return
+
+        path = self._path(key)
+        with self._lock:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            except OSError:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+
+            if key in self._index:
+                self.current_bytes -= self._index.pop(key)[0]
+            self._index[key] = (len(data), time.time())
+            self.current_bytes += len(data)
+            self._evict()
+
+    def pop(self, key: str) -> None:
+        """항목 제거"""
+        with self._lock:
+            if key in self._index:
+                self._remove(key)
+
+    def clear(self) -> None:
+        """모든 항목 제거"""
+        with self._lock:
+            for key in list(self._index):
+                self._remove(key)
+
+    def _evict(self) -> None:
+        while self._index and (
+            len(self._index) > self.max_entries
+            or (self.max_bytes and self.current_bytes > self.max_bytes)
+        ):
+            self._remove(next(iter(self._index)))
+            self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        size, _ = self._index.pop(key)
+        self.current_bytes -= size
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def stats(self) -> Dict:
+        """캐시 통계 반환"""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._index),
+            "bytes": self.current_bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / total if total else 0.0
+        }
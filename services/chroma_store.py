@@ -0,0 +1,207 @@
+"""
+ChromaDB 벡터 저장소 백엔드
+모든 가게의 문서를 하나의 컬렉션에 저장하고 store_id 메타데이터로 필터링합니다.
+"""
+import logging
+import os
+import shutil
+import sqlite3
+from typing import Any, Callable, Dict, List, Optional, Set
+import numpy as np
+from .vector_store import StoreDocumentDiff, VectorStoreBackend
+
+logger = logging.getLogger(__name__)
+
+# ChromaDB가 영속 모드에서 사용하는 SQLite 파일 이름
+CHROMA_SQLITE_FILENAME = "chroma.sqlite3"
+
+
+def _collection_space(collection) -> str:
+    """컬렉션의 거리 함수 (메타데이터 또는 1.x 컬렉션 설정, 지정이 없으면 ChromaDB 기본값 l2)"""
+    space = (collection.metadata or {}).get("hnsw:space")
+    if space is None:
+        configuration = getattr(collection, "configuration", None) or {}
+        space = (configuration.get("hnsw") or {}).get("space")
+    return space or "l2"
+
+
+def _to_cosine_distances(result: Dict[str, Any], query_embeddings: List[List[float]]) -> None:
+    """
+    l2/ip 컬렉션의 검색 결과 거리를 코사인 거리로 다시 계산하고 그 순서로 정렬 (result를 직접 수정)
+
+    ChromaDB는 거리 함수 기준으로 n_results개를 고르므로, 후보 집합은 코사인 기준 top-k와 다를 수 있습니다.
+    """
+    for index, query in enumerate(query_embeddings):
+        vectors = np.asarray(result["embeddings"][index], dtype=np.float32)
+        if len(vectors) == 0:
+            continue
+        query = np.asarray(query, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1) * np.linalg.norm(query)
+        distances = 1.0 - (vectors @ query) / np.maximum(norms, 1e-12)
+        order = np.argsort(distances, kind="stable")
+        for key in ("ids", "documents", "metadatas"):
+            if result.get(key) is not None:
+                result[key][index] = [result[key][index][i] for i in order]
+        result["embeddings"][index] = vectors[order]
+        result["distances"][index] = [float(distances[i]) for i in order]
+
+
+class ChromaVectorStore(VectorStoreBackend):
+    """ChromaDB 컬렉션 기반 벡터 저장소"""
+
+    name = "chroma"
+    marker_filename = CHROMA_SQLITE_FILENAME
+
+    def __init__(self, persist_directory: str, collection_name: str, persistent: bool = True):
+        """
+        Args:
+            persist_directory: ChromaDB 데이터 디렉토리
+            collection_name: 컬렉션 이름
+            persistent: False면 EphemeralClient 사용
+        """
+        super().__init__(persist_directory, persistent)
+        self.collection_name = collection_name
+        self.client = None
+        self.collection = None
+        self.distance_space = "cosine"
+
+    def open(self) -> None:
+        """ChromaDB 클라이언트와 컬렉션 열기"""
+        # 무거운 모듈은 실제로 클라이언트를 만들 때만 import
+        import chromadb
+        from chromadb.config import Settings as ChromaSettings
+
+        chroma_settings = ChromaSettings(anonymized_telemetry=False)
+
+        # ChromaDB 클라이언트 초기화 (영속 모드는 기존 인덱스를 그대로 다시 연다)
+        if self.persistent:
+            self.client = chromadb.PersistentClient(
+                path=self.persist_directory,
+                settings=chroma_settings
+            )
+        else:
+            self.client = chromadb.EphemeralClient(settings=chroma_settings)
+
+        # 컬렉션 생성 또는 가져오기 (새로 만드는 컬렉션은 코사인 거리 사용)
+        self.collection = self.client.get_or_create_collection(
+            name=self.collection_name,
+            metadata={"hnsw:space": "cosine"}
+        )
+        # metadata는 새 컬렉션에만 적용되므로, 이전에 만든 컬렉션은 실제 거리 함수를 확인
+        self.distance_space = _collection_space(self.collection)
+        if self.distance_space != "cosine":
+            logger.warning(
+                f"ChromaDB 컬렉션 '{self.collection_name}'의 거리 함수가 {self.distance_space}입니다. "
+                "검색 결과 거리는 코사인 거리로 다시 계산하지만 후보 선택은 기존 거리 기준입니다. "
+                "코사인 컬렉션을 쓰려면 컬렉션 이름(CHROMA_COLLECTION_NAME)을 바꾸거나 컬렉션을 지운 뒤 가게 정보를 다시 등록하세요."
+            )
+
+    def close(self) -> None:
+        """ChromaDB 클라이언트 종료 (파일 핸들 해제)"""
+        from chromadb.api.client import SharedSystemClient
+
+        self.collection = None
+        self.client = None
+        SharedSystemClient.clear_system_cache()
+
+    def stats(self) -> Dict[str, Optional[int]]:
+        # 가게 수를 세려면 모든 메타데이터를 읽어야 하므로 제공하지 않음
+        return {"stores": None, "vectors": self.collection.count()}
+
+    def existing_ids(self, store_ids: List[str]) -> Dict[str, Set[str]]:
+        existing_ids: Dict[str, Set[str]] = {store_id: set() for store_id in store_ids}
+        if not store_ids:
+            return existing_ids
+
+        existing = self.collection.get(
+            where={"store_id": {"$in": list(store_ids)}},
+            include=["metadatas"]
+        )
+        for doc_id, metadata in zip(existing['ids'], existing['metadatas']):
+            existing_ids[metadata["store_id"]].add(doc_id)
+        return existing_ids
+
+    def apply(self, diffs: List[StoreDocumentDiff], embeddings: Dict[str, List[float]]) -> None:
+        ids, documents, vectors, metadatas = [], [], [], []
+        for diff in diffs:
+            for doc_id, document in diff.added.items():
+                ids.append(doc_id)
+                documents.append(document)
+                vectors.append(embeddings[doc_id])
+                metadatas.append({"store_id": diff.store_id})
+
+        removed_ids = [doc_id for diff in diffs for doc_id in diff.removed]
+        if removed_ids:
+            self._chunked(self.collection.delete, ids=removed_ids)
+
+        if ids:
+            self._chunked(
+                self.collection.add,
+                ids=ids,
+                documents=documents,
+                embeddings=vectors,
+                metadatas=metadatas
+            )
+
+    def _chunked(self, operation: Callable, **columns: List) -> None:
+        """ChromaDB 최대 배치 크기를 넘지 않도록 나눠서 실행"""
+        max_batch_size = self.client.get_max_batch_size()
+        total = len(columns['ids'])
+        for start in range(0, total, max_batch_size):
+            operation(**{name: values[start:start + max_batch_size] for name, values in columns.items()})
+
+    def delete_store(self, store_id: str) -> None:
+        existing = self.collection.get(where={"store_id": store_id}, include=[])
+        if existing['ids']:
+            self.collection.delete(ids=existing['ids'])
+
+    def query(
+        self,
+        store_id: str,
+        query_embeddings: List[List[float]],
+        n_results: int,
+        include_embeddings: bool = False
+    ) -> Dict[str, Any]:
+        # 코사인이 아닌 컬렉션은 거리를 다시 계산하기 위해 임베딩이 필요
+        convert = self.distance_space != "cosine"
+        include = ["documents", "metadatas", "distances"]
+        if include_embeddings or convert:
+            include.append("embeddings")
+        result = self.collection.query(
+            query_embeddings=query_embeddings,
+            where={"store_id": store_id},
+            n_results=n_results,
+            include=include
+        )
+        if convert:
+            _to_cosine_distances(result, query_embeddings)
+            if not include_embeddings:
+                result["embeddings"] = None
+        return result
+
+    def snapshot(self, target: str) -> None:
+        """SQLite는 온라인 백업 API로, 나머지 인덱스 파일은 복사로 저장"""
+        shutil.copytree(
+            self.persist_directory,
+            target,
+            ignore=shutil.ignore_patterns(f"{CHROMA_SQLITE_FILENAME}*")
+        )
+        source_db = sqlite3.connect(os.path.join(self.persist_directory, CHROMA_SQLITE_FILENAME))
+        target_db = sqlite3.connect(os.path.join(target, CHROMA_SQLITE_FILENAME))
+        try:
+            source_db.backup(target_db)
+        finally:
+            target_db.close()
+            source_db.close()
+
+    def compact(self) -> None:
+        """SQLite 파일 VACUUM (검색은 계속 처리됨)"""
+        connection = sqlite3.connect(
+            os.path.join(self.persist_directory, CHROMA_SQLITE_FILENAME),
+            isolation_level=None
+        )
+        try:
+            connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            connection.execute("VACUUM")
+        finally:
+            connection.close()
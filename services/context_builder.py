@@ -0,0 +1,112 @@
+"""
+답변 컨텍스트 구성
+검색된 문장 중 질문과 관련 있고 서로 겹치지 않는 문장만 토큰 예산 안에서 골라
+Gemma 프롬프트를 짧게 유지합니다 (프롬프트가 짧을수록 프리필 시간이 줄어듦).
+"""
+import math
+from dataclasses import dataclass, field
+from typing import Dict, List, Sequence
+import numpy as np
+from config import get_settings
+
+
+def estimate_tokens(text: str, chars_per_token: float) -> int:
+    """글자 수 기반 토큰 수 추정 (Gemma 토크나이저 없이 예산 계산용)"""
+    return math.ceil(len(text) / chars_per_token) if text else 0
+
+
+@dataclass
+class BuiltContext:
+    """구성된 컨텍스트와 문장 선택 통계"""
+    context: str
+    document_ids: List[str]
+    stats: Dict[str, int] = field(default_factory=dict)
+
+
+class ContextBuilder:
+    """거리 임계값 -> 중복 제거 -> 토큰 예산 순서로 검색 결과를 거르는 컨텍스트 구성기"""
+
+    def __init__(
+        self,
+        max_distance: float = None,
+        duplicate_similarity: float = None,
+        token_budget: int = None,
+        chars_per_token: float = None
+    ):
+        """
+        Args:
+            max_distance: 이보다 코사인 거리가 먼 문장은 제외 (0이면 거르지 않음)
+            duplicate_similarity: 이미 고른 문장과 코사인 유사도가 이 값 이상이면 중복으로 제외 (0이면 거르지 않음)
+            token_budget: 컨텍스트 최대 추정 토큰 수 (0이면 제한 없음)
+            chars_per_token: 토큰 수 추정에 쓰는 토큰당 글자 수
+        """
+        settings = get_settings()
+        self.max_distance = max_distance if max_distance is not None else settings.context_max_distance
+        self.duplicate_similarity = (
+            duplicate_similarity if duplicate_similarity is not None
+            else settings.context_duplicate_similarity
+        )
+        self.token_budget = token_budget if token_budget is not None else settings.context_token_budget
+        self.chars_per_token = chars_per_token or settings.context_chars_per_token
+
+    def build(
+        self,
+        ids: Sequence[str],
+        documents: Sequence[str],
+        distances: Sequence[float],
+        embeddings: Sequence = None
+    ) -> BuiltContext:
+        """
+        가까운 순서로 정렬된 검색 결과에서 컨텍스트 구성
+
+        가장 가까운 문장 하나는 거리와 예산에 상관없이 항상 포함해서 컨텍스트가 비지 않게 합니다.
+
+        Args:
+            ids: 문서 ID
+            documents: 문장
+            distances: 질문과의 코사인 거리
+            embeddings: 문장 임베딩 (없으면 중복 제거 생략)
+
+        Returns:
+            BuiltContext (stats: retrieved, kept, dropped_distance, dropped_duplicate, dropped_budget, context_tokens)
+        """
+        stats = {
+            "retrieved": len(ids),
+            "kept": 0,
+            "dropped_distance": 0,
+            "dropped_duplicate": 0,
+            "dropped_budget": 0,
+            "context_tokens": 0
+        }
+
+        vectors = None
+        if embeddings is not None and self.duplicate_similarity and len(ids) > 1:
+            vectors = np.asarray(embeddings, dtype=np.float32)
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            vectors = vectors / np.maximum(norms, 1e-12)
+
+        kept: List[int] = []
+        tokens = 0
+        for index, (document, distance) in enumerate(zip(documents, distances)):
+            if kept and self.max_distance and distance > self.max_distance:
+                # 거리순 정렬이므로 뒤의 문장도 모두 임계값 밖
+                stats["dropped_distance"] = len(ids) - index
+                break
+            if kept and vectors is not None:
+                if float(np.max(vectors[kept] @ vectors[index])) >= self.duplicate_similarity:
+                    stats["dropped_duplicate"] += 1
+                    continue
+            document_tokens = estimate_tokens(document, self.chars_per_token)
+            if kept and self.token_budget and tokens + document_tokens > self.token_budget:
+                stats["dropped_budget"] += 1
+                continue
+            kept.append(index)
+            tokens += document_tokens
+
+        stats["kept"] = len(kept)
+        stats["context_tokens"] = tokens
+        return BuiltContext(
+            context="\n".join(documents[i] for i in kept),
+            document_ids=[ids[i] for i in kept],
+            stats=stats
+        )
@@ -0,0 +1,194 @@
+"""
+임베딩 마이크로 배칭 스케줄러
+동시에 들어온 임베딩 요청을 짧은 시간 동안 모아 한 번의 배치 encode로 처리합니다.
+"""
+import asyncio
+import logging
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+import numpy as np
+from config import get_settings
+from .metrics import EMBEDDING_BATCH_SIZE, STAGE_LATENCY
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingBatcher:
+    """EmbeddingService 앞단의 동적 마이크로 배칭 큐"""
+
+    def __init__(self, embedding_service, max_batch_size: int = None, max_wait_ms: float = None):
+        """
+        Args:
+            embedding_service: 실제 encode를 수행할 EmbeddingService
+            max_batch_size: 한 번에 encode할 최대 문장 수
+            max_wait_ms: 첫 요청 이후 배치를 모으는 최대 대기 시간 (밀리초)
+        """
+        settings = get_settings()
+        self.embedding_service = embedding_service
+        self.max_batch_size = max_batch_size or settings.embedding_batch_max_size
+        self.max_wait = (max_wait_ms if max_wait_ms is not None else settings.embedding_batch_max_wait_ms) / 1000
+
+        # encode는 이벤트 루프 밖의 전용 스레드에서 순차 실행
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embedding")
+        self._queue: asyncio.Queue = None
+        self._worker: asyncio.Task = None
+        self._loop: asyncio.AbstractEventLoop = None
+
+        # 배치 크기 통계
+        self.batch_count = 0
+        self.item_count = 0
+        self.max_observed_batch = 0
+        self.batch_size_histogram: Counter = Counter()
+
+    def _ensure_worker(self) -> None:
+        """현재 이벤트 루프에서 배치 워커를 시작 (멈춘 워커는 같은 큐로 다시 시작)"""
+        if self._worker is not None and not self._worker.done():
+            return
+        loop = asyncio.get_running_loop()
+        if self._worker is not None and not self._worker.cancelled() and self._worker.exception() is not None:
+            logger.error(f"배치 워커가 중단되어 다시 시작합니다: {str(self._worker.exception())}")
+        # 큐는 처음 시작하거나 이벤트 루프가 바뀐 경우에만 새로 만듦 (기다리는 요청을 버리지 않도록)
+        if self._queue is None or self._loop is not loop:
+            self._queue = asyncio.Queue()
+            self._loop = loop
+        self._worker = loop.create_task(self._run())
+
+    async def encode(self, texts: List[str]) -> np.ndarray:
+        """
+        텍스트 리스트를 임베딩 (다른 요청과 함께 배치 처리)
+
+        Args:
+            texts: 임베딩할 텍스트 리스트
+
+        Returns:
+            임베딩 벡터 배열 (len(texts), dim)
+        """
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((list(texts), future, time.perf_counter()))
+        return await future
+
+    async def encode_single(self, text: str) -> np.ndarray:
+        """
+        단일 텍스트(질문)를 임베딩 (질문 임베딩 캐시 우선 조회)
+
+        Args:
+            text: 임베딩할 텍스트
+
+        Returns:
+            임베딩 벡터 (dim,)
+        """
+        cached = self.embedding_service.get_cached_query(text)
+        if cached is not None:
+            return cached
+
+        embeddings = await self.encode([text])
+        self.embedding_service.cache_query(text, embeddings[0])
+        return embeddings[0]
+
+    async def _collect(self) -> List[Tuple[List[str], asyncio.Future, float]]:
+        """최대 배치 크기 또는 최대 대기 시간까지 요청을 모음"""
+        first = await self._queue.get()
+        pending = [first]
+        size = len(first[0])
+        deadline = time.monotonic() + self.max_wait
+
+        try:
+            while size < self.max_batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                pending.append(item)
+                size += len(item[0])
+        except asyncio.CancelledError:
+            self._fail(pending, None)
+            raise
+
+        return pending
+
+    @staticmethod
+    def _fail(pending: List[Tuple[List[str], asyncio.Future, float]], error: Exception = None) -> None:
+        """아직 결과를 받지 못한 요청에 예외 전달 (error가 None이면 취소)"""
+        for _, future, _ in pending:
+            if future.done():
+                continue
+            if error is None:
+                future.cancel()
+            else:
+                future.set_exception(error)
+
+    async def _run(self) -> None:
+        """배치 워커 루프 (배치 하나가 실패해도 워커는 계속 실행)"""
+        while True:
+            pending = await self._collect()
+            try:
+                await self._process(pending)
+            except asyncio.CancelledError:
+                self._fail(pending, None)
+                raise
+            except Exception as e:
+                logger.error(f"배치 임베딩 중 에러: {str(e)}")
+                self._fail(pending, e)
+
+    async def _process(self, pending: List[Tuple[List[str], asyncio.Future, float]]) -> None:
+        """모은 요청을 한 번에 encode하고 요청별로 결과 전달"""
+        texts = [text for item_texts, _, _ in pending for text in item_texts]
+
+        # 요청이 큐에 들어온 뒤 배치가 시작될 때까지의 대기 시간
+        batch_started = time.perf_counter()
+        queue_wait = STAGE_LATENCY.labels("embedding_batcher", "queue_wait")
+        for _, _, enqueued_at in pending:
+            queue_wait.observe(batch_started - enqueued_at)
+
+        embeddings = await asyncio.get_running_loop().run_in_executor(
+            self._executor, self.embedding_service.encode, texts
+        )
+        self._record(len(texts))
+
+        # 요청별로 결과 행을 나눠서 전달
+        offset = 0
+        for item_texts, future, _ in pending:
+            rows = embeddings[offset:offset + len(item_texts)]
+            offset += len(item_texts)
+            if not future.done():
+                future.set_result(rows)
+
+    def _record(self, batch_size: int) -> None:
+        """배치 크기 통계 기록"""
+        self.batch_count += 1
+        self.item_count += batch_size
+        self.max_observed_batch = max(self.max_observed_batch, batch_size)
+        self.batch_size_histogram[batch_size] += 1
+        EMBEDDING_BATCH_SIZE.observe(batch_size)
+
+    def stats(self) -> Dict:
+        """배치 통계 반환"""
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "batches": self.batch_count,
+            "items": self.item_count,
+            "avg_batch_size": self.item_count / self.batch_count if self.batch_count else 0.0,
+            "max_observed_batch_size": self.max_observed_batch,
+            "batch_size_histogram": dict(sorted(self.batch_size_histogram.items()))
+        }
+
+    async def aclose(self) -> None:
+        """배치 워커와 스레드 종료 (대기 중인 요청은 취소)"""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        if self._queue is not None:
+            while not self._queue.empty():
+                self._fail([self._queue.get_nowait()], None)
+        self._executor.shutdown(wait=False)
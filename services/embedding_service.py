@@ -1,39 +1,192 @@
 """
 임베딩 서비스
 """
-from sentence_transformers import SentenceTransformer
-from typing import List
+from typing import Dict, List, Optional
 import numpy as np
 from config import get_settings
+from .cache import LRUCache
+from .metrics import observe_stage
+from .text_utils import normalize_text
 
 
-class EmbeddingService:
-    """임베딩 생성 서비스"""
-    
-    def __init__(self):
+# 지원하는 임베딩 백엔드
+EMBEDDING_BACKENDS = ("torch", "onnx", "onnx-int8")
+
+
+def load_sentence_transformer(
+    model_name: str,
+    backend: str = "torch",
+    onnx_model_path: str = None,
+    quantization_config: str = "avx2"
+):
+    """
+    선택한 백엔드로 SentenceTransformer 모델 로드
+
+    Args:
+        model_name: 임베딩 모델 이름 (torch 백엔드, 또는 onnx 백엔드에서 ONNX 경로 미지정 시 사용)
+        backend: torch | onnx | onnx-int8
+        onnx_model_path: export_onnx_embedding.py로 내보낸 ONNX 모델 디렉토리 (onnx-int8은 필수)
+        quantization_config: onnx-int8에서 사용할 양자화 설정 (avx512_vnni, avx2, arm64 등)
+
+    Returns:
+        SentenceTransformer 인스턴스
+    """
+    # 무거운 모듈은 실제로 모델을 만들 때만 import
+    from sentence_transformers import SentenceTransformer
+
+    if backend not in EMBEDDING_BACKENDS:
+        raise ValueError(f"지원하지 않는 임베딩 백엔드입니다: {backend}")
+
+    if backend == "torch":
+        return SentenceTransformer(model_name)
+
+    # 양자화 모델 파일은 허브 모델에 없으므로 미리 내보낸 디렉토리가 필요
+    if backend == "onnx-int8" and not onnx_model_path:
+        raise ValueError(
+            "onnx-int8 백엔드는 EMBEDDING_ONNX_MODEL_PATH 설정이 필요합니다. "
+            "scripts/export_onnx_embedding.py --quantize로 내보낸 디렉토리를 지정하세요."
+        )
+
+    # ONNX 백엔드는 optimum[onnxruntime] 필요 (pip install "sentence-transformers[onnx]")
+    model_kwargs = {"provider": "CPUExecutionProvider"}
+    if backend == "onnx-int8":
+        model_kwargs["file_name"] = f"onnx/model_qint8_{quantization_config}.onnx"
+    return SentenceTransformer(
+        onnx_model_path or model_name,
+        device="cpu",
+        backend="onnx",
+        model_kwargs=model_kwargs
+    )
+
+
+def compare_embeddings(reference: np.ndarray, candidate: np.ndarray) -> Dict[str, float]:
+    """
+    두 백엔드의 임베딩 출력 일치도 (행별 코사인 유사도)
+
+    Args:
+        reference: 기준 임베딩 (예: torch 백엔드)
+        candidate: 비교할 임베딩 (예: onnx 백엔드)
+
+    Returns:
+        {"min_cosine": float, "mean_cosine": float, "max_abs_diff": float}
+    """
+    reference = np.asarray(reference, dtype=np.float32)
+    candidate = np.asarray(candidate, dtype=np.float32)
+    cosine = np.sum(reference * candidate, axis=1) / (
+        np.linalg.norm(reference, axis=1) * np.linalg.norm(candidate, axis=1)
+    )
+    return {
+        "min_cosine": float(cosine.min()),
+        "mean_cosine": float(cosine.mean()),
+        "max_abs_diff": float(np.abs(reference - candidate).max())
+    }
+
+
+class QueryEmbeddingCacheMixin:
+    """
+    질문 임베딩 캐시 (EmbeddingService와 RemoteEmbeddingService가 공유)
+
+    캐시 키는 정규화된 질문 + 모델명 + 백엔드이므로, 모델이나 백엔드를 바꾸면 이전 임베딩을 재사용하지 않습니다.
+    사용하는 클래스는 model_name, backend, encode()를 제공하고 __init__에서 _init_query_cache()를 호출합니다.
+    """
+
+    model_name: str
+    backend: str
+
+    def _init_query_cache(self) -> None:
         settings = get_settings()
-        self.model = SentenceTransformer(settings.embedding_model_name)
-    
-    def encode(self, texts: List[str]) -> np.ndarray:
+        self.query_cache = LRUCache(
+            max_entries=settings.query_embedding_cache_max_entries,
+            max_bytes=settings.query_embedding_cache_max_bytes,
+            ttl_seconds=settings.query_embedding_cache_ttl_seconds
+        )
+
+    def encode(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        raise NotImplementedError
+
+    def encode_single(self, text: str) -> np.ndarray:
         """
-        텍스트 리스트를 임베딩 벡터로 변환
-        
+        단일 텍스트를 임베딩 벡터로 변환 (질문 임베딩 캐시 사용)
+
         Args:
-            texts: 임베딩할 텍스트 리스트
-            
+            text: 임베딩할 텍스트
+
         Returns:
-            임베딩 벡터 배열
+            임베딩 벡터
         """
-        return self.model.encode(texts)
-    
-    def encode_single(self, text: str) -> np.ndarray:
+        cached = self.get_cached_query(text)
+        if cached is not None:
+            return cached.reshape(1, -1)
+
+        embedding = self.encode([text])
+        self.cache_query(text, embedding[0])
+        return embedding
+
+    def _query_cache_key(self, text: str) -> tuple:
+        return (self.model_name, self.backend, normalize_text(text))
+
+    def get_cached_query(self, text: str) -> Optional[np.ndarray]:
         """
-        단일 텍스트를 임베딩 벡터로 변환
-        
+        캐시된 질문 임베딩 조회
+
         Args:
-            text: 임베딩할 텍스트
-            
+            text: 질문 텍스트
+
         Returns:
-            임베딩 벡터
+            임베딩 벡터 (dim,) 또는 None
+        """
+        return self.query_cache.get(self._query_cache_key(text))
+
+    def cache_query(self, text: str, embedding: np.ndarray) -> None:
+        """
+        질문 임베딩을 캐시에 저장
+
+        Args:
+            text: 질문 텍스트
+            embedding: 임베딩 벡터 (dim,)
+        """
+        embedding = np.array(embedding, copy=True)
+        embedding.setflags(write=False)
+        self.query_cache.put(self._query_cache_key(text), embedding)
+
+    def cache_stats(self) -> Dict:
+        """질문 임베딩 캐시 통계"""
+        return self.query_cache.stats()
+
+
+class EmbeddingService(QueryEmbeddingCacheMixin):
+    """임베딩 생성 서비스"""
+
+    def __init__(self, backend: str = None):
+        """
+        Args:
+            backend: torch | onnx | onnx-int8 (기본값: EMBEDDING_BACKEND 설정)
+        """
+        settings = get_settings()
+        self.model_name = settings.embedding_model_name
+        self.backend = backend or settings.embedding_backend
+        self.model = load_sentence_transformer(
+            settings.embedding_model_name,
+            backend=self.backend,
+            onnx_model_path=settings.embedding_onnx_model_path or None,
+            quantization_config=settings.embedding_quantization_config
+        )
+        self._init_query_cache()
+
+    def warmup(self) -> None:
+        """첫 요청 지연을 없애기 위한 워밍업 추론"""
+        self.encode(["워밍업 문장입니다."])
+
+    def encode(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        """
+        텍스트 리스트를 임베딩 벡터로 변환
+
+        Args:
+            texts: 임베딩할 텍스트 리스트
+            batch_size: 모델 forward 한 번에 넣을 문장 수
+
+        Returns:
+            임베딩 벡터 배열
         """
-        return self.model.encode([text])
+        with observe_stage("embedding", "encode"):
+            return self.model.encode(texts, batch_size=batch_size)
@@ -0,0 +1,37 @@
+"""
+가게별 FAQ (자주 묻는 질문)
+FAQ는 가게 문서와 같은 벡터 저장소에 별도 가게 ID("{store_id}#faq")로 저장합니다.
+문서에는 "질문\n답변"을 저장하고 임베딩은 질문만으로 만들어, 손님 질문과 FAQ 질문을 바로 비교합니다.
+"""
+from typing import List, Tuple
+
+FAQ_STORE_SUFFIX = "#faq"
+
+
+def faq_store_id(store_id: str) -> str:
+    """가게의 FAQ를 저장하는 벡터 저장소 가게 ID"""
+    return f"{store_id}{FAQ_STORE_SUFFIX}"
+
+
+def is_faq_store_id(store_id: str) -> bool:
+    return store_id.endswith(FAQ_STORE_SUFFIX)
+
+
+def faq_document(question: str, answer: str) -> str:
+    """FAQ 한 쌍을 저장용 문서로 변환 (질문은 한 줄로 정리)"""
+    return f"{' '.join(question.split())}\n{answer.strip()}"
+
+
+def split_faq_document(document: str) -> Tuple[str, str]:
+    """저장된 FAQ 문서를 (질문, 답변)으로 분리"""
+    question, _, answer = document.partition("\n")
+    return question, answer
+
+
+def faq_documents(entries) -> List[str]:
+    """질문/답변이 모두 있는 FAQ 항목만 저장용 문서로 변환"""
+    return [
+        faq_document(entry.question, entry.answer)
+        for entry in entries
+        if entry.question.strip() and entry.answer.strip()
+    ]
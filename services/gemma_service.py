@@ -1,93 +1,291 @@
 """
 Gemma API 서비스
 """
-import requests
-from typing import List
+import asyncio
+import json
+import logging
+import re
+import time
+from contextlib import asynccontextmanager
+import httpx
+from typing import Any, AsyncIterator, Dict, List
 from config import get_settings
+from .metrics import (
+    GEMMA_ERRORS,
+    GEMMA_PROMPT_CHARS,
+    GEMMA_PROMPT_TOKENS,
+    GEMMA_REQUESTS_IN_FLIGHT,
+    GEMMA_REQUESTS_WAITING,
+    GEMMA_RETRIES,
+    STAGE_LATENCY,
+    observe_stage
+)
+
+logger = logging.getLogger(__name__)
+
+# 재시도 대상 HTTP 상태 코드
+RETRYABLE_STATUS_CODES = {429, 502, 503, 504}
+
+# LLM 출력 줄 앞의 번호/글머리 기호 ("1. ", "- ", "* " 등)
+_LINE_PREFIX_PATTERN = re.compile(r"^\s*(?:\d{1,2}[.)]|[-•·*])\s*")
+
+# 프롬프트 템플릿 (들여쓰기/중복 지시 없이 짧게 유지해서 프리필 시간 절약)
+_PARSE_PROMPT = """다음 가게 소개글을 한 줄에 하나의 의미 단위 문장으로 나누세요. 번호나 기호 없이 문장만 출력하세요.
+
+가게 소개:
+{description}
+
+출력 형식 예시:
+이 가게는 한식 전문점입니다
+30년 전통의 비법 소스를 사용합니다"""
+
+_ANSWER_PROMPT = """가게 정보:
+{context}
+
+질문: {question}
+가게 정보에 있는 내용만으로 친절한 한국어 문장으로 답하세요. 정보에 없으면 모른다고 하고, 마크다운은 쓰지 마세요."""
+
+
+def _prompt_stats(kind: str, prompt: str, result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    프롬프트 길이와 프리필(프롬프트 평가) 시간을 메트릭에 기록
+
+    Ollama가 KV 캐시를 재사용하면 prompt_eval_* 필드가 없을 수 있습니다.
+
+    Returns:
+        {"prompt_chars", "prompt_tokens", "prefill_ms"} (없는 값은 None)
+    """
+    GEMMA_PROMPT_CHARS.labels(kind).observe(len(prompt))
+    prompt_tokens = result.get("prompt_eval_count")
+    prefill_ns = result.get("prompt_eval_duration")
+    if prompt_tokens:
+        GEMMA_PROMPT_TOKENS.labels(kind).observe(prompt_tokens)
+    if prefill_ns:
+        STAGE_LATENCY.labels("gemma", "prefill").observe(prefill_ns / 1e9)
+    return {
+        "prompt_chars": len(prompt),
+        "prompt_tokens": prompt_tokens,
+        "prefill_ms": round(prefill_ns / 1e6, 1) if prefill_ns else None
+    }
+
+
+def _error_reason(error: Exception) -> str:
+    """에러 메트릭 라벨 (http_<상태 코드> | transport | 예외 이름)"""
+    if isinstance(error, httpx.HTTPStatusError):
+        return f"http_{error.response.status_code}"
+    if isinstance(error, httpx.TransportError):
+        return "transport"
+    return type(error).__name__
 
 
 class GemmaService:
-    """Gemma API 호출 서비스"""
-    
+    """Gemma API 호출 서비스 (비동기, 커넥션 풀 공유)"""
+
     def __init__(self):
         settings = get_settings()
         self.api_url = f"{settings.gemma_api}/api/generate"
         self.model = settings.gemma_model
-    
-    def parse_text_to_sentences(self, description: str) -> List[str]:
+        self.max_retries = settings.gemma_max_retries
+        self.retry_backoff = settings.gemma_retry_backoff
+
+        # keep-alive 커넥션 풀을 공유하는 비동기 클라이언트
+        self.client = httpx.AsyncClient(
+            timeout=httpx.Timeout(
+                settings.gemma_read_timeout,
+                connect=settings.gemma_connect_timeout
+            ),
+            limits=httpx.Limits(
+                max_connections=settings.gemma_max_connections,
+                max_keepalive_connections=settings.gemma_max_keepalive_connections
+            )
+        )
+
+        # 동시에 진행되는 생성 요청 수 제한
+        self._semaphore = asyncio.Semaphore(settings.gemma_max_concurrency)
+
+    async def warmup(self) -> None:
         """
-        텍스트를 의미 단위로 파싱
-        
+        모델을 Gemma 서버 메모리에 미리 로드
+
+        Ollama는 프롬프트 없이 /api/generate를 호출하면 모델만 로드하고 바로 응답합니다.
+        """
+        response = await self.client.post(self.api_url, json={"model": self.model})
+        response.raise_for_status()
+
+    async def aclose(self) -> None:
+        """커넥션 풀 종료"""
+        await self.client.aclose()
+
+    @asynccontextmanager
+    async def _slot(self):
+        """동시 실행 제한 슬롯 (대기 중/진행 중 요청 수를 게이지에 기록)"""
+        with GEMMA_REQUESTS_WAITING.track_inprogress(), observe_stage("gemma", "queue_wait"):
+            await self._semaphore.acquire()
+        try:
+            with GEMMA_REQUESTS_IN_FLIGHT.track_inprogress():
+                yield
+        finally:
+            self._semaphore.release()
+
+    async def _generate(self, prompt: str) -> Dict[str, Any]:
+        """
+        /api/generate 호출 (재시도 포함)
+
         Args:
-            description: 가게 소개 텍스트
-            
+            prompt: 프롬프트
+
         Returns:
-            파싱된 문장 리스트
-        """
-        
-        prompt = f"""다음 가게 소개글을 의미 단위별로 분리해서 문장으로 나눠주세요. 
-          각 문장은 하나의 완전한 의미를 담고 있어야 합니다.
-          각 문장은 새로운 줄로 구분하고, 번호나 기호 없이 문장만 출력해주세요.
-
-          가게 소개:
-          {description}
-
-          출력 형식 예시:
-          이 가게는 한식 전문점입니다
-          30년 전통의 비법 소스를 사용합니다
-          매일 아침 신선한 재료를 직접 준비합니다
+            Gemma API 응답 JSON
         """
-        
         payload = {
             "model": self.model,
             "prompt": prompt,
             "stream": False
         }
-        
-        response = requests.post(self.api_url, json=payload)
-        response.raise_for_status()
-        
+
+        async with self._slot():
+            try:
+                for attempt in range(self.max_retries + 1):
+                    try:
+                        with observe_stage("gemma", "request"):
+                            response = await self.client.post(self.api_url, json=payload)
+                        if response.status_code in RETRYABLE_STATUS_CODES and attempt < self.max_retries:
+                            GEMMA_RETRIES.labels(f"http_{response.status_code}").inc()
+                            logger.warning(f"Gemma API 응답 {response.status_code}, 재시도 {attempt + 1}/{self.max_retries}")
+                        else:
+                            response.raise_for_status()
+                            return response.json()
+                    except httpx.TransportError as e:
+                        if attempt >= self.max_retries:
+                            raise
+                        GEMMA_RETRIES.labels("transport").inc()
+                        logger.warning(f"Gemma API 연결 오류: {str(e)}, 재시도 {attempt + 1}/{self.max_retries}")
+
+                    await asyncio.sleep(self.retry_backoff * (2 ** attempt))
+
+                raise RuntimeError("Gemma API 재시도 횟수를 초과했습니다.")
+            except Exception as e:
+                GEMMA_ERRORS.labels(_error_reason(e)).inc()
+                raise
+
+    async def parse_text_to_sentences(self, description: str) -> List[str]:
+        """
+        텍스트를 의미 단위로 파싱
+
+        Args:
+            description: 가게 소개 텍스트
+
+        Returns:
+            파싱된 문장 리스트
+        """
+
+        prompt = _PARSE_PROMPT.format(description=description)
+
         # 응답에서 텍스트 추출
-        result = response.json()
+        result = await self._generate(prompt)
+        _prompt_stats("parse", prompt, result)
         parsed_text = result.get('response', '')
-        
-        # 문장들을 분리
-        sentences = [s.strip() for s in parsed_text.strip().split('\n') if s.strip()]
-        
+
+        # 문장들을 분리 (번호/기호는 제거하고, "다음은 ...:" 같은 설명 줄은 제외)
+        sentences = [_LINE_PREFIX_PATTERN.sub('', s).strip() for s in parsed_text.strip().split('\n')]
+        sentences = [s for s in sentences if s and not s.endswith(':')]
+
         return sentences
-    
-    def generate_answer(self, context: str, question: str) -> str:
+
+    def _build_answer_prompt(self, context: str, question: str) -> str:
+        """답변 생성 프롬프트 구성"""
+        return _ANSWER_PROMPT.format(context=context, question=question)
+
+    async def generate_answer(self, context: str, question: str, stats: Dict[str, Any] = None) -> str:
         """
         컨텍스트를 기반으로 질문에 답변 생성
-        
+
         Args:
             context: 가게 정보 컨텍스트
             question: 사용자 질문
-            
+            stats: 주어지면 프롬프트 길이/토큰 수/프리필 시간을 기록
+
         Returns:
             생성된 답변
         """
+        prompt = self._build_answer_prompt(context, question)
 
-        prompt = f"""
-        다음은 가게에 대한 정보입니다: {context}
+        result = await self._generate(prompt)
+        prompt_stats = _prompt_stats("answer", prompt, result)
+        if stats is not None:
+            stats.update(prompt_stats)
+        answer = result.get('response', '')
 
-        위 정보를 바탕으로 다음 질문에 자연스럽고 친절하게 답변해주세요:
-        질문: {question}
+        return answer.strip()
 
-        답변은 한국어로, 자연스러운 문장으로 작성해주세요. 절대 거짓말을 하지 마시고, 가게에 대한 정보를 기반으로만 답해주세요.
-        꼭 마크다운 형식으로 답하지 말아주세요.
+    async def stream_answer(
+        self,
+        context: str,
+        question: str,
+        stats: Dict[str, Any] = None
+    ) -> AsyncIterator[str]:
         """
+        컨텍스트를 기반으로 답변을 토큰 단위로 스트리밍
 
+        첫 토큰을 받기 전까지의 연결 오류만 재시도합니다.
+
+        Args:
+            context: 가게 정보 컨텍스트
+            question: 사용자 질문
+            stats: 주어지면 스트림이 끝날 때 프롬프트 길이/토큰 수/프리필 시간을 기록
+
+        Yields:
+            생성된 답변 조각
+        """
         payload = {
             "model": self.model,
-            "prompt": prompt,
-            "stream": False
+            "prompt": self._build_answer_prompt(context, question),
+            "stream": True
         }
-        
-        response = requests.post(self.api_url, json=payload)
-        response.raise_for_status()
-        
-        result = response.json()
-        answer = result.get('response', '')
-        
-        return answer.strip()
+
+        async with self._slot():
+            requested_at = time.perf_counter()
+            try:
+                for attempt in range(self.max_retries + 1):
+                    started = False
+                    try:
+                        async with self.client.stream("POST", self.api_url, json=payload) as response:
+                            if response.status_code in RETRYABLE_STATUS_CODES and attempt < self.max_retries:
+                                GEMMA_RETRIES.labels(f"http_{response.status_code}").inc()
+                                logger.warning(f"Gemma API 응답 {response.status_code}, 재시도 {attempt + 1}/{self.max_retries}")
+                            else:
+                                response.raise_for_status()
+                                # Ollama 스트림은 줄 단위 JSON (NDJSON)
+                                async for line in response.aiter_lines():
+                                    if not line.strip():
+                                        continue
+                                    chunk = json.loads(line)
+                                    token = chunk.get('response', '')
+                                    if token:
+                                        if not started:
+                                            # 첫 토큰까지의 시간 (재시도 대기 포함)
+                                            STAGE_LATENCY.labels("gemma", "first_token").observe(
+                                                time.perf_counter() - requested_at
+                                            )
+                                        started = True
+                                        yield token
+                                    if chunk.get('done'):
+                                        # 마지막 청크에 프롬프트 평가 통계가 들어 있음
+                                        prompt_stats = _prompt_stats("answer", payload["prompt"], chunk)
+                                        if stats is not None:
+                                            stats.update(prompt_stats)
+                                        break
+                                STAGE_LATENCY.labels("gemma", "stream").observe(time.perf_counter() - requested_at)
+                                return
+                    except httpx.TransportError as e:
+                        if started or attempt >= self.max_retries:
+                            raise
+                        GEMMA_RETRIES.labels("transport").inc()
+                        logger.warning(f"Gemma API 연결 오류: {str(e)}, 재시도 {attempt + 1}/{self.max_retries}")
+
+                    await asyncio.sleep(self.retry_backoff * (2 ** attempt))
+
+                raise RuntimeError("Gemma API 재시도 횟수를 초과했습니다.")
+            except Exception as e:
+                GEMMA_ERRORS.labels(_error_reason(e)).inc()
+                raise
@@ -0,0 +1,318 @@
+"""
+공유 추론 서버 클라이언트
+API 워커에서 EmbeddingService / OCRWorkerPool 대신 사용하며, 같은 메서드로 추론 서버에 요청합니다.
+추론 서버에 연결할 수 없으면(INFERENCE_SERVER_FALLBACK=true) 워커 프로세스에서 직접 추론합니다.
+로컬 모델은 처음 필요할 때 한 번만 로드하고, 서버가 다시 뜨면 다음 요청부터 서버를 사용합니다.
+"""
+import asyncio
+import logging
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from config import get_settings
+from .embedding_service import EmbeddingService, QueryEmbeddingCacheMixin
+from .inference_protocol import (
+    ERROR_NOT_READY,
+    ERROR_QUEUE_FULL,
+    ERROR_TIMEOUT,
+    encode_frame,
+    pack_blobs,
+    read_frame,
+    unpack_array
+)
+from .metrics import INFERENCE_FALLBACKS, observe_stage
+from .ocr_pool import OCRQueueFullError, OCRTimeoutError
+from .service_registry import ServiceNotReadyError
+
+logger = logging.getLogger(__name__)
+
+
+class InferenceServerUnavailable(Exception):
+    """추론 서버에 연결할 수 없거나 연결이 끊어진 경우 (로컬 추론으로 대체 가능)"""
+
+
+class InferenceServerError(Exception):
+    """추론 서버가 요청 처리에 실패한 경우"""
+
+
+class InferenceClient:
+    """연결을 재사용하는 블로킹 추론 서버 클라이언트 (스레드 안전)"""
+
+    def __init__(self, socket_path: str = None, timeout: float = None, max_connections: int = None):
+        """
+        Args:
+            socket_path: 추론 서버 Unix 소켓 경로
+            timeout: 요청당 최대 대기 시간 (초)
+            max_connections: 동시에 사용할 최대 연결 수
+        """
+        settings = get_settings()
+        self.socket_path = socket_path or settings.inference_server_socket
+        self.timeout = timeout or settings.inference_client_timeout_seconds
+        self.max_connections = max_connections or settings.inference_client_max_connections
+        self._idle: List[socket.socket] = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.max_connections)
+
+    def _connect(self) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError as e:
+            sock.close()
+            raise InferenceServerUnavailable(f"추론 서버에 연결할 수 없습니다: {self.socket_path} ({str(e)})")
+        return sock
+
+    def _exchange(self, sock: socket.socket, frame: bytes) -> Tuple[Dict, bytes]:
+        try:
+            sock.sendall(frame)
+            return read_frame(sock)
+        except socket.timeout:
+            sock.close()
+            raise InferenceServerError(f"추론 서버 응답 시간이 초과되었습니다. ({self.timeout}초)")
+        except OSError as e:
+            sock.close()
+            raise InferenceServerUnavailable(f"추론 서버 연결이 끊어졌습니다: {str(e)}")
+
+    def call(self, op: str, header: Dict = None, payload: bytes = b"") -> Tuple[Dict, bytes]:
+        """
+        요청 하나를 보내고 응답을 기다림
+
+        Args:
+            op: 요청 종류 (embed, ocr_business_info, ...)
+            header: 요청 헤더 필드
+            payload: 요청 본문
+
+        Returns:
+            (응답 헤더, 응답 본문)
+
+        Raises:
+            InferenceServerUnavailable: 연결 실패
+            OCRQueueFullError, OCRTimeoutError, ServiceNotReadyError: 서버 측 에러
+            InferenceServerError: 그 밖의 서버 측 에러
+        """
+        frame = encode_frame({**(header or {}), "op": op}, payload)
+        with self._slots, observe_stage("inference_client", op):
+            with self._lock:
+                sock = self._idle.pop() if self._idle else None
+            if sock is not None:
+                try:
+                    response, body = self._exchange(sock, frame)
+                except InferenceServerUnavailable:
+                    # 서버가 재시작되어 끊긴 유휴 연결이면 새 연결로 한 번 더 시도
+                    sock = None
+            if sock is None:
+                sock = self._connect()
+                response, body = self._exchange(sock, frame)
+            with self._lock:
+                self._idle.append(sock)
+
+        if response.get("ok"):
+            return response, body
+        error = response.get("error")
+        if error == ERROR_QUEUE_FULL:
+            raise OCRQueueFullError(response["retry_after"])
+        if error == ERROR_TIMEOUT:
+            raise OCRTimeoutError(response["message"])
+        if error == ERROR_NOT_READY:
+            raise ServiceNotReadyError(response["component"], response["status"])
+        raise InferenceServerError(response.get("message", "추론 서버 에러"))
+
+    def wait_until_ready(self, component: str, timeout: float) -> bool:
+        """
+        추론 서버의 구성 요소가 준비될 때까지 대기
+
+        Returns:
+            준비되면 True, 시간 안에 연결/준비되지 않으면 False
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                response, _ = self.call("ping")
+                if response["components"].get(component, {}).get("status") == "ready":
+                    return True
+            except InferenceServerUnavailable:
+                pass
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.5)
+
+    def close(self) -> None:
+        """유휴 연결 종료"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for sock in idle:
+            sock.close()
+
+
+class RemoteEmbeddingService(QueryEmbeddingCacheMixin):
+    """추론 서버에 임베딩을 요청하는 EmbeddingService 대체 구현"""
+
+    def __init__(self, client: InferenceClient, fallback: bool = None):
+        """
+        Args:
+            client: 추론 서버 클라이언트
+            fallback: 서버에 연결할 수 없을 때 로컬 EmbeddingService 사용 여부
+                      (기본값: INFERENCE_SERVER_FALLBACK 설정)
+        """
+        settings = get_settings()
+        self.client = client
+        self.fallback = settings.inference_server_fallback if fallback is None else fallback
+        self.startup_wait = settings.inference_server_startup_wait_seconds
+        # 추론 서버와 로컬 대체 모델은 같은 설정으로 로드됨 (질문 임베딩 캐시 키에 사용)
+        self.model_name = settings.embedding_model_name
+        self.backend = settings.embedding_backend
+        self._local = None
+        self._local_lock = threading.Lock()
+
+        # 질문 임베딩 캐시는 워커 프로세스별로 유지 (서버 왕복 없이 재사용)
+        self._init_query_cache()
+
+    def _local_service(self):
+        with self._local_lock:
+            if self._local is None:
+                logger.warning("추론 서버에 연결할 수 없어 워커 프로세스에 임베딩 모델을 로드합니다.")
+                self._local = EmbeddingService()
+            return self._local
+
+    def warmup(self) -> None:
+        """추론 서버 준비를 기다린 뒤 워밍업 (준비되지 않으면 로컬 모델로 워밍업)"""
+        if not self.client.wait_until_ready("embedding", self.startup_wait) and not self.fallback:
+            raise InferenceServerUnavailable("추론 서버의 임베딩 모델이 준비되지 않았습니다.")
+        self.encode(["워밍업 문장입니다."])
+
+    def encode(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        """
+        텍스트 리스트를 임베딩 벡터로 변환
+
+        Args:
+            texts: 임베딩할 텍스트 리스트
+            batch_size: 로컬 추론 시 모델 forward 한 번에 넣을 문장 수
+
+        Returns:
+            임베딩 벡터 배열
+        """
+        try:
+            response, body = self.client.call("embed", {"texts": list(texts), "batch_size": batch_size})
+        except InferenceServerUnavailable:
+            if not self.fallback:
+                raise
+            INFERENCE_FALLBACKS.labels("embedding").inc()
+            return self._local_service().encode(texts, batch_size)
+        return unpack_array(response, body)
+
+
+class RemoteOCRPool:
+    """추론 서버에 OCR을 요청하는 OCRWorkerPool 대체 구현"""
+
+    def __init__(self, client: InferenceClient, fallback: bool = None):
+        """
+        Args:
+            client: 추론 서버 클라이언트
+            fallback: 서버에 연결할 수 없을 때 로컬 OCRWorkerPool 사용 여부
+                      (기본값: INFERENCE_SERVER_FALLBACK 설정)
+        """
+        settings = get_settings()
+        self.client = client
+        self.fallback = settings.inference_server_fallback if fallback is None else fallback
+        self.startup_wait = settings.inference_server_startup_wait_seconds
+        self._local = None
+        self._local_lock = threading.Lock()
+        self._pending = 0
+        self._capacity = 0
+
+        # 블로킹 소켓 요청은 연결 수만큼의 전용 스레드에서 실행
+        self._executor = ThreadPoolExecutor(
+            max_workers=client.max_connections, thread_name_prefix="inference-ocr"
+        )
+
+    def _local_pool(self):
+        with self._local_lock:
+            if self._local is None:
+                from services.ocr_pool import OCRWorkerPool
+                logger.warning("추론 서버에 연결할 수 없어 워커 프로세스에서 OCR 워커 풀을 시작합니다.")
+                self._local = OCRWorkerPool()
+            return self._local
+
+    @property
+    def capacity(self) -> int:
+        """추론 서버 OCR 풀의 최대 작업 수 (로컬 대체 중이면 로컬 풀 기준)"""
+        return self._local.capacity if self._local is not None else self._capacity
+
+    @property
+    def pending(self) -> int:
+        """이 워커가 보낸 실행 중인 OCR 요청 수"""
+        return self._pending
+
+    async def _call(self, op: str, header: Dict = None, payload: bytes = b"") -> Optional[Dict]:
+        """서버에 요청 (연결할 수 없고 대체가 허용되면 None)"""
+        self._pending += 1
+        try:
+            response, _ = await asyncio.get_running_loop().run_in_executor(
+                self._executor, self.client.call, op, header, payload
+            )
+        except InferenceServerUnavailable:
+            if not self.fallback:
+                raise
+            INFERENCE_FALLBACKS.labels("ocr").inc()
+            return None
+        finally:
+            self._pending -= 1
+        return response
+
+    async def extract_business_info(self, image_bytes: bytes) -> Dict:
+        """OCRWorkerPool.extract_business_info와 동일"""
+        response = await self._call("ocr_business_info", payload=image_bytes)
+        if response is None:
+            return await self._local_pool().extract_business_info(image_bytes)
+        return response["info"]
+
+    async def extract_business_info_batch(self, images: List[bytes]) -> List[Dict]:
+        """OCRWorkerPool.extract_business_info_batch와 동일"""
+        header, payload = pack_blobs(images)
+        response = await self._call("ocr_business_info_batch", header, payload)
+        if response is None:
+            return await self._local_pool().extract_business_info_batch(images)
+        return response["entries"]
+
+    async def extract_page_text(self, image, wait_for_slot: bool = False) -> Dict:
+        """OCRWorkerPool.extract_page_text와 동일 (PIL 이미지는 원본 픽셀 바이트로 전송)"""
+        header = {"mode": image.mode, "size": list(image.size), "wait_for_slot": wait_for_slot}
+        response = await self._call("ocr_page_text", header, image.tobytes())
+        if response is None:
+            return await self._local_pool().extract_page_text(image, wait_for_slot=wait_for_slot)
+        return response["result"]
+
+    async def warmup(self) -> None:
+        """추론 서버 준비를 기다림 (준비되지 않으면 로컬 워커 풀 워밍업)"""
+        loop = asyncio.get_running_loop()
+        ready = await loop.run_in_executor(
+            self._executor, self.client.wait_until_ready, "ocr", self.startup_wait
+        )
+        if ready:
+            response = await self._call("ping")
+            if response is not None:
+                self._capacity = response["ocr_capacity"]
+                return
+        if not self.fallback:
+            raise InferenceServerUnavailable("추론 서버의 OCR이 준비되지 않았습니다.")
+        INFERENCE_FALLBACKS.labels("ocr").inc()
+        await self._local_pool().warmup()
+
+    def stats(self) -> Dict:
+        """클라이언트 상태 반환"""
+        return {
+            "mode": "local_fallback" if self._local is not None else "remote",
+            "socket": self.client.socket_path,
+            "pending": self._pending,
+            "capacity": self.capacity
+        }
+
+    def shutdown(self) -> None:
+        """스레드와 (로컬 대체 중이면) 워커 프로세스 종료"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        if self._local is not None:
+            self._local.shutdown()
@@ -0,0 +1,99 @@
+"""
+추론 서버 통신 프로토콜
+메시지 하나는 [헤더 길이(4바이트) | 본문 길이(4바이트) | JSON 헤더 | 본문 바이트]로 구성됩니다.
+임베딩 행렬과 이미지처럼 큰 데이터는 JSON에 넣지 않고 본문에 원본 바이트로 실어 보냅니다.
+"""
+import json
+import socket
+import struct
+from typing import Dict, List, Tuple
+import numpy as np
+
+_PREFIX = struct.Struct(">II")
+
+# 헤더 크기 상한 (본문은 이미지 업로드 크기 제한을 따르므로 따로 제한하지 않음)
+MAX_HEADER_BYTES = 16 * 1024 * 1024
+
+# 응답 헤더의 error 값
+ERROR_QUEUE_FULL = "queue_full"
+ERROR_TIMEOUT = "timeout"
+ERROR_NOT_READY = "not_ready"
+ERROR_INTERNAL = "internal"
+
+
+def _json_default(value):
+    # OCR 결과에 섞인 numpy 스칼라 변환
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"JSON으로 변환할 수 없는 값입니다: {type(value).__name__}")
+
+
+def encode_frame(header: Dict, payload: bytes = b"") -> bytes:
+    """헤더와 본문을 메시지 하나로 직렬화"""
+    header_bytes = json.dumps(header, ensure_ascii=False, default=_json_default).encode("utf-8")
+    return _PREFIX.pack(len(header_bytes), len(payload)) + header_bytes + payload
+
+
+def _decode_header(header_bytes: bytes) -> Dict:
+    return json.loads(header_bytes.decode("utf-8"))
+
+
+def _check_header_size(header_size: int) -> None:
+    if header_size > MAX_HEADER_BYTES:
+        raise ValueError(f"메시지 헤더가 너무 큽니다: {header_size}바이트")
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        count = sock.recv_into(view[received:])
+        if count == 0:
+            raise ConnectionError("추론 서버 연결이 끊어졌습니다.")
+        received += count
+    return bytes(buffer)
+
+
+def read_frame(sock: socket.socket) -> Tuple[Dict, bytes]:
+    """블로킹 소켓에서 메시지 하나 읽기"""
+    header_size, payload_size = _PREFIX.unpack(_recv_exact(sock, _PREFIX.size))
+    _check_header_size(header_size)
+    header = _decode_header(_recv_exact(sock, header_size))
+    return header, _recv_exact(sock, payload_size) if payload_size else b""
+
+
+async def read_frame_async(reader) -> Tuple[Dict, bytes]:
+    """asyncio StreamReader에서 메시지 하나 읽기 (연결이 끊기면 IncompleteReadError)"""
+    header_size, payload_size = _PREFIX.unpack(await reader.readexactly(_PREFIX.size))
+    _check_header_size(header_size)
+    header = _decode_header(await reader.readexactly(header_size))
+    return header, await reader.readexactly(payload_size) if payload_size else b""
+
+
+def pack_array(array: np.ndarray) -> Tuple[Dict, bytes]:
+    """float32 행렬을 (헤더 필드, 본문)으로 변환"""
+    array = np.ascontiguousarray(array, dtype=np.float32)
+    return {"shape": list(array.shape)}, array.tobytes()
+
+
+def unpack_array(header: Dict, payload: bytes) -> np.ndarray:
+    """pack_array로 만든 본문을 float32 행렬로 복원"""
+    return np.frombuffer(payload, dtype=np.float32).reshape(header["shape"])
+
+
+def pack_blobs(blobs: List[bytes]) -> Tuple[Dict, bytes]:
+    """여러 바이트 덩어리(이미지 파일)를 본문 하나로 이어 붙임"""
+    return {"sizes": [len(blob) for blob in blobs]}, b"".join(blobs)
+
+
+def unpack_blobs(header: Dict, payload: bytes) -> List[bytes]:
+    """pack_blobs로 만든 본문을 다시 나눔"""
+    blobs = []
+    offset = 0
+    for size in header["sizes"]:
+        blobs.append(payload[offset:offset + size])
+        offset += size
+    if offset != len(payload):
+        raise ValueError("본문 크기가 sizes 합계와 다릅니다.")
+    return blobs
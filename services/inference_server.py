@@ -0,0 +1,209 @@
+"""
+공유 추론 서버
+uvicorn 워커가 여러 개일 때 워커마다 임베딩 모델과 EasyOCR을 따로 로드하지 않도록,
+모델을 프로세스 하나에만 로드하고 Unix 소켓으로 임베딩/OCR 요청을 받습니다.
+
+여러 워커에서 동시에 들어온 임베딩 요청은 EmbeddingBatcher가 한 배치로 모으고,
+OCR 요청은 OCRWorkerPool의 입장 제어(대기열이 가득 차면 거절)를 그대로 거칩니다.
+
+실행:
+    python -m services.inference_server
+"""
+import argparse
+import asyncio
+import logging
+import os
+from typing import Dict, Tuple
+from config import get_settings
+from .inference_protocol import (
+    ERROR_INTERNAL,
+    ERROR_NOT_READY,
+    ERROR_QUEUE_FULL,
+    ERROR_TIMEOUT,
+    encode_frame,
+    pack_array,
+    read_frame_async,
+    unpack_blobs
+)
+from .service_registry import ServiceNotReadyError, ServiceRegistry
+
+logger = logging.getLogger(__name__)
+
+
+def _load_embedding():
+    from services.embedding_service import EmbeddingService
+    return EmbeddingService()
+
+
+def _load_ocr():
+    from services.ocr_pool import OCRWorkerPool
+    return OCRWorkerPool()
+
+
+def _warmup_embedding(service) -> None:
+    service.warmup()
+
+
+async def _warmup_ocr(pool) -> None:
+    await pool.warmup()
+
+
+def _close_ocr(pool) -> None:
+    pool.shutdown()
+
+
+class InferenceServer:
+    """임베딩/OCR 모델을 소유하고 API 워커의 요청을 처리하는 서버"""
+
+    def __init__(self, socket_path: str = None):
+        """
+        Args:
+            socket_path: Unix 소켓 경로 (기본값: INFERENCE_SERVER_SOCKET 설정)
+        """
+        settings = get_settings()
+        self.socket_path = socket_path or settings.inference_server_socket
+        self.registry = ServiceRegistry()
+        self.registry.register("embedding", _load_embedding, warmup=_warmup_embedding)
+        self.registry.register("ocr", _load_ocr, warmup=_warmup_ocr, closer=_close_ocr)
+        self._batcher = None
+        self._writers = set()
+
+    def _get_batcher(self):
+        if self._batcher is None:
+            from services.embedding_batcher import EmbeddingBatcher
+            self._batcher = EmbeddingBatcher(self.registry.get("embedding"))
+        return self._batcher
+
+    async def _embed(self, header: Dict, payload: bytes) -> Tuple[Dict, bytes]:
+        # batch_size 힌트는 무시하고 다른 워커의 요청과 함께 배치 처리
+        embeddings = await self._get_batcher().encode(header["texts"])
+        return pack_array(embeddings)
+
+    async def _ocr_business_info(self, header: Dict, payload: bytes) -> Tuple[Dict, bytes]:
+        info = await self.registry.get("ocr").extract_business_info(payload)
+        return {"info": info}, b""
+
+    async def _ocr_business_info_batch(self, header: Dict, payload: bytes) -> Tuple[Dict, bytes]:
+        entries = await self.registry.get("ocr").extract_business_info_batch(unpack_blobs(header, payload))
+        return {"entries": entries}, b""
+
+    async def _ocr_page_text(self, header: Dict, payload: bytes) -> Tuple[Dict, bytes]:
+        from PIL import Image
+        image = Image.frombytes(header["mode"], tuple(header["size"]), payload)
+        result = await self.registry.get("ocr").extract_page_text(
+            image, wait_for_slot=header.get("wait_for_slot", False)
+        )
+        return {"result": result}, b""
+
+    async def _ping(self, header: Dict, payload: bytes) -> Tuple[Dict, bytes]:
+        pool = self.registry.get_if_loaded("ocr")
+        return {"components": self.registry.status(), "ocr_capacity": pool.capacity if pool else 0}, b""
+
+    async def _stats(self, header: Dict, payload: bytes) -> Tuple[Dict, bytes]:
+        pool = self.registry.get_if_loaded("ocr")
+        return {
+            "connections": len(self._writers),
+            "embedding_batcher": self._batcher.stats() if self._batcher else None,
+            "ocr_pool": pool.stats() if pool else None
+        }, b""
+
+    async def _dispatch(self, header: Dict, payload: bytes) -> Tuple[Dict, bytes]:
+        """요청 하나 처리 (에러는 응답 헤더의 error로 변환)"""
+        from services.ocr_pool import OCRQueueFullError, OCRTimeoutError
+
+        handler = {
+            "embed": self._embed,
+            "ocr_business_info": self._ocr_business_info,
+            "ocr_business_info_batch": self._ocr_business_info_batch,
+            "ocr_page_text": self._ocr_page_text,
+            "ping": self._ping,
+            "stats": self._stats
+        }.get(header.get("op"))
+        if handler is None:
+            return {"ok": False, "error": ERROR_INTERNAL, "message": f"알 수 없는 요청입니다: {header.get('op')}"}, b""
+
+        try:
+            response, body = await handler(header, payload)
+        except OCRQueueFullError as e:
+            return {"ok": False, "error": ERROR_QUEUE_FULL, "message": str(e), "retry_after": e.retry_after}, b""
+        except OCRTimeoutError as e:
+            return {"ok": False, "error": ERROR_TIMEOUT, "message": str(e)}, b""
+        except ServiceNotReadyError as e:
+            return {"ok": False, "error": ERROR_NOT_READY, "message": str(e), "component": e.name, "status": e.status}, b""
+        except Exception as e:
+            logger.error(f"추론 요청 처리 중 에러 ({header.get('op')}): {str(e)}")
+            return {"ok": False, "error": ERROR_INTERNAL, "message": str(e)}, b""
+        response["ok"] = True
+        return response, body
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """연결 하나에서 요청을 순서대로 처리 (클라이언트는 연결마다 요청을 하나씩 보냄)"""
+        self._writers.add(writer)
+        try:
+            while True:
+                try:
+                    header, payload = await read_frame_async(reader)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                response, body = await self._dispatch(header, payload)
+                writer.write(encode_frame(response, body))
+                await writer.drain()
+        except asyncio.CancelledError:
+            # 서버 종료 시 처리 중이던 연결은 응답 없이 닫음
+            pass
+        except Exception as e:
+            logger.warning(f"추론 서버 연결 처리 중 에러: {str(e)}")
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    async def serve(self) -> None:
+        """모델을 로드/워밍업한 뒤 소켓을 열고 종료될 때까지 요청 처리"""
+        await self.registry.load_all()
+        for name, state in self.registry.status().items():
+            if state["status"] != "ready":
+                logger.error(f"'{name}' 로드 실패, 해당 요청은 not_ready로 응답합니다: {state['error']}")
+
+        # 이전 실행이 남긴 소켓 파일 정리
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        server = await asyncio.start_unix_server(self._handle_connection, path=self.socket_path)
+        logger.info(f"추론 서버 시작: {self.socket_path}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            # serve_forever가 끝나도 열린 연결은 남아 있으므로 직접 닫음
+            for writer in list(self._writers):
+                writer.close()
+            if self._batcher is not None:
+                await self._batcher.aclose()
+            await self.registry.close_all()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+
+def main() -> None:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="임베딩/OCR 공유 추론 서버")
+    parser.add_argument("--socket", default=settings.inference_server_socket, help="Unix 소켓 경로")
+    parser.add_argument(
+        "--metrics-port", type=int, default=settings.inference_server_metrics_port,
+        help="Prometheus 메트릭 포트 (0이면 끔)"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if args.metrics_port:
+        # 임베딩 배치/OCR 단계별 메트릭은 이 프로세스에서 기록됨
+        from prometheus_client import start_http_server
+        start_http_server(args.metrics_port)
+
+    try:
+        asyncio.run(InferenceServer(args.socket).serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+키별 비동기 잠금
+같은 가게의 등록(변경분 계산 -> 임베딩 -> 반영)이 동시에 실행되지 않도록 가게 ID별로 직렬화합니다.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Hashable, Iterable
+
+
+class KeyedLock:
+    """이벤트 루프 하나에서 사용하는 키별 asyncio.Lock (쓰는 요청이 없으면 잠금 객체 삭제)"""
+
+    def __init__(self):
+        self._locks: Dict[Hashable, asyncio.Lock] = {}
+        self._users: Dict[Hashable, int] = {}
+
+    @asynccontextmanager
+    async def hold(self, keys: Iterable[Hashable]) -> AsyncIterator[None]:
+        """
+        여러 키를 한 번에 잠금 (교착을 피하려고 정렬된 순서로 획득)
+
+        Args:
+            keys: 잠글 키 목록 (중복 허용)
+        """
+        keys = sorted(set(keys))
+        for key in keys:
+            if key not in self._locks:
+                self._locks[key] = asyncio.Lock()
+            self._users[key] = self._users.get(key, 0) + 1
+
+        acquired = []
+        try:
+            for key in keys:
+                await self._locks[key].acquire()
+                acquired.append(key)
+            yield
+        finally:
+            for key in reversed(acquired):
+                self._locks[key].release()
+            for key in keys:
+                self._users[key] -= 1
+                if not self._users[key]:
+                    del self._users[key]
+                    del self._locks[key]
+
+    @property
+    def held(self) -> int:
+        """사용 중(잠금 또는 대기)인 키 수"""
+        return len(self._locks)
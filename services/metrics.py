@@ -0,0 +1,129 @@
+"""
+Prometheus 메트릭
+요청/단계별 지연 히스토그램, Gemma 에러/재시도 카운터, 진행 중 작업 게이지를 정의합니다.
+캐시 적중 수와 대기열 길이처럼 서비스가 이미 집계하는 값은 api/metrics_routes.py의 수집기가
+/metrics 조회 시점에 읽어 가므로 요청 처리 경로에는 비용이 없습니다.
+"""
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+from prometheus_client import Counter, Gauge, Histogram
+
+# 1ms ~ 2분 (임베딩/검색은 ms 단위, Gemma 생성과 OCR은 초 단위)
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0
+)
+
+HTTP_REQUEST_LATENCY = Histogram(
+    "chatbot_http_request_duration_seconds",
+    "HTTP 요청 처리 시간 (스트리밍 응답은 마지막 바이트까지)",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS
+)
+
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "chatbot_http_requests_in_flight",
+    "처리 중인 HTTP 요청 수"
+)
+
+STAGE_LATENCY = Histogram(
+    "chatbot_stage_duration_seconds",
+    "요청/서비스 내부 단계별 처리 시간",
+    ["operation", "stage"],
+    buckets=LATENCY_BUCKETS
+)
+
+EMBEDDING_BATCH_SIZE = Histogram(
+    "chatbot_embedding_batch_size",
+    "배치 임베딩 한 번에 encode한 문장 수",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+)
+
+GEMMA_REQUESTS_IN_FLIGHT = Gauge(
+    "chatbot_gemma_requests_in_flight",
+    "Gemma API로 전송 중인 생성 요청 수"
+)
+
+GEMMA_REQUESTS_WAITING = Gauge(
+    "chatbot_gemma_requests_waiting",
+    "동시 실행 제한(GEMMA_MAX_CONCURRENCY)으로 대기 중인 생성 요청 수"
+)
+
+QUESTION_ANSWERS = Counter(
+    "chatbot_question_answers_total",
+    "질문 답변 수 (source: faq | cache | llm)",
+    ["operation", "source"]
+)
+
+SINGLE_FLIGHT_EXECUTIONS = Counter(
+    "chatbot_single_flight_executions_total",
+    "single-flight로 실제 실행된 작업 수",
+    ["operation"]
+)
+
+SINGLE_FLIGHT_COALESCED = Counter(
+    "chatbot_single_flight_coalesced_total",
+    "진행 중인 같은 작업의 결과를 기다려 공유한 요청 수",
+    ["operation"]
+)
+
+GEMMA_PROMPT_CHARS = Histogram(
+    "chatbot_gemma_prompt_chars",
+    "Gemma 생성 요청 프롬프트 길이 (글자 수)",
+    ["kind"],
+    buckets=(64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384)
+)
+
+GEMMA_PROMPT_TOKENS = Histogram(
+    "chatbot_gemma_prompt_tokens",
+    "Gemma가 평가한 프롬프트 토큰 수 (Ollama prompt_eval_count)",
+    ["kind"],
+    buckets=(32, 64, 128, 256, 512, 1024, 2048, 4096, 8192)
+)
+
+INFERENCE_FALLBACKS = Counter(
+    "chatbot_inference_fallbacks_total",
+    "추론 서버에 연결할 수 없어 워커 프로세스에서 직접 추론한 횟수",
+    ["component"]
+)
+
+GEMMA_RETRIES = Counter(
+    "chatbot_gemma_retries_total",
+    "Gemma API 재시도 횟수",
+    ["reason"]
+)
+
+GEMMA_ERRORS = Counter(
+    "chatbot_gemma_errors_total",
+    "재시도 후에도 실패한 Gemma API 호출 수",
+    ["reason"]
+)
+
+
+@contextmanager
+def observe_stage(operation: str, stage: str) -> Iterator[None]:
+    """
+    블록 실행 시간을 단계별 히스토그램에 기록 (예외가 나도 기록)
+
+    Args:
+        operation: 요청 또는 서비스 이름 (예: question, ocr, gemma)
+        stage: 단계 이름 (예: embed, search, generate)
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_LATENCY.labels(operation, stage).observe(time.perf_counter() - started)
+
+
+def observe_stages(operation: str, timings: Dict[str, float]) -> None:
+    """
+    다른 프로세스(OCR 워커 등)에서 측정한 단계별 시간 기록
+
+    Args:
+        operation: 요청 또는 서비스 이름
+        timings: {단계 이름: 초}
+    """
+    for stage, seconds in timings.items():
+        STAGE_LATENCY.labels(operation, stage).observe(seconds)
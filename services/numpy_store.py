@@ -0,0 +1,365 @@
+"""
+NumPy 벡터 저장소 백엔드
+가게마다 정규화된 임베딩을 연속된 행렬 하나(.npy)로 저장하고, 질문마다 행렬-벡터 곱 한 번으로 top-k를 계산합니다.
+행렬 파일은 메모리 매핑으로 열고, 문서 ID와 문장은 SQLite 인덱스에 저장합니다.
+
+디렉토리 구조:
+    {persist_directory}/index.sqlite3          가게별 행렬 파일 이름, 문서 ID/문장/행 위치
+    {persist_directory}/vectors/ab/ab....npy   가게별 (문서 수, 차원) 행렬
+
+행렬 파일은 덮어쓰지 않고 항상 새 이름으로 쓴 뒤 인덱스를 커밋하므로,
+중간에 프로세스가 죽어도 인덱스는 이전 또는 새 상태 중 하나를 가리킵니다.
+참조되지 않는 파일은 compact()에서 정리됩니다.
+"""
+import logging
+import os
+import shutil
+import sqlite3
+import threading
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set
+import numpy as np
+from .cache import LRUCache
+from .vector_store import StoreDocumentDiff, VectorStoreBackend, empty_query_result
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = "index.sqlite3"
+VECTORS_DIRNAME = "vectors"
+
+# SQLite 한 쿼리에 넣을 최대 파라미터 수
+_SQLITE_MAX_VARIABLES = 900
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS stores (
+    store_id TEXT PRIMARY KEY,
+    file TEXT NOT NULL,
+    rows INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS documents (
+    store_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    document TEXT NOT NULL,
+    PRIMARY KEY (store_id, id)
+);
+CREATE INDEX IF NOT EXISTS documents_store_position ON documents (store_id, position);
+"""
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    """행 단위 L2 정규화 (영벡터는 그대로)"""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+@dataclass
+class _StoreMatrix:
+    """메모리 매핑된 가게 행렬과 행별 문서"""
+    ids: List[str]
+    documents: List[str]
+    matrix: np.ndarray  # (문서 수, 차원), 정규화된 임베딩
+    file: str
+
+
+@dataclass
+class _PendingWrite:
+    store_id: str
+    ids: List[str]
+    documents: List[str]
+    file: Optional[str]  # None이면 가게 문서가 모두 삭제됨
+    old_file: Optional[str]
+
+
+class NumpyVectorStore(VectorStoreBackend):
+    """가게별 NumPy 행렬 기반 벡터 저장소"""
+
+    name = "numpy"
+    marker_filename = INDEX_FILENAME
+    DTYPES = ("float32", "float16")
+
+    def __init__(self, persist_directory: str, dtype: str = "float32", max_open_stores: int = 512):
+        """
+        Args:
+            persist_directory: 데이터 디렉토리
+            dtype: 행렬 저장 타입 (float16은 디스크/페이지 캐시 사용량 절반, 점수 계산은 float32)
+            max_open_stores: 메모리 매핑을 유지할 최대 가게 수 (가게마다 파일 핸들 1개 사용)
+        """
+        super().__init__(persist_directory, persistent=True)
+        if dtype not in self.DTYPES:
+            raise ValueError(f"지원하지 않는 행렬 타입입니다: {dtype}")
+        self.dtype = np.dtype(dtype)
+        self._connection: Optional[sqlite3.Connection] = None
+
+        # SQLite 연결 공유 + 인덱스 커밋/파일 삭제와 행렬 로드를 직렬화
+        self._lock = threading.Lock()
+        self._open_stores = LRUCache(max_entries=max_open_stores)
+
+    @property
+    def _vectors_directory(self) -> str:
+        return os.path.join(self.persist_directory, VECTORS_DIRNAME)
+
+    def _vector_path(self, file: str) -> str:
+        return os.path.join(self._vectors_directory, file)
+
+    def open(self) -> None:
+        os.makedirs(self._vectors_directory, exist_ok=True)
+        connection = sqlite3.connect(
+            os.path.join(self.persist_directory, INDEX_FILENAME),
+            check_same_thread=False,
+            isolation_level=None
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.executescript(_SCHEMA)
+        self._connection = connection
+
+    def close(self) -> None:
+        self._open_stores.clear()
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            stores, vectors = self._connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(rows), 0) FROM stores"
+            ).fetchone()
+        return {"stores": stores, "vectors": vectors}
+
+    def existing_ids(self, store_ids: List[str]) -> Dict[str, Set[str]]:
+        existing_ids: Dict[str, Set[str]] = {store_id: set() for store_id in store_ids}
+        store_ids = list(existing_ids)
+        with self._lock:
+            for start in range(0, len(store_ids), _SQLITE_MAX_VARIABLES):
+                chunk = store_ids[start:start + _SQLITE_MAX_VARIABLES]
+                rows = self._connection.execute(
+                    f"SELECT store_id, id FROM documents WHERE store_id IN ({','.join('?' * len(chunk))})",
+                    chunk
+                ).fetchall()
+                for store_id, doc_id in rows:
+                    existing_ids[store_id].add(doc_id)
+        return existing_ids
+
+    def _read_store(self, store_id: str) -> Optional[_StoreMatrix]:
+        """인덱스와 행렬 파일에서 가게 행렬 로드 (self._lock 안에서 호출)"""
+        row = self._connection.execute(
+            "SELECT file FROM stores WHERE store_id = ?", (store_id,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        documents = self._connection.execute(
+            "SELECT id, document FROM documents WHERE store_id = ? ORDER BY position", (store_id,)
+        ).fetchall()
+        return _StoreMatrix(
+            ids=[doc_id for doc_id, _ in documents],
+            documents=[document for _, document in documents],
+            matrix=np.load(self._vector_path(row[0]), mmap_mode="r"),
+            file=row[0]
+        )
+
+    def _get_store(self, store_id: str) -> Optional[_StoreMatrix]:
+        """
+        메모리 매핑된 가게 행렬 (LRU로 유지)
+
+        다른 워커 프로세스가 같은 가게를 다시 쓰면 인덱스의 파일 이름이 바뀌므로,
+        캐시된 행렬은 인덱스의 현재 파일 이름과 같을 때만 사용합니다.
+        """
+        cached = self._open_stores.get(store_id)
+
+        with self._lock:
+            if cached is not None:
+                row = self._connection.execute(
+                    "SELECT file FROM stores WHERE store_id = ?", (store_id,)
+                ).fetchone()
+                if row is not None and row[0] == cached.file:
+                    return cached
+                self._open_stores.pop(store_id)
+
+            store = self._read_store(store_id)
+            if store is not None:
+                self._open_stores.put(store_id, store)
+        return store
+
+    def _write_matrix(self, matrix: np.ndarray) -> str:
+        """행렬을 새 파일에 저장하고 vectors 디렉토리 기준 상대 경로 반환"""
+        name = uuid.uuid4().hex
+        file = f"{name[:2]}/{name}.npy"
+        path = self._vector_path(file)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            np.save(f, np.ascontiguousarray(matrix))
+            f.flush()
+            os.fsync(f.fileno())
+        return file
+
+    def _remove_file(self, file: str) -> None:
+        try:
+            os.remove(self._vector_path(file))
+        except OSError as e:
+            logger.warning(f"행렬 파일 삭제 실패 (compact에서 다시 정리됨): {file}, {str(e)}")
+
+    def apply(self, diffs: List[StoreDocumentDiff], embeddings: Dict[str, List[float]]) -> None:
+        # 1. 바뀐 가게마다 새 행렬 파일 작성 (유지되는 행 + 추가되는 행)
+        pending: List[_PendingWrite] = []
+        try:
+            for diff in diffs:
+                if not diff.changed:
+                    continue
+
+                with self._lock:
+                    current = self._read_store(diff.store_id)
+
+                ids, documents, parts = [], [], []
+                if current is not None:
+                    removed = set(diff.removed)
+                    keep = [i for i, doc_id in enumerate(current.ids) if doc_id not in removed]
+                    ids = [current.ids[i] for i in keep]
+                    documents = [current.documents[i] for i in keep]
+                    if keep:
+                        parts.append(np.asarray(current.matrix[keep], dtype=self.dtype))
+
+                if diff.added:
+                    ids.extend(diff.added.keys())
+                    documents.extend(diff.added.values())
+                    added = np.asarray([embeddings[doc_id] for doc_id in diff.added], dtype=np.float32)
+                    parts.append(_normalize(added).astype(self.dtype))
+
+                pending.append(_PendingWrite(
+                    store_id=diff.store_id,
+                    ids=ids,
+                    documents=documents,
+                    file=self._write_matrix(np.concatenate(parts)) if ids else None,
+                    old_file=current.file if current is not None else None
+                ))
+        except Exception:
+            for write in pending:
+                if write.file:
+                    self._remove_file(write.file)
+            raise
+
+        if not pending:
+            return
+
+        # 2. 인덱스를 한 트랜잭션으로 커밋한 뒤 이전 파일 삭제
+        with self._lock:
+            connection = self._connection
+            try:
+                connection.execute("BEGIN IMMEDIATE")
+                for write in pending:
+                    connection.execute("DELETE FROM documents WHERE store_id = ?", (write.store_id,))
+                    if write.file is None:
+                        connection.execute("DELETE FROM stores WHERE store_id = ?", (write.store_id,))
+                        continue
+                    connection.execute(
+                        "INSERT OR REPLACE INTO stores (store_id, file, rows) VALUES (?, ?, ?)",
+                        (write.store_id, write.file, len(write.ids))
+                    )
+                    connection.executemany(
+                        "INSERT INTO documents (store_id, id, position, document) VALUES (?, ?, ?, ?)",
+                        [
+                            (write.store_id, doc_id, position, document)
+                            for position, (doc_id, document) in enumerate(zip(write.ids, write.documents))
+                        ]
+                    )
+                connection.execute("COMMIT")
+            except Exception:
+                connection.execute("ROLLBACK")
+                for write in pending:
+                    if write.file:
+                        self._remove_file(write.file)
+                raise
+
+            for write in pending:
+                self._open_stores.pop(write.store_id)
+                if write.old_file:
+                    self._remove_file(write.old_file)
+
+    def delete_store(self, store_id: str) -> None:
+        with self._lock:
+            connection = self._connection
+            row = connection.execute("SELECT file FROM stores WHERE store_id = ?", (store_id,)).fetchone()
+            if row is None:
+                return
+            try:
+                connection.execute("BEGIN IMMEDIATE")
+                connection.execute("DELETE FROM documents WHERE store_id = ?", (store_id,))
+                connection.execute("DELETE FROM stores WHERE store_id = ?", (store_id,))
+                connection.execute("COMMIT")
+            except Exception:
+                connection.execute("ROLLBACK")
+                raise
+            self._open_stores.pop(store_id)
+            self._remove_file(row[0])
+
+    def query(
+        self,
+        store_id: str,
+        query_embeddings: List[List[float]],
+        n_results: int,
+        include_embeddings: bool = False
+    ) -> Dict[str, Any]:
+        store = self._get_store(store_id)
+        if store is None:
+            return empty_query_result()
+
+        queries = _normalize(np.asarray(query_embeddings, dtype=np.float32).reshape(-1, store.matrix.shape[1]))
+        # (질문 수, 차원) x (차원, 문서 수) -> 코사인 유사도 (float16 행렬도 float32로 계산)
+        scores = queries @ store.matrix.T.astype(np.float32, copy=False)
+
+        rows = scores.shape[1]
+        k = min(n_results, rows)
+        results = {"ids": [], "documents": [], "metadatas": [], "distances": []}
+        if include_embeddings:
+            results["embeddings"] = []
+        for row_scores in scores:
+            if k < rows:
+                top = np.argpartition(-row_scores, k - 1)[:k]
+                top = top[np.argsort(-row_scores[top], kind="stable")]
+            else:
+                top = np.argsort(-row_scores, kind="stable")
+            results["ids"].append([store.ids[i] for i in top])
+            results["documents"].append([store.documents[i] for i in top])
+            results["metadatas"].append([{"store_id": store_id} for _ in top])
+            results["distances"].append((1.0 - row_scores[top]).tolist())
+            if include_embeddings:
+                # 저장된 행렬은 이미 L2 정규화되어 있음
+                results["embeddings"].append(np.asarray(store.matrix[top], dtype=np.float32))
+        return results
+
+    def snapshot(self, target: str) -> None:
+        """인덱스는 SQLite 온라인 백업 API로, 참조 중인 행렬 파일만 복사"""
+        os.makedirs(os.path.join(target, VECTORS_DIRNAME))
+        with self._lock:
+            target_db = sqlite3.connect(os.path.join(target, INDEX_FILENAME))
+            try:
+                self._connection.backup(target_db)
+                files = [row[0] for row in target_db.execute("SELECT file FROM stores")]
+            finally:
+                target_db.close()
+
+            for file in files:
+                destination = os.path.join(target, VECTORS_DIRNAME, file)
+                os.makedirs(os.path.dirname(destination), exist_ok=True)
+                shutil.copy2(self._vector_path(file), destination)
+
+    def compact(self) -> None:
+        """참조되지 않는 행렬 파일 삭제 후 인덱스 VACUUM"""
+        with self._lock:
+            referenced = {row[0] for row in self._connection.execute("SELECT file FROM stores")}
+
+        orphans = 0
+        for root, _, filenames in os.walk(self._vectors_directory):
+            for filename in filenames:
+                file = os.path.relpath(os.path.join(root, filename), self._vectors_directory)
+                if file.replace(os.sep, "/") not in referenced:
+                    self._remove_file(file)
+                    orphans += 1
+
+        with self._lock:
+            self._connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self._connection.execute("VACUUM")
+        logger.info(f"참조되지 않는 행렬 파일 {orphans}개 삭제")
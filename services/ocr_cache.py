@@ -0,0 +1,171 @@
+"""
+사업자등록증 OCR 결과 캐시
+업로드한 이미지 바이트의 SHA-256으로 파싱 결과를 캐시해서, 같은 이미지를 다시 올리면
+OCR 워커를 거치지 않고 바로 응답합니다. 동시에 들어온 같은 이미지는 OCR 작업 하나로 합칩니다.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+from typing import Awaitable, Callable, Dict, List
+from config import get_settings
+from .cache import DiskLRUCache, LRUCache
+from .image_preprocess import PreprocessOptions
+from .single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+OCR_CACHE_BACKENDS = ("memory", "disk", "off")
+
+
+class OCRResultCache:
+    """이미지 해시 기반 OCR 결과 캐시 + 동시 요청 합치기"""
+
+    def __init__(
+        self,
+        backend: str = None,
+        directory: str = None,
+        max_entries: int = None,
+        max_bytes: int = None,
+        ttl_seconds: float = None
+    ):
+        """
+        Args:
+            backend: memory | disk | off (기본값: OCR_CACHE_BACKEND)
+            directory: disk 백엔드의 캐시 디렉토리
+            max_entries: 최대 항목 수
+            max_bytes: 최대 총 크기 (0이면 제한 없음)
+            ttl_seconds: 항목 유효 시간 (0이면 만료 없음)
+        """
+        settings = get_settings()
+        self.backend = backend or settings.ocr_cache_backend
+        if self.backend not in OCR_CACHE_BACKENDS:
+            raise ValueError(f"지원하지 않는 OCR 캐시 백엔드입니다: {self.backend} (지원: {OCR_CACHE_BACKENDS})")
+
+        max_entries = max_entries or settings.ocr_cache_max_entries
+        max_bytes = max_bytes if max_bytes is not None else settings.ocr_cache_max_bytes
+        ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.ocr_cache_ttl_seconds
+
+        if self.backend == "memory":
+            self._store = LRUCache(
+                max_entries=max_entries,
+                max_bytes=max_bytes,
+                ttl_seconds=ttl_seconds,
+                sizeof=lambda value: len(json.dumps(value, ensure_ascii=False).encode("utf-8"))
+            )
+        elif self.backend == "disk":
+            self._store = DiskLRUCache(
+                directory or settings.ocr_cache_directory,
+                max_entries=max_entries,
+                max_bytes=max_bytes,
+                ttl_seconds=ttl_seconds
+            )
+        else:
+            self._store = None
+
+        # 전처리 설정이나 추출 방식이 바뀌면 인식 결과도 달라지므로 키에 포함
+        self._key_prefix = repr((PreprocessOptions.from_settings(), settings.ocr_extraction_mode)).encode("utf-8")
+        self._flight = SingleFlight("ocr")
+        logger.info(f"OCR 결과 캐시 - 백엔드: {self.backend}")
+
+    def key(self, image_bytes: bytes) -> str:
+        """이미지 바이트 + 전처리 설정/추출 방식의 SHA-256"""
+        digest = hashlib.sha256(self._key_prefix)
+        digest.update(image_bytes)
+        return digest.hexdigest()
+
+    async def _call(self, fn, *args):
+        # 디스크 백엔드는 파일 I/O가 있으므로 스레드에서 실행
+        if self.backend == "disk":
+            return await asyncio.to_thread(fn, *args)
+        return fn(*args)
+
+    async def get_or_extract(
+        self,
+        image_bytes: bytes,
+        extract: Callable[[bytes], Awaitable[Dict]]
+    ) -> Dict:
+        """
+        캐시에 있으면 반환하고, 없으면 extract로 OCR을 수행해서 저장
+
+        같은 이미지의 동시 요청은 조회와 OCR을 한 번만 수행하고 결과를 공유합니다.
+        OCR이 실패(예외)했거나 아무 항목도 읽지 못한 결과(parsed=False)는 저장하지 않습니다.
+
+        Args:
+            image_bytes: 업로드된 이미지 바이트
+            extract: 이미지 바이트로 사업자등록증 정보를 추출하는 코루틴 함수
+
+        Returns:
+            parse_business_registration_info 결과
+        """
+        # hashlib은 큰 입력에서 GIL을 놓으므로 10MB 이미지도 이벤트 루프를 막지 않음
+        key = await asyncio.to_thread(self.key, image_bytes)
+
+        async def lookup_or_extract() -> Dict:
+            if self._store is not None:
+                cached = await self._call(self._store.get, key)
+                if cached is not None:
+                    return cached
+            info = await extract(image_bytes)
+            if self._store is not None and info.get("parsed"):
+                await self._call(self._store.put, key, info)
+            return info
+
+        return await self._flight.do(key, lookup_or_extract)
+
+    async def get_or_extract_many(
+        self,
+        images: List[bytes],
+        extract_many: Callable[[List[bytes]], Awaitable[List[Dict]]]
+    ) -> List[Dict]:
+        """
+        여러 이미지를 캐시에서 찾고, 없는 이미지만 한 번에 OCR
+
+        같은 요청 안의 중복 이미지는 한 번만 인식합니다.
+        에러가 난 이미지와 아무 항목도 읽지 못한 결과(parsed=False)는 저장하지 않습니다.
+
+        Args:
+            images: 업로드된 이미지 바이트 목록
+            extract_many: 이미지 목록으로 [{"info", "error"}]를 반환하는 코루틴 함수
+
+        Returns:
+            입력 순서대로 [{"info": Dict | None, "error": str | None}]
+        """
+        keys = await asyncio.to_thread(lambda: [self.key(image_bytes) for image_bytes in images])
+
+        found: Dict[str, Dict] = {}
+        if self._store is not None:
+            for key in dict.fromkeys(keys):
+                cached = await self._call(self._store.get, key)
+                if cached is not None:
+                    found[key] = {"info": cached, "error": None}
+
+        missing = [key for key in dict.fromkeys(keys) if key not in found]
+        if missing:
+            first_index = {}
+            for index, key in enumerate(keys):
+                first_index.setdefault(key, index)
+            extracted = await extract_many([images[first_index[key]] for key in missing])
+            for key, entry in zip(missing, extracted):
+                found[key] = entry
+                if self._store is not None and entry["error"] is None and entry["info"].get("parsed"):
+                    await self._call(self._store.put, key, entry["info"])
+
+        return [found[key] for key in keys]
+
+    def clear(self) -> None:
+        """모든 항목 제거"""
+        if self._store is not None:
+            self._store.clear()
+
+    def stats(self) -> Dict:
+        """캐시 통계 + 합쳐진 동시 요청 수"""
+        stats = self._store.stats() if self._store is not None else {
+            "entries": 0,
+            "bytes": 0,
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "hit_rate": 0.0
+        }
+        return {"backend": self.backend, **stats, **self._flight.stats()}
@@ -0,0 +1,314 @@
+"""
+OCR 워커 프로세스 풀
+EasyOCR 인식은 수 초 동안 CPU를 점유하므로 API 프로세스와 분리된 워커 프로세스에서 실행합니다.
+각 워커는 EasyOCR Reader를 한 번만 로드해서 재사용합니다.
+"""
+import asyncio
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+from config import get_settings
+from .image_preprocess import PreprocessOptions
+from .metrics import observe_stage, observe_stages
+from .ocr_service import OCR_EXTRACTION_MODES
+
+logger = logging.getLogger(__name__)
+
+# 워커 프로세스별 OCR 서비스와 사업자등록증 전처리 옵션/추출 방식 (initializer에서 생성)
+_worker_ocr_service = None
+_worker_preprocess = None
+_worker_extraction_mode = None
+_worker_warmup_barrier = None
+
+# 워밍업한 워커가 나머지 워커의 워밍업을 기다리는 최대 시간 (초, 모델 다운로드/로드 포함)
+_WARMUP_BARRIER_TIMEOUT = 600
+
+
+class OCRQueueFullError(Exception):
+    """OCR 대기열이 가득 찬 경우"""
+
+    def __init__(self, retry_after: int):
+        super().__init__("OCR 대기열이 가득 찼습니다.")
+        self.retry_after = retry_after
+
+
+class OCRTimeoutError(Exception):
+    """OCR 작업 시간이 초과된 경우"""
+
+
+def _init_worker(
+    languages: List[str],
+    gpu: bool,
+    preprocess: PreprocessOptions,
+    extraction_mode: str,
+    warmup_barrier
+) -> None:
+    """워커 프로세스 초기화: Reader를 한 번만 로드"""
+    global _worker_ocr_service, _worker_preprocess, _worker_extraction_mode, _worker_warmup_barrier
+    from services.ocr_service import OCRService
+    _worker_ocr_service = OCRService(languages=languages, gpu=gpu)
+    _worker_preprocess = preprocess
+    _worker_extraction_mode = extraction_mode
+    _worker_warmup_barrier = warmup_barrier
+
+
+def _run_business_registration_ocr(image_bytes: bytes) -> Tuple[Dict, Dict[str, float]]:
+    """워커 프로세스에서 OCR 수행 후 사업자등록증 정보 파싱 (단계별 처리 시간 포함)"""
+    timings = {}
+    info = _worker_ocr_service.extract_business_info(
+        image_bytes,
+        preprocess=_worker_preprocess,
+        mode=_worker_extraction_mode,
+        timings=timings
+    )
+    return info, timings
+
+
+def _run_business_registration_ocr_batch(images: List[bytes]) -> Tuple[List[Dict], Dict[str, float]]:
+    """워커 프로세스에서 여러 이미지를 배치로 인식 (파일별 결과/에러와 단계별 처리 시간 합계)"""
+    timings = {}
+    entries = _worker_ocr_service.extract_business_info_batch(
+        images,
+        preprocess=_worker_preprocess,
+        mode=_worker_extraction_mode,
+        timings=timings
+    )
+    return entries, timings
+
+
+def _warmup_worker() -> None:
+    """
+    워커 프로세스 워밍업 (Reader 로드 + 빈 이미지 인식)
+
+    워밍업이 끝나도 모든 워커가 barrier에 도착할 때까지 반환하지 않으므로,
+    한 프로세스가 워밍업 작업을 두 번 가져가지 않고 작업마다 서로 다른 프로세스에서 실행됩니다.
+    """
+    _worker_ocr_service.warmup()
+    try:
+        _worker_warmup_barrier.wait(_WARMUP_BARRIER_TIMEOUT)
+    except threading.BrokenBarrierError:
+        logger.warning("일부 OCR 워커의 워밍업을 기다리지 못했습니다. 워밍업되지 않은 워커는 첫 요청에서 초기화됩니다.")
+
+
+def _run_page_ocr(image) -> Tuple[Dict, Dict[str, float]]:
+    """워커 프로세스에서 PDF 페이지 이미지 전체 OCR 수행 (단계별 처리 시간 포함)"""
+    timings = {}
+    result = _worker_ocr_service.extract_text_from_pil(image, timings=timings)
+    return result, timings
+
+
+def _wake_waiter(waiter: asyncio.Future) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class OCRWorkerPool:
+    """입장 제어(admission control)가 있는 OCR 프로세스 풀"""
+
+    def __init__(
+        self,
+        workers: int = None,
+        max_queue: int = None,
+        job_timeout: float = None,
+        languages: List[str] = None,
+        gpu: bool = False
+    ):
+        """
+        Args:
+            workers: 워커 프로세스 수
+            max_queue: 실행 중인 작업 외에 대기할 수 있는 최대 작업 수
+            job_timeout: 작업당 최대 대기 시간 (초)
+            languages: OCR 언어 목록 (기본값: ['ko', 'en'])
+            gpu: GPU 사용 여부
+        """
+        settings = get_settings()
+        self.workers = workers or settings.ocr_workers
+        self.max_queue = max_queue if max_queue is not None else settings.ocr_max_queue
+        self.job_timeout = job_timeout or settings.ocr_job_timeout_seconds
+        self.retry_after = settings.ocr_retry_after_seconds
+        self.batch_size = settings.ocr_batch_size
+        if settings.ocr_extraction_mode not in OCR_EXTRACTION_MODES:
+            raise ValueError(
+                f"지원하지 않는 OCR 추출 방식입니다: {settings.ocr_extraction_mode} (지원: {OCR_EXTRACTION_MODES})"
+            )
+
+        context = multiprocessing.get_context("spawn")
+        # 워밍업 작업이 워커마다 하나씩 실행되도록 맞추는 barrier (프로세스 생성 시 initializer로 전달)
+        self._warmup_barrier = context.Barrier(self.workers)
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=context,
+            initializer=_init_worker,
+            # 전처리 옵션은 여기서 한 번 검증해서 워커에 전달
+            initargs=(
+                languages or ['ko', 'en'],
+                gpu,
+                PreprocessOptions.from_settings(),
+                settings.ocr_extraction_mode,
+                self._warmup_barrier
+            )
+        )
+        self._pending = 0
+        self._lock = threading.Lock()
+        # 슬롯이 비기를 기다리는 (이벤트 루프, Future) 목록
+        self._slot_waiters = []
+
+    @property
+    def capacity(self) -> int:
+        """동시에 받아들일 수 있는 최대 작업 수 (실행 중 + 대기)"""
+        return self.workers + self.max_queue
+
+    @property
+    def pending(self) -> int:
+        """실행 중이거나 대기 중인 작업 수"""
+        return self._pending
+
+    def _acquire_slot(self, count: int = 1) -> None:
+        with self._lock:
+            if self._pending + count > self.capacity:
+                raise OCRQueueFullError(self.retry_after)
+            self._pending += count
+
+    async def _acquire_slot_wait(self) -> None:
+        """슬롯이 빌 때까지 기다렸다가 점유"""
+        while True:
+            with self._lock:
+                if self._pending < self.capacity:
+                    self._pending += 1
+                    return
+                loop = asyncio.get_running_loop()
+                waiter = loop.create_future()
+                self._slot_waiters.append((loop, waiter))
+            await waiter
+
+    def _release_slot(self, _future=None) -> None:
+        with self._lock:
+            self._pending -= 1
+            waiters, self._slot_waiters = self._slot_waiters, []
+
+        # 워커 스레드에서 호출될 수 있으므로 각 이벤트 루프에 깨우기를 위임
+        for loop, waiter in waiters:
+            loop.call_soon_threadsafe(_wake_waiter, waiter)
+
+    async def submit(self, fn, *args, wait_for_slot: bool = False):
+        """
+        워커 프로세스에서 작업 실행
+
+        작업 시간이 초과되어도 워커에서 실행 중인 작업은 끝날 때까지 슬롯을 점유합니다.
+
+        Args:
+            fn: 워커에서 실행할 함수
+            wait_for_slot: 대기열이 가득 찼을 때 거절하지 않고 기다릴지 여부
+
+        Raises:
+            OCRQueueFullError: 대기열이 가득 찬 경우
+            OCRTimeoutError: 작업 시간이 초과된 경우
+        """
+        if wait_for_slot:
+            await self._acquire_slot_wait()
+        else:
+            self._acquire_slot()
+        try:
+            future = self._executor.submit(fn, *args)
+        except Exception:
+            self._release_slot()
+            raise
+        future.add_done_callback(self._release_slot)
+
+        try:
+            # 대기열 대기 + 워커 실행 + 결과 전달 시간
+            with observe_stage("ocr_pool", "job"):
+                return await asyncio.wait_for(asyncio.wrap_future(future), self.job_timeout)
+        except asyncio.TimeoutError:
+            future.cancel()
+            raise OCRTimeoutError(f"OCR 처리 시간이 초과되었습니다. ({self.job_timeout}초)")
+
+    async def extract_business_info(self, image_bytes: bytes) -> Dict:
+        """
+        이미지에서 사업자등록증 정보 추출
+
+        Args:
+            image_bytes: 이미지 파일의 바이너리 데이터
+
+        Returns:
+            parse_business_registration_info 결과
+        """
+        info, timings = await self.submit(_run_business_registration_ocr, image_bytes)
+        observe_stages("ocr", timings)
+        return info
+
+    async def extract_business_info_batch(self, images: List[bytes]) -> List[Dict]:
+        """
+        여러 이미지에서 사업자등록증 정보 추출
+
+        OCR_BATCH_SIZE개씩 나눠 워커 작업 하나로 배치 인식하며, 나눈 작업들은 여러 워커에서 병렬로 실행됩니다.
+        첫 작업은 대기열이 가득 차면 거절하고(OCRQueueFullError), 나머지는 슬롯이 빌 때까지 기다립니다.
+
+        Args:
+            images: 이미지 파일 바이너리 목록
+
+        Returns:
+            입력 순서대로 [{"info": Dict | None, "error": str | None}]
+        """
+        chunks = [images[start:start + self.batch_size] for start in range(0, len(images), self.batch_size)]
+        tasks = [
+            asyncio.ensure_future(self.submit(_run_business_registration_ocr_batch, chunk, wait_for_slot=index > 0))
+            for index, chunk in enumerate(chunks)
+        ]
+        try:
+            results = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        entries = []
+        for chunk_entries, timings in results:
+            observe_stages("ocr_batch", timings)
+            entries.extend(chunk_entries)
+        return entries
+
+    async def extract_page_text(self, image, wait_for_slot: bool = False) -> Dict:
+        """
+        PDF 페이지 이미지 전체에서 텍스트 추출
+
+        Args:
+            image: 페이지를 래스터화한 PIL 이미지
+            wait_for_slot: 대기열이 가득 찼을 때 기다릴지 여부
+
+        Returns:
+            OCRService.extract_text_from_pil 결과
+        """
+        result, timings = await self.submit(_run_page_ocr, image, wait_for_slot=wait_for_slot)
+        observe_stages("pdf_ocr", timings)
+        return result
+
+    async def warmup(self) -> None:
+        """
+        모든 워커 프로세스를 띄우고 Reader 로드와 첫 인식을 미리 수행
+
+        워커 수만큼 작업을 동시에 제출하고, 각 작업은 모든 워커가 barrier에 도착할 때까지 워커를 점유하므로
+        모든 프로세스가 한 번씩 워밍업됩니다. 이전 워밍업에서 barrier가 깨졌으면 다시 맞춥니다.
+        """
+        self._warmup_barrier.reset()
+        await asyncio.gather(*(
+            asyncio.wrap_future(self._executor.submit(_warmup_worker))
+            for _ in range(self.workers)
+        ))
+
+    def stats(self) -> Dict:
+        """풀 상태 반환"""
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "pending": self._pending,
+            "batch_size": self.batch_size,
+            "job_timeout_seconds": self.job_timeout
+        }
+
+    def shutdown(self) -> None:
+        """워커 프로세스 종료"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
@@ -2,16 +2,60 @@
 EasyOCR 기반 OCR 서비스
 이미지와 PDF에서 텍스트를 추출합니다.
 """
-import easyocr
-from typing import List, Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Tuple
 from PIL import Image
 import numpy as np
-import io
 import logging
 import re
+import time
+from services.image_preprocess import PreprocessOptions, decode_image, preprocess_image
 
 logger = logging.getLogger(__name__)
 
+# 사업자등록증 정보 추출 방식
+# - targeted: 텍스트 영역 검출 후 라벨 영역과 그 오른쪽 값 영역만 인식
+# - full: 검출된 모든 영역을 인식한 뒤 전체 텍스트에 정규식 적용
+OCR_EXTRACTION_MODES = ("targeted", "full")
+
+BUSINESS_INFO_FIELDS = ("company_name", "business_number", "representative_name", "opening_date")
+
+# 일괄 인식에서 이미지 디코딩/전처리에 쓰는 스레드 수 (PIL은 디코딩/리사이즈 중 GIL을 놓음)
+_BATCH_DECODE_THREADS = 4
+
+# (필드, 라벨 패턴(공백 제거 텍스트 앞부분), parse_business_registration_info가 인식하는 표준 라벨)
+_FIELD_LABELS = (
+    ("company_name", re.compile(r'^상호[\(\[]?(법인명)?[\)\]]?'), "상호(법인명)"),
+    ("business_number", re.compile(r'^(사업자)?등록번호'), "등록번호"),
+    ("representative_name", re.compile(r'^성명[\(\[]?(대표자)?[\)\]]?'), "성명(대표자)"),
+    ("opening_date", re.compile(r'^개업(연월일|일자|일)?'), "개업일")
+)
+
+
+def _group_lines(boxes: List[List[int]]) -> List[List[List[int]]]:
+    """
+    검출된 가로 영역([x_min, x_max, y_min, y_max])을 줄 단위로 묶기
+
+    Returns:
+        위에서 아래 순서의 줄 목록 (각 줄은 왼쪽부터 정렬된 영역 목록)
+    """
+    lines = []
+    for box in sorted(boxes, key=lambda b: (b[2] + b[3]) / 2):
+        center = (box[2] + box[3]) / 2
+        # 줄 첫 영역의 세로 범위 안에 중심이 있으면 같은 줄
+        if lines and lines[-1][0][2] <= center <= lines[-1][0][3]:
+            lines[-1].append(box)
+        else:
+            lines.append([box])
+    return [sorted(line, key=lambda b: b[0]) for line in lines]
+
+
+def _pad_to(image_array: np.ndarray, height: int, width: int) -> np.ndarray:
+    """오른쪽/아래쪽에 흰 여백을 붙여 크기 맞추기 (좌표는 그대로 유지)"""
+    padded = np.full((height, width) + image_array.shape[2:], 255, dtype=image_array.dtype)
+    padded[:image_array.shape[0], :image_array.shape[1]] = image_array
+    return padded
+
 
 class OCRService:
     """OCR 서비스"""
@@ -30,14 +74,70 @@ class OCRService:
         self.languages = languages
         self.gpu = gpu
         logger.info(f"EasyOCR 초기화 - 언어: {languages}, GPU: {gpu}")
+        # 무거운 모듈은 실제로 Reader를 만들 때만 import
+        import easyocr
         self.reader = easyocr.Reader(languages, gpu=gpu)
     
-    def extract_text_from_image(self, image_bytes: bytes) -> Dict:
+    def warmup(self) -> None:
+        """첫 요청 지연을 없애기 위한 워밍업 인식 (빈 이미지)"""
+        self.reader.readtext(np.full((64, 256, 3), 255, dtype=np.uint8), detail=1)
+    
+    def extract_text_from_image(
+        self,
+        image_bytes: bytes,
+        preprocess: PreprocessOptions = None,
+        timings: Dict[str, float] = None
+    ) -> Dict:
         """
         이미지 바이너리에서 텍스트 추출
         
         Args:
             image_bytes: 이미지 파일의 바이너리 데이터
+            preprocess: 전처리 옵션 (기본값: OCR_* 설정의 사업자등록증용 옵션)
+            timings: 주어지면 단계별 처리 시간(초)을 기록 (decode, preprocess, readtext)
+            
+        Returns:
+            extract_text_from_pil 결과 (bbox는 원본 이미지 좌표)
+        """
+        if preprocess is None:
+            preprocess = PreprocessOptions.from_settings()
+        try:
+            # 이미지 로드 (JPEG는 축소 목표에 맞춰 낮은 해상도로 바로 디코딩)
+            started = time.perf_counter()
+            image, original_size = decode_image(image_bytes, preprocess)
+            if timings is not None:
+                timings["decode"] = time.perf_counter() - started
+        except Exception as e:
+            logger.error(f"이미지 로드 중 에러: {str(e)}")
+            return {
+                "success": False,
+                "text": "",
+                "results": [],
+                "error": str(e)
+            }
+        
+        return self.extract_text_from_pil(
+            image,
+            preprocess=preprocess,
+            timings=timings,
+            original_size=original_size
+        )
+    
+    def extract_text_from_pil(
+        self,
+        image: Image.Image,
+        preprocess: PreprocessOptions = None,
+        timings: Dict[str, float] = None,
+        original_size: Tuple[int, int] = None
+    ) -> Dict:
+        """
+        PIL 이미지에서 텍스트 추출
+        
+        Args:
+            image: PIL 이미지
+            preprocess: 전처리 옵션 (None이면 RGB 변환만 하고 전체 이미지를 인식)
+            timings: 주어지면 단계별 처리 시간(초)을 기록 (preprocess, readtext)
+            original_size: draft 디코딩 전 원본 크기 (bbox를 원본 좌표로 되돌릴 때 사용)
             
         Returns:
             {
@@ -53,26 +153,25 @@ class OCRService:
                 "error": str (에러 메시지, 있을 경우)
             }
         """
+        if timings is None:
+            timings = {}
+        if preprocess is None:
+            preprocess = PreprocessOptions(exif_transpose=False)
         try:
-            # 이미지 로드
-            image = Image.open(io.BytesIO(image_bytes))
-            
-            # 이미지를 RGB로 변환 (RGBA 등의 형식 대응)
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
-            
-            logger.info(f"이미지 크기: {image.size}, 모드: {image.mode}")
+            # 회전 보정, 영역 자르기, 흑백 변환, 축소
+            started = time.perf_counter()
+            image, transform = preprocess_image(image, preprocess, original_size)
             
-            # 이미지를 반으로 잘라서 위쪽 부분만 추출
-            width, height = image.size
-            upper_half = image.crop((0, 0, width, height // 2))
-            logger.info(f"위쪽 절반 이미지 크기: {upper_half.size}")
+            # PIL Image를 numpy array로 변환 (easyocr은 흑백 2차원 배열도 지원)
+            image_array = np.array(image)
+            timings["preprocess"] = time.perf_counter() - started
             
-            # PIL Image를 numpy array로 변환 (easyocr이 numpy array를 지원)
-            image_array = np.array(upper_half)
+            logger.info(f"인식 이미지 크기: {image.size}, 모드: {image.mode}")
             
             # OCR 수행
+            started = time.perf_counter()
             results = self.reader.readtext(image_array, detail=1)
+            timings["readtext"] = time.perf_counter() - started
             
             # 결과 처리
             extracted_texts = []
@@ -80,7 +179,7 @@ class OCRService:
             
             for (bbox, text, confidence) in results:
                 # numpy 타입을 Python 네이티브 타입으로 변환 (Pydantic 직렬화 호환)
-                bbox_list = [[float(point[0]), float(point[1])] for point in bbox]
+                bbox_list = transform.to_original([[float(point[0]), float(point[1])] for point in bbox])
                 extracted_texts.append({
                     "text": text,
                     "confidence": float(confidence),
@@ -103,6 +202,251 @@ class OCRService:
                 "error": str(e)
             }
     
+    def extract_business_info(
+        self,
+        image_bytes: bytes,
+        preprocess: PreprocessOptions = None,
+        mode: str = "targeted",
+        timings: Dict[str, float] = None
+    ) -> Dict:
+        """
+        사업자등록증 이미지에서 상호, 사업자등록번호, 대표자 성명, 개업일 추출
+        
+        Args:
+            image_bytes: 이미지 파일의 바이너리 데이터
+            preprocess: 전처리 옵션 (기본값: OCR_* 설정의 사업자등록증용 옵션)
+            mode: targeted | full (OCR_EXTRACTION_MODES 참고)
+            timings: 주어지면 단계별 처리 시간(초)을 기록
+            
+        Returns:
+            parse_business_registration_info 결과
+        """
+        if mode not in OCR_EXTRACTION_MODES:
+            raise ValueError(f"지원하지 않는 OCR 추출 방식입니다: {mode} (지원: {OCR_EXTRACTION_MODES})")
+        if timings is None:
+            timings = {}
+        if preprocess is None:
+            preprocess = PreprocessOptions.from_settings()
+        
+        if mode == "full":
+            ocr_result = self.extract_text_from_image(image_bytes, preprocess=preprocess, timings=timings)
+            started = time.perf_counter()
+            info = self.parse_business_registration_info(ocr_result['text'])
+            timings["parse"] = time.perf_counter() - started
+            return info
+        
+        try:
+            started = time.perf_counter()
+            image, original_size = decode_image(image_bytes, preprocess)
+            timings["decode"] = time.perf_counter() - started
+            
+            started = time.perf_counter()
+            image, _ = preprocess_image(image, preprocess, original_size)
+            image_array = np.array(image)
+            timings["preprocess"] = time.perf_counter() - started
+            
+            return self._extract_fields_by_labels(image_array, timings)
+        except Exception as e:
+            logger.error(f"OCR 처리 중 에러: {str(e)}")
+            return self.parse_business_registration_info("")
+    
+    def _load_business_image(self, image_bytes: bytes, preprocess: PreprocessOptions) -> np.ndarray:
+        """디코딩 + 전처리 후 인식용 배열 반환"""
+        image, original_size = decode_image(image_bytes, preprocess)
+        image, _ = preprocess_image(image, preprocess, original_size)
+        return np.array(image)
+    
+    def extract_business_info_batch(
+        self,
+        images: List[bytes],
+        preprocess: PreprocessOptions = None,
+        mode: str = "targeted",
+        timings: Dict[str, float] = None
+    ) -> List[Dict]:
+        """
+        여러 사업자등록증 이미지를 한 번에 인식
+        
+        디코딩/전처리는 스레드로 병렬 수행하고, 이미지를 같은 크기로 맞춘 뒤
+        텍스트 영역 검출을 배치로 한 번에 수행합니다.
+        full 방식은 EasyOCR readtext_batched를 그대로 사용하고,
+        targeted 방식은 배치 검출 결과로 이미지마다 라벨 기준 인식을 수행합니다.
+        
+        Args:
+            images: 이미지 파일 바이너리 목록
+            preprocess: 전처리 옵션 (기본값: OCR_* 설정의 사업자등록증용 옵션)
+            mode: targeted | full
+            timings: 주어지면 단계별 처리 시간(초) 합계를 기록
+            
+        Returns:
+            입력 순서대로 [{"info": parse_business_registration_info 결과 | None, "error": str | None}]
+        """
+        if mode not in OCR_EXTRACTION_MODES:
+            raise ValueError(f"지원하지 않는 OCR 추출 방식입니다: {mode} (지원: {OCR_EXTRACTION_MODES})")
+        if timings is None:
+            timings = {}
+        if preprocess is None:
+            preprocess = PreprocessOptions.from_settings()
+        
+        entries = [{"info": None, "error": None} for _ in images]
+        if not images:
+            return entries
+        
+        started = time.perf_counter()
+        arrays = [None] * len(images)
+        with ThreadPoolExecutor(max_workers=min(_BATCH_DECODE_THREADS, len(images))) as executor:
+            futures = [executor.submit(self._load_business_image, image_bytes, preprocess) for image_bytes in images]
+            for index, future in enumerate(futures):
+                try:
+                    arrays[index] = future.result()
+                except Exception as e:
+                    logger.error(f"이미지 로드 중 에러: {str(e)}")
+                    entries[index]["error"] = f"이미지 로드 중 에러: {str(e)}"
+        timings["decode_preprocess"] = time.perf_counter() - started
+        
+        valid = [index for index, array in enumerate(arrays) if array is not None]
+        if not valid:
+            return entries
+        
+        # 배치 검출을 위해 같은 크기로 맞춤 (전처리에서 긴 변을 맞추므로 여백은 작음)
+        height = max(arrays[index].shape[0] for index in valid)
+        width = max(arrays[index].shape[1] for index in valid)
+        batch = [_pad_to(arrays[index], height, width) for index in valid]
+        
+        try:
+            if mode == "full":
+                started = time.perf_counter()
+                batch_results = self.reader.readtext_batched(batch, detail=1)
+                timings["readtext_batched"] = time.perf_counter() - started
+                
+                started = time.perf_counter()
+                for index, results in zip(valid, batch_results):
+                    entries[index]["info"] = self.parse_business_registration_info(
+                        "\n".join(text for _, text, _ in results)
+                    )
+                timings["parse"] = time.perf_counter() - started
+            else:
+                from easyocr.utils import reformat_input_batched
+                
+                started = time.perf_counter()
+                color_batch, _ = reformat_input_batched(batch)
+                horizontal_lists, free_lists = self.reader.detect(color_batch, reformat=False)
+                timings["detect"] = time.perf_counter() - started
+                
+                for index, image_array, horizontal_list, free_list in zip(valid, batch, horizontal_lists, free_lists):
+                    image_timings = {}
+                    entries[index]["info"] = self._extract_fields_by_labels(
+                        image_array,
+                        image_timings,
+                        detection=(horizontal_list, free_list)
+                    )
+                    for stage, seconds in image_timings.items():
+                        timings[stage] = timings.get(stage, 0.0) + seconds
+        except Exception as e:
+            logger.error(f"일괄 OCR 처리 중 에러: {str(e)}")
+            for index in valid:
+                if entries[index]["info"] is None:
+                    entries[index]["error"] = f"OCR 처리 중 에러: {str(e)}"
+        
+        return entries
+    
+    def _recognize_boxes(self, image_array: np.ndarray, boxes: List[List[int]]) -> List[str]:
+        """
+        주어진 가로 영역만 인식해서 영역 순서대로 텍스트 반환
+        
+        EasyOCR은 결과를 위치 순으로 다시 정렬하므로 결과 bbox의 왼쪽 위 꼭짓점과
+        가장 가까운 입력 영역에 텍스트를 대응시킵니다.
+        """
+        if not boxes:
+            return []
+        results = self.reader.recognize(image_array, horizontal_list=boxes, free_list=[], detail=1)
+        texts = [""] * len(boxes)
+        for bbox, text, _ in results:
+            x, y = bbox[0]
+            index = min(range(len(boxes)), key=lambda i: abs(boxes[i][0] - x) + abs(boxes[i][2] - y))
+            texts[index] = text
+        return texts
+    
+    def _extract_fields_by_labels(
+        self,
+        image_array: np.ndarray,
+        timings: Dict[str, float],
+        detection: Tuple[List, List] = None
+    ) -> Dict:
+        """
+        라벨 기준 영역 인식
+        
+        1. 텍스트 영역 검출은 한 번만 수행하고 영역을 줄 단위로 묶음
+        2. 줄마다 맨 왼쪽 영역만 인식해서 라벨(상호, 등록번호, 성명, 개업일)을 찾음
+        3. 라벨 영역에 값이 붙어 있지 않은 필드만 바로 오른쪽 영역을 인식
+        4. 라벨을 못 찾았거나 값이 비면 검출 결과를 재사용해서 전체 영역을 인식
+        
+        필드마다 "표준 라벨 + 값" 줄을 만들어 기존 정규식으로 파싱하므로
+        줄 순서가 뒤섞여도 결과가 같습니다.
+        
+        Args:
+            detection: 배치 검출로 이미 구한 (horizontal_list, free_list)가 있으면 검출 생략
+        """
+        if detection is None:
+            started = time.perf_counter()
+            horizontal_list, free_list = self.reader.detect(image_array)
+            horizontal_list, free_list = horizontal_list[0], free_list[0]
+            timings["detect"] = time.perf_counter() - started
+        else:
+            horizontal_list, free_list = detection
+        
+        lines = _group_lines(horizontal_list)
+        
+        started = time.perf_counter()
+        head_texts = self._recognize_boxes(image_array, [line[0] for line in lines])
+        timings["recognize_labels"] = time.perf_counter() - started
+        
+        # 필드 -> (줄, 라벨 영역에서 라벨 뒤에 붙은 값)
+        found = {}
+        for line, text in zip(lines, head_texts):
+            normalized = re.sub(r'\s+', '', text)
+            for field, pattern, _ in _FIELD_LABELS:
+                match = pattern.match(normalized)
+                if match and field not in found:
+                    found[field] = (line, normalized[match.end():].lstrip(':;|.'))
+                    break
+        
+        # 값이 라벨 영역에 없으면 같은 줄에서 라벨 바로 오른쪽 영역을 인식
+        value_fields = [field for field, (line, remainder) in found.items() if not remainder and len(line) > 1]
+        started = time.perf_counter()
+        value_texts = self._recognize_boxes(image_array, [found[field][0][1] for field in value_fields])
+        timings["recognize_values"] = time.perf_counter() - started
+        values = dict(zip(value_fields, value_texts))
+        
+        started = time.perf_counter()
+        field_lines = [
+            f"{canonical} {found[field][1]} {values.get(field, '')}"
+            for field, _, canonical in _FIELD_LABELS
+            if field in found
+        ]
+        info = self.parse_business_registration_info("\n".join(field_lines))
+        timings["parse"] = time.perf_counter() - started
+        
+        missing = [field for field in BUSINESS_INFO_FIELDS if not info[field]]
+        if not missing:
+            return info
+        
+        # 전체 인식으로 빠진 필드 채우기 (검출 결과 재사용)
+        logger.info(f"라벨 기준 인식으로 찾지 못한 필드: {missing}, 전체 영역 인식으로 대체")
+        started = time.perf_counter()
+        results = self.reader.recognize(
+            image_array,
+            horizontal_list=horizontal_list,
+            free_list=free_list,
+            detail=1
+        ) if horizontal_list or free_list else []
+        timings["recognize_full"] = time.perf_counter() - started
+        
+        full_info = self.parse_business_registration_info("\n".join(text for _, text, _ in results))
+        for field in missing:
+            info[field] = full_info[field]
+        info["parsed"] = any(info[field] for field in BUSINESS_INFO_FIELDS)
+        return info
+    
     def parse_business_registration_info(self, ocr_text: str) -> Dict:
         """
         사업자등록증 OCR 텍스트에서 주요 정보 파싱
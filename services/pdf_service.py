@@ -0,0 +1,103 @@
+"""
+PDF OCR 서비스
+PDF 페이지를 한 장씩 지연 래스터화해서 OCR 워커 풀에서 병렬로 인식합니다.
+메모리에는 동시에 처리 중인 몇 페이지만 유지됩니다.
+"""
+import asyncio
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, AsyncIterator, Dict, Tuple
+from config import get_settings
+from .metrics import observe_stage
+from .ocr_pool import OCRWorkerPool
+
+if TYPE_CHECKING:
+    import pypdfium2 as pdfium
+
+logger = logging.getLogger(__name__)
+
+# pdfium은 스레드 안전하지 않으므로 모든 호출을 단일 스레드에서 실행
+_pdfium_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pdfium")
+
+
+def _open_document(pdf_bytes: bytes) -> Tuple["pdfium.PdfDocument", int]:
+    import pypdfium2 as pdfium
+    pdf = pdfium.PdfDocument(pdf_bytes)
+    return pdf, len(pdf)
+
+
+def _render_page(pdf: "pdfium.PdfDocument", index: int, scale: float):
+    """페이지 하나를 RGB PIL 이미지로 래스터화"""
+    page = pdf[index]
+    try:
+        bitmap = page.render(scale=scale)
+        try:
+            return bitmap.to_pil().convert('RGB')
+        finally:
+            bitmap.close()
+    finally:
+        page.close()
+
+
+class PDFOCRService:
+    """페이지 단위 병렬 PDF OCR"""
+
+    def __init__(self, ocr_pool: OCRWorkerPool, dpi: int = None, max_pages_in_flight: int = None):
+        """
+        Args:
+            ocr_pool: OCR 워커 풀
+            dpi: 래스터화 해상도
+            max_pages_in_flight: 동시에 래스터화/인식 중인 최대 페이지 수
+        """
+        settings = get_settings()
+        self.ocr_pool = ocr_pool
+        self.dpi = dpi or settings.pdf_ocr_dpi
+        self.max_pages_in_flight = max_pages_in_flight or settings.pdf_ocr_max_pages_in_flight
+
+    async def iter_pages(self, pdf_bytes: bytes) -> AsyncIterator[Dict]:
+        """
+        PDF 페이지별 OCR 결과를 페이지 순서대로 반환
+
+        첫 페이지는 OCR 대기열이 가득 차 있으면 바로 거절(OCRQueueFullError)하고,
+        이후 페이지는 슬롯이 빌 때까지 기다립니다.
+
+        Args:
+            pdf_bytes: PDF 파일의 바이너리 데이터
+
+        Yields:
+            {"page_number": int, "text": str, "results": list}
+        """
+        loop = asyncio.get_running_loop()
+        scale = self.dpi / 72
+        pdf, page_count = await loop.run_in_executor(_pdfium_executor, _open_document, pdf_bytes)
+        logger.info(f"PDF 페이지 수: {page_count}, DPI: {self.dpi}")
+
+        in_flight = deque()
+        next_index = 0
+        try:
+            while next_index < page_count or in_flight:
+                # 처리 중인 페이지가 한도보다 적으면 다음 페이지를 래스터화해서 제출
+                while next_index < page_count and len(in_flight) < self.max_pages_in_flight:
+                    with observe_stage("pdf_ocr", "render"):
+                        image = await loop.run_in_executor(
+                            _pdfium_executor, _render_page, pdf, next_index, scale
+                        )
+                    task = asyncio.ensure_future(
+                        self.ocr_pool.extract_page_text(image, wait_for_slot=next_index > 0)
+                    )
+                    del image
+                    next_index += 1
+                    in_flight.append((next_index, task))
+
+                page_number, task = in_flight.popleft()
+                result = await task
+                yield {
+                    "page_number": page_number,
+                    "text": result['text'],
+                    "results": result['results']
+                }
+        finally:
+            for _, task in in_flight:
+                task.cancel()
+            await loop.run_in_executor(_pdfium_executor, pdf.close)
@@ -0,0 +1,399 @@
+"""
+가게 등록 작업 큐
+/store/register 요청을 SQLite 큐에 저장하고 백그라운드 워커가 동시 실행 수를 제한해서 처리합니다.
+큐가 파일에 있으므로 서버가 재시작되어도 대기 중인 작업은 남아 있고,
+실행 중인 워커는 리스(lease)를 주기적으로 연장하고, 프로세스가 죽어 연장이 끊긴 작업은
+리스가 만료되면 다시 대기열로 돌아갑니다.
+여러 uvicorn 워커가 같은 파일을 써도 작업 하나는 한 워커만 가져갑니다.
+"""
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from config import get_settings
+from .metrics import observe_stage
+from .service_registry import ServiceNotReadyError
+
+logger = logging.getLogger(__name__)
+
+JOB_STATUSES = ("queued", "running", "succeeded", "failed")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    store_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    request TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_expires_at REAL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created_at);
+"""
+
+_COLUMNS = "job_id, store_id, status, request, result, error, attempts, created_at, updated_at"
+
+
+@dataclass
+class RegistrationJob:
+    """등록 작업 상태"""
+    job_id: str
+    store_id: str
+    status: str  # queued | running | succeeded | failed
+    request: Dict[str, Any]
+    result: Optional[Dict[str, Any]]
+    error: Optional[str]
+    attempts: int
+    created_at: float
+    updated_at: float
+
+
+def _row_to_job(row) -> RegistrationJob:
+    job_id, store_id, status, request, result, error, attempts, created_at, updated_at = row
+    return RegistrationJob(
+        job_id=job_id,
+        store_id=store_id,
+        status=status,
+        request=json.loads(request),
+        result=json.loads(result) if result is not None else None,
+        error=error,
+        attempts=attempts,
+        created_at=created_at,
+        updated_at=updated_at
+    )
+
+
+class RegistrationJobStore:
+    """SQLite 기반 영속 작업 큐"""
+
+    def __init__(self, path: str, lease_seconds: float, max_attempts: int):
+        """
+        Args:
+            path: SQLite 파일 경로
+            lease_seconds: 작업을 가져간 워커가 이 시간 동안 리스를 연장하지 않으면 죽은 것으로 보고 다시 대기열로 돌림
+            max_attempts: 리스 만료로 다시 실행할 최대 횟수 (넘으면 실패 처리)
+        """
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(_SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    def enqueue(self, store_id: str, request: Dict[str, Any]) -> RegistrationJob:
+        """
+        작업 추가
+
+        Args:
+            store_id: 가게 ID
+            request: JSON으로 저장할 등록 요청
+
+        Returns:
+            대기 상태의 RegistrationJob
+        """
+        now = time.time()
+        job = RegistrationJob(
+            job_id=uuid.uuid4().hex,
+            store_id=store_id,
+            status="queued",
+            request=request,
+            result=None,
+            error=None,
+            attempts=0,
+            created_at=now,
+            updated_at=now
+        )
+        with self._lock:
+            self._connect().execute(
+                "INSERT INTO jobs (job_id, store_id, status, request, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (job.job_id, store_id, job.status, json.dumps(request, ensure_ascii=False), now, now)
+            )
+        return job
+
+    def get(self, job_id: str) -> Optional[RegistrationJob]:
+        """작업 조회 (없으면 None)"""
+        with self._lock:
+            row = self._connect().execute(f"SELECT {_COLUMNS} FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return _row_to_job(row) if row else None
+
+    def claim(self) -> Optional[RegistrationJob]:
+        """
+        가장 오래된 대기 작업을 실행 상태로 바꾸고 반환 (없으면 None)
+
+        같은 가게의 작업이 실행 중이면 그 가게의 다음 작업은 건너뛰어서
+        한 가게의 등록이 요청 순서대로 반영되게 합니다.
+        """
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                # 리스가 만료된 작업 (실행하던 프로세스가 죽음)
+                connection.execute(
+                    "UPDATE jobs SET status = 'failed', error = ?, lease_expires_at = NULL, updated_at = ? "
+                    "WHERE status = 'running' AND lease_expires_at < ? AND attempts >= ?",
+                    ("작업이 완료되지 않은 채 반복해서 중단되었습니다.", now, now, self.max_attempts)
+                )
+                connection.execute(
+                    "UPDATE jobs SET status = 'queued', lease_expires_at = NULL, updated_at = ? "
+                    "WHERE status = 'running' AND lease_expires_at < ?",
+                    (now, now)
+                )
+                row = connection.execute(
+                    f"SELECT {_COLUMNS} FROM jobs WHERE status = 'queued' "
+                    "AND store_id NOT IN (SELECT store_id FROM jobs WHERE status = 'running') "
+                    "ORDER BY created_at, rowid LIMIT 1"
+                ).fetchone()
+                if row is not None:
+                    connection.execute(
+                        "UPDATE jobs SET status = 'running', attempts = attempts + 1, "
+                        "lease_expires_at = ?, updated_at = ? WHERE job_id = ?",
+                        (now + self.lease_seconds, now, row[0])
+                    )
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+
+        if row is None:
+            return None
+        job = _row_to_job(row)
+        job.status = "running"
+        job.attempts += 1
+        job.updated_at = now
+        return job
+
+    def renew(self, job: RegistrationJob) -> bool:
+        """
+        실행 중인 작업의 리스 연장
+
+        Returns:
+            이 실행(job.attempts)이 아직 작업을 가지고 있으면 True
+            (리스가 만료되어 다른 워커가 다시 가져갔거나 끝냈으면 False)
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._connect().execute(
+                "UPDATE jobs SET lease_expires_at = ?, updated_at = ? "
+                "WHERE job_id = ? AND status = 'running' AND attempts = ?",
+                (now + self.lease_seconds, now, job.job_id, job.attempts)
+            )
+        return cursor.rowcount > 0
+
+    def _finish(self, job: RegistrationJob, status: str, result: Optional[Dict], error: Optional[str]) -> bool:
+        # 시도 횟수를 소유 토큰으로 사용해서, 리스를 잃은 이전 실행이 새 실행의 상태를 덮어쓰지 않게 함
+        with self._lock:
+            cursor = self._connect().execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, lease_expires_at = NULL, updated_at = ? "
+                "WHERE job_id = ? AND status = 'running' AND attempts = ?",
+                (
+                    status,
+                    json.dumps(result, ensure_ascii=False) if result is not None else None,
+                    error,
+                    time.time(),
+                    job.job_id,
+                    job.attempts
+                )
+            )
+        return cursor.rowcount > 0
+
+    def complete(self, job: RegistrationJob, result: Dict[str, Any]) -> bool:
+        """작업 성공 처리 (이 실행이 작업을 잃었으면 반영하지 않고 False)"""
+        return self._finish(job, "succeeded", result, None)
+
+    def fail(self, job: RegistrationJob, error: str) -> bool:
+        """작업 실패 처리 (이 실행이 작업을 잃었으면 반영하지 않고 False)"""
+        return self._finish(job, "failed", None, error)
+
+    def release(self, job: RegistrationJob) -> None:
+        """실행하지 못한 작업을 시도 횟수에 넣지 않고 다시 대기열로 돌림"""
+        with self._lock:
+            self._connect().execute(
+                "UPDATE jobs SET status = 'queued', attempts = attempts - 1, lease_expires_at = NULL, updated_at = ? "
+                "WHERE job_id = ? AND status = 'running' AND attempts = ?",
+                (time.time(), job.job_id, job.attempts)
+            )
+
+    def prune(self, older_than_seconds: float) -> int:
+        """
+        끝난 지 오래된 작업 삭제
+
+        Returns:
+            삭제된 작업 수
+        """
+        with self._lock:
+            cursor = self._connect().execute(
+                "DELETE FROM jobs WHERE status IN ('succeeded', 'failed') AND updated_at < ?",
+                (time.time() - older_than_seconds,)
+            )
+        return cursor.rowcount
+
+    def counts(self) -> Dict[str, int]:
+        """상태별 작업 수"""
+        with self._lock:
+            rows = self._connect().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        counts = dict.fromkeys(JOB_STATUSES, 0)
+        counts.update(rows)
+        return counts
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+class RegistrationJobQueue:
+    """작업 큐와 동시 실행 수가 제한된 백그라운드 워커"""
+
+    def __init__(
+        self,
+        store: RegistrationJobStore = None,
+        concurrency: int = None,
+        poll_interval: float = None,
+        retention_seconds: float = None
+    ):
+        """
+        Args:
+            store: 작업 저장소 (기본값: REGISTER_JOB_* 설정으로 생성)
+            concurrency: 동시에 실행할 최대 작업 수 (프로세스당)
+            poll_interval: 큐가 비었을 때 다시 확인하는 간격 (초, 다른 프로세스가 추가한 작업 확인용)
+            retention_seconds: 끝난 작업을 조회할 수 있게 보관하는 시간 (초)
+        """
+        settings = get_settings()
+        self.store = store or RegistrationJobStore(
+            settings.register_job_database,
+            lease_seconds=settings.register_job_lease_seconds,
+            max_attempts=settings.register_job_max_attempts
+        )
+        self.concurrency = concurrency or settings.register_job_concurrency
+        self.poll_interval = poll_interval or settings.register_job_poll_interval_seconds
+        self.retention_seconds = (
+            retention_seconds if retention_seconds is not None else settings.register_job_retention_seconds
+        )
+        self._workers: List[asyncio.Task] = []
+        self._wakeup: asyncio.Event = None
+        self._last_prune = 0.0
+
+    async def enqueue(self, store_id: str, request: Dict[str, Any]) -> RegistrationJob:
+        """작업을 추가하고 쉬고 있는 워커를 깨움"""
+        job = await asyncio.to_thread(self.store.enqueue, store_id, request)
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return job
+
+    async def get(self, job_id: str) -> Optional[RegistrationJob]:
+        """작업 조회 (없으면 None)"""
+        return await asyncio.to_thread(self.store.get, job_id)
+
+    def start(self, handler: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]) -> None:
+        """
+        현재 이벤트 루프에서 워커 시작
+
+        Args:
+            handler: 저장된 요청을 받아 등록을 수행하고 결과(JSON으로 저장 가능한 dict)를 반환하는 코루틴 함수.
+                     예외가 나면 작업은 실패 처리되고, ServiceNotReadyError면 다시 대기열로 돌아갑니다.
+        """
+        if self._workers:
+            return
+        self._wakeup = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        self._workers = [loop.create_task(self._run(handler)) for _ in range(self.concurrency)]
+
+    async def _idle(self) -> None:
+        """끝난 작업 정리 후 새 작업이 들어오거나 poll_interval이 지날 때까지 대기"""
+        if self.retention_seconds and time.monotonic() - self._last_prune > 60:
+            self._last_prune = time.monotonic()
+            pruned = await asyncio.to_thread(self.store.prune, self.retention_seconds)
+            if pruned:
+                logger.info(f"오래된 등록 작업 {pruned}개 삭제")
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+
+    async def _heartbeat(self, job: RegistrationJob) -> None:
+        """작업이 실행되는 동안 리스를 lease_seconds의 1/3 간격으로 연장"""
+        while True:
+            await asyncio.sleep(self.store.lease_seconds / 3)
+            try:
+                renewed = await asyncio.to_thread(self.store.renew, job)
+            except sqlite3.Error as e:
+                logger.error(f"등록 작업 리스 연장 중 에러 ({job.job_id}): {str(e)}")
+                continue
+            if not renewed:
+                logger.warning(f"등록 작업 {job.job_id}의 리스를 잃었습니다. 이 실행의 결과는 저장되지 않습니다.")
+                return
+
+    async def _run(self, handler) -> None:
+        """워커 루프"""
+        while True:
+            try:
+                job = await asyncio.to_thread(self.store.claim)
+            except sqlite3.Error as e:
+                logger.error(f"등록 작업 조회 중 에러: {str(e)}")
+                job = None
+            if job is None:
+                await self._idle()
+                continue
+
+            heartbeat = asyncio.get_running_loop().create_task(self._heartbeat(job))
+            try:
+                with observe_stage("register_job", "run"):
+                    result = await handler(job.request)
+            except asyncio.CancelledError:
+                # 종료 중이면 다음 실행에서 처음부터 다시 처리
+                self.store.release(job)
+                raise
+            except ServiceNotReadyError:
+                # 모델 로드 전에는 작업을 돌려놓고 잠시 대기
+                await asyncio.to_thread(self.store.release, job)
+                await asyncio.sleep(self.poll_interval)
+                continue
+            except Exception as e:
+                logger.error(f"등록 작업 실패 ({job.job_id}, {job.store_id}): {str(e)}")
+                await asyncio.to_thread(self.store.fail, job, str(e))
+                continue
+            finally:
+                heartbeat.cancel()
+            await asyncio.to_thread(self.store.complete, job, result)
+
+    def stats(self) -> Dict:
+        """워커 설정과 상태별 작업 수"""
+        return {
+            "concurrency": self.concurrency,
+            "running_workers": len(self._workers),
+            "jobs": self.store.counts()
+        }
+
+    async def aclose(self) -> None:
+        """워커 종료 (실행 중이던 작업은 대기열로 돌아감)"""
+        for worker in self._workers:
+            worker.cancel()
+        for worker in self._workers:
+            try:
+                await worker
+            except asyncio.CancelledError:
+                pass
+        self._workers = []
+        self.store.close()
@@ -0,0 +1,175 @@
+"""
+한국어 문장 분리 서비스
+가게 소개글을 규칙 기반으로 문장/절 단위로 분리하고, 비정형 텍스트만 Gemma로 파싱합니다.
+"""
+import logging
+import re
+from typing import List, Tuple
+from config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# 줄 앞의 글머리 기호/번호 ("- ", "• ", "1. ", "2) " 등)
+_BULLET_PATTERN = re.compile(r"^\s*(?:[-•·*▶►✔✓]+|\d{1,2}[.)])\s*")
+
+# 문장 경계: 문장부호 뒤의 공백, 또는 문장부호 없이 끝난 종결어미 뒤의 공백
+_SENTENCE_BOUNDARY_PATTERN = re.compile(
+    r"(?<=[.!?。…])\s+"
+    r"|(?<=[가-힣](?:니다|어요|아요|에요|예요|세요|해요|네요|군요|지요))\s+"
+)
+
+# 절 경계: 쉼표 뒤, 또는 연결어미 뒤의 공백 (긴 문장을 나눌 때만 사용)
+_CLAUSE_BOUNDARY_PATTERN = re.compile(
+    r"(?<=[,，])\s+"
+    r"|(?<=[가-힣](?:하며|이며|으며|지만|는데|으나|하고))\s+"
+)
+
+# 문장 종결 표현 (비정형 여부 판단용)
+_SENTENCE_END_PATTERN = re.compile(r"[.!?。…]|[가-힣](?:니다|어요|아요|에요|예요|세요|해요|네요|군요|지요)(?:\s|$)")
+
+
+class KoreanSentenceSegmenter:
+    """규칙 기반 한국어 문장 분리기"""
+
+    def __init__(self, min_chars: int = None, max_chars: int = None):
+        """
+        Args:
+            min_chars: 이보다 짧은 조각은 이웃 문장과 합침
+            max_chars: 이보다 긴 문장은 절 단위로 나눔
+        """
+        settings = get_settings()
+        self.min_chars = min_chars or settings.segmenter_min_chars
+        self.max_chars = max_chars or settings.segmenter_max_chars
+
+    def split(self, text: str) -> List[str]:
+        """
+        텍스트를 문장 단위로 분리
+
+        Args:
+            text: 가게 소개 텍스트
+
+        Returns:
+            문장 리스트
+        """
+        sentences = []
+        # 줄바꿈은 항상 경계로 취급 (짧은 조각도 줄을 넘어 합치지 않음)
+        for line in text.splitlines():
+            line = _BULLET_PATTERN.sub("", line).strip()
+            if not line:
+                continue
+
+            pieces = []
+            for sentence in _SENTENCE_BOUNDARY_PATTERN.split(line):
+                sentence = sentence.strip()
+                if not sentence:
+                    continue
+                if len(sentence) > self.max_chars:
+                    pieces.extend(self._split_clauses(sentence))
+                else:
+                    pieces.append(sentence)
+            sentences.extend(self._merge_short(pieces))
+
+        return sentences
+
+    def _split_clauses(self, sentence: str) -> List[str]:
+        """긴 문장을 절 경계에서 나눈 뒤 max_chars 이내로 다시 묶음"""
+        clauses = [c.strip() for c in _CLAUSE_BOUNDARY_PATTERN.split(sentence) if c.strip()]
+
+        chunks = []
+        current = ""
+        for clause in clauses:
+            candidate = f"{current} {clause}" if current else clause
+            if current and len(candidate) > self.max_chars:
+                chunks.append(current)
+                current = clause
+            else:
+                current = candidate
+        if current:
+            chunks.append(current)
+
+        return chunks
+
+    def _merge_short(self, sentences: List[str]) -> List[str]:
+        """min_chars보다 짧은 조각을 앞 문장(첫 문장이면 뒤 문장)과 합침"""
+        merged = []
+        for sentence in sentences:
+            if merged and len(sentence) < self.min_chars:
+                merged[-1] = f"{merged[-1]} {sentence}"
+            elif merged and len(merged[-1]) < self.min_chars:
+                merged[-1] = f"{merged[-1]} {sentence}"
+            else:
+                merged.append(sentence)
+        return merged
+
+    def is_unstructured(self, text: str) -> bool:
+        """
+        규칙 기반 분리가 어려운 비정형 텍스트인지 판단
+
+        문장 종결 표현이나 줄바꿈이 거의 없는 긴 텍스트, 또는 분리 후에도
+        지나치게 긴 문장이 남는 경우 비정형으로 판단합니다.
+
+        Args:
+            text: 가게 소개 텍스트
+
+        Returns:
+            비정형 여부
+        """
+        text = text.strip()
+        if len(text) <= self.max_chars:
+            return False
+
+        boundaries = len(_SENTENCE_END_PATTERN.findall(text)) + text.count("\n")
+        if boundaries == 0:
+            return True
+
+        # 경계 하나당 평균 길이가 max_chars의 두 배를 넘으면 문장 구분이 거의 없는 글
+        if len(text) / boundaries > self.max_chars * 2:
+            return True
+
+        return any(len(sentence) > self.max_chars * 2 for sentence in self.split(text))
+
+
+class SentenceParser:
+    """설정된 모드(local / llm / auto)에 따라 가게 소개글을 문장으로 분리"""
+
+    MODES = ("local", "llm", "auto")
+
+    def __init__(self, gemma_service, mode: str = None, segmenter: KoreanSentenceSegmenter = None):
+        """
+        Args:
+            gemma_service: LLM 파싱에 사용할 GemmaService
+            mode: local(규칙 기반만), llm(Gemma만), auto(비정형 텍스트만 Gemma)
+            segmenter: 규칙 기반 분리기
+        """
+        settings = get_settings()
+        self.gemma_service = gemma_service
+        self.mode = mode or settings.sentence_segmentation_mode
+        if self.mode not in self.MODES:
+            raise ValueError(f"지원하지 않는 문장 분리 모드입니다: {self.mode}")
+        self.segmenter = segmenter or KoreanSentenceSegmenter()
+
+    async def parse(self, description: str) -> Tuple[List[str], str]:
+        """
+        가게 소개글을 문장으로 분리
+
+        auto 모드에서 Gemma 호출이 실패하면 규칙 기반 결과를 사용합니다.
+
+        Args:
+            description: 가게 소개 텍스트
+
+        Returns:
+            (문장 리스트, 실제 사용된 모드 "local" 또는 "llm")
+        """
+        use_llm = self.mode == "llm" or (
+            self.mode == "auto" and self.segmenter.is_unstructured(description)
+        )
+
+        if use_llm:
+            try:
+                return await self.gemma_service.parse_text_to_sentences(description), "llm"
+            except Exception as e:
+                if self.mode == "llm":
+                    raise
+                logger.warning(f"Gemma 문장 파싱 실패, 규칙 기반 분리 사용: {str(e)}")
+
+        return self.segmenter.split(description), "local"
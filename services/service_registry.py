@@ -0,0 +1,150 @@
+"""
+서비스 레지스트리
+무거운 모델/클라이언트를 앱 시작 시 병렬로 로드하고 워밍업하며, 구성 요소별 상태를 관리합니다.
+"""
+import asyncio
+import inspect
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceNotReadyError(Exception):
+    """구성 요소가 아직 로드되지 않았거나 로드에 실패한 경우"""
+
+    def __init__(self, name: str, status: str):
+        super().__init__(f"'{name}' 구성 요소가 준비되지 않았습니다. (상태: {status})")
+        self.name = name
+        self.status = status
+
+
+@dataclass
+class ComponentState:
+    """구성 요소 로드 상태"""
+    status: str = "pending"  # pending | loading | ready | failed
+    load_seconds: Optional[float] = None
+    warmup_seconds: Optional[float] = None
+    error: Optional[str] = None
+    warmup_error: Optional[str] = None
+
+
+@dataclass
+class _Component:
+    loader: Callable[[], Any]
+    warmup: Optional[Callable[[Any], Any]]
+    closer: Optional[Callable[[Any], Any]]
+    state: ComponentState
+    instance: Any = None
+
+
+class ServiceRegistry:
+    """구성 요소 등록, 병렬 로드, 상태 조회, 종료"""
+
+    def __init__(self):
+        self._components: Dict[str, _Component] = {}
+
+    def register(
+        self,
+        name: str,
+        loader: Callable[[], Any],
+        warmup: Callable[[Any], Any] = None,
+        closer: Callable[[Any], Any] = None
+    ) -> None:
+        """
+        구성 요소 등록
+
+        Args:
+            name: 구성 요소 이름
+            loader: 인스턴스를 생성하는 함수 (워커 스레드에서 실행)
+            warmup: 생성된 인스턴스로 첫 추론을 수행하는 함수 (코루틴 함수 가능).
+                    워밍업 실패는 기록만 하고 구성 요소는 사용 가능 상태로 둡니다.
+            closer: 종료 시 호출할 함수 (코루틴 함수 가능)
+        """
+        self._components[name] = _Component(
+            loader=loader,
+            warmup=warmup,
+            closer=closer,
+            state=ComponentState()
+        )
+
+    async def _load(self, name: str, component: _Component) -> None:
+        state = component.state
+        state.status = "loading"
+        started = time.perf_counter()
+        try:
+            component.instance = await asyncio.to_thread(component.loader)
+        except Exception as e:
+            state.status = "failed"
+            state.error = str(e)
+            logger.error(f"'{name}' 로드 실패: {str(e)}")
+            return
+        state.load_seconds = time.perf_counter() - started
+
+        if component.warmup is not None:
+            started = time.perf_counter()
+            try:
+                await _call(component.warmup, component.instance)
+            except Exception as e:
+                state.warmup_error = str(e)
+                logger.warning(f"'{name}' 워밍업 실패: {str(e)}")
+            state.warmup_seconds = time.perf_counter() - started
+
+        state.status = "ready"
+        logger.info(
+            f"'{name}' 준비 완료 - 로드 {state.load_seconds:.2f}초, "
+            f"워밍업 {state.warmup_seconds or 0:.2f}초"
+        )
+
+    async def load_all(self) -> None:
+        """등록된 구성 요소를 모두 병렬로 로드"""
+        await asyncio.gather(*(
+            self._load(name, component)
+            for name, component in self._components.items()
+            if component.state.status == "pending"
+        ))
+
+    def get(self, name: str) -> Any:
+        """
+        준비된 구성 요소 인스턴스 반환
+
+        Raises:
+            ServiceNotReadyError: 아직 준비되지 않은 경우
+        """
+        component = self._components[name]
+        if component.state.status != "ready":
+            raise ServiceNotReadyError(name, component.state.status)
+        return component.instance
+
+    def get_if_loaded(self, name: str) -> Any:
+        """로드된 인스턴스 반환 (없으면 None)"""
+        component = self._components.get(name)
+        return component.instance if component else None
+
+    @property
+    def ready(self) -> bool:
+        """모든 구성 요소가 준비되었는지 여부"""
+        return all(c.state.status == "ready" for c in self._components.values())
+
+    def status(self) -> Dict[str, Dict]:
+        """구성 요소별 상태 반환"""
+        return {name: vars(component.state).copy() for name, component in self._components.items()}
+
+    async def close_all(self) -> None:
+        """로드된 구성 요소 종료"""
+        for name, component in self._components.items():
+            if component.instance is None or component.closer is None:
+                continue
+            try:
+                await _call(component.closer, component.instance)
+            except Exception as e:
+                logger.error(f"'{name}' 종료 중 에러: {str(e)}")
+
+
+async def _call(fn: Callable[[Any], Any], instance: Any) -> Any:
+    """코루틴 함수는 await, 일반 함수는 워커 스레드에서 실행"""
+    if inspect.iscoroutinefunction(fn):
+        return await fn(instance)
+    return await asyncio.to_thread(fn, instance)
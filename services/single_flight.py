@@ -0,0 +1,67 @@
+"""
+같은 키의 동시 작업을 하나로 합치는 single-flight
+먼저 들어온 요청만 작업을 실행하고, 같은 키로 뒤따라온 요청은 그 결과(또는 예외)를 함께 받습니다.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+from .metrics import SINGLE_FLIGHT_COALESCED, SINGLE_FLIGHT_EXECUTIONS
+
+
+class SingleFlight:
+    """이벤트 루프 하나에서 사용하는 비동기 single-flight"""
+
+    def __init__(self, operation: str):
+        """
+        Args:
+            operation: 메트릭 라벨로 쓸 작업 이름 (예: question, ocr)
+        """
+        self.operation = operation
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        key로 진행 중인 작업이 있으면 그 결과를 기다리고, 없으면 fn()을 실행
+
+        작업은 별도 Task로 실행되므로 먼저 요청한 클라이언트가 연결을 끊어도
+        함께 기다리는 요청은 영향을 받지 않습니다.
+
+        Args:
+            key: 작업 키
+            fn: 코루틴을 반환하는 함수
+
+        Returns:
+            fn()의 결과
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            self.executions += 1
+            SINGLE_FLIGHT_EXECUTIONS.labels(self.operation).inc()
+            task.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            self.coalesced += 1
+            SINGLE_FLIGHT_COALESCED.labels(self.operation).inc()
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # 기다리던 요청이 모두 취소된 경우 "exception was never retrieved" 경고 방지
+        if not task.cancelled():
+            task.exception()
+
+    @property
+    def in_flight(self) -> int:
+        """진행 중인 작업 수"""
+        return len(self._calls)
+
+    def stats(self) -> Dict:
+        """실행/합쳐진 요청 통계"""
+        return {
+            "in_flight": len(self._calls),
+            "executions": self.executions,
+            "coalesced": self.coalesced
+        }
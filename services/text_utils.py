@@ -0,0 +1,43 @@
+"""
+텍스트 정규화 유틸리티
+"""
+import re
+import unicodedata
+
+_PUNCTUATION_PATTERN = re.compile(r"[^\w\s]")
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """
+    캐시 키 등에 사용할 텍스트 정규화
+
+    유니코드 NFC 정규화 후 문장부호를 제거하고, 공백을 하나로 합치고, 소문자로 변환합니다.
+    예: " 영업시간이  어떻게 되나요? " -> "영업시간이 어떻게 되나요"
+
+    Args:
+        text: 원본 텍스트
+
+    Returns:
+        정규화된 텍스트
+    """
+    text = unicodedata.normalize("NFC", text)
+    text = _PUNCTUATION_PATTERN.sub(" ", text)
+    text = _WHITESPACE_PATTERN.sub(" ", text)
+    return text.strip().lower()
+
+
+def normalize_sentence(sentence: str) -> str:
+    """
+    문서 ID 생성에 사용할 문장 정규화
+
+    문장부호는 의미를 바꿀 수 있으므로 유지하고, 유니코드 NFC 정규화와 공백 정리만 수행합니다.
+
+    Args:
+        sentence: 원본 문장
+
+    Returns:
+        정규화된 문장
+    """
+    sentence = unicodedata.normalize("NFC", sentence)
+    return _WHITESPACE_PATTERN.sub(" ", sentence).strip()
@@ -0,0 +1,147 @@
+"""
+벡터 저장소 백엔드 인터페이스
+VectorDBService는 문서 ID 계산, 변경분 계산, 변경 알림, 스냅샷 디렉토리 관리를 맡고
+실제 저장/검색은 설정(VECTOR_STORE_BACKEND)으로 선택한 백엔드에 위임합니다.
+"""
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set
+from config import get_settings
+
+# 지원하는 벡터 저장소 백엔드
+VECTOR_STORE_BACKENDS = ("chroma", "numpy")
+
+
+@dataclass
+class StoreDocumentDiff:
+    """가게 문서 재등록 시 변경분"""
+    store_id: str
+    added: Dict[str, str] = field(default_factory=dict)  # 문서 ID -> 문장
+    kept: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added or self.removed)
+
+
+def empty_query_result() -> Dict[str, Any]:
+    """검색 결과가 없을 때의 ChromaDB 형식 결과"""
+    return {"ids": [[]], "documents": [[]], "metadatas": [[]], "distances": [[]], "embeddings": [[]]}
+
+
+class VectorStoreBackend(ABC):
+    """
+    벡터 저장소 백엔드
+
+    모든 메서드는 VectorDBService의 쓰기 잠금 아래에서 쓰기가 직렬화된다고 가정합니다.
+    검색은 쓰기와 동시에 호출될 수 있습니다.
+    """
+
+    name: str = ""
+    # 스냅샷 디렉토리에 반드시 있어야 하는 파일 (복원 전 검증용)
+    marker_filename: str = ""
+
+    def __init__(self, persist_directory: str, persistent: bool = True):
+        """
+        Args:
+            persist_directory: 데이터 디렉토리
+            persistent: False면 메모리에만 저장 (스냅샷/복원/압축 불가)
+        """
+        self.persist_directory = persist_directory
+        self.persistent = persistent
+
+    @abstractmethod
+    def open(self) -> None:
+        """저장소 열기 (기존 데이터가 있으면 그대로 로드)"""
+
+    @abstractmethod
+    def close(self) -> None:
+        """저장소 닫기 (파일 핸들 해제)"""
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Optional[int]]:
+        """
+        Returns:
+            {"stores": int | None, "vectors": int} (가게 수를 싸게 셀 수 없는 백엔드는 None)
+        """
+
+    @abstractmethod
+    def existing_ids(self, store_ids: List[str]) -> Dict[str, Set[str]]:
+        """
+        가게별로 저장된 문서 ID
+
+        Returns:
+            {store_id: 문서 ID 집합} (저장된 문서가 없는 가게는 빈 집합)
+        """
+
+    @abstractmethod
+    def apply(self, diffs: List[StoreDocumentDiff], embeddings: Dict[str, List[float]]) -> None:
+        """
+        변경분 반영 (removed 삭제, added 추가)
+
+        Args:
+            diffs: 가게별 변경분
+            embeddings: {문서 ID: 임베딩 벡터} (추가되는 문서만 필요)
+        """
+
+    @abstractmethod
+    def delete_store(self, store_id: str) -> None:
+        """가게의 모든 문서 삭제"""
+
+    @abstractmethod
+    def query(
+        self,
+        store_id: str,
+        query_embeddings: List[List[float]],
+        n_results: int,
+        include_embeddings: bool = False
+    ) -> Dict[str, Any]:
+        """
+        가게 문서 중 질문과 가까운 문서 검색
+
+        Args:
+            include_embeddings: 결과에 문서 임베딩("embeddings")도 포함할지 여부
+
+        Returns:
+            ChromaDB query 형식 {"ids", "documents", "metadatas", "distances"} (질문마다 리스트 하나, 코사인 거리)
+        """
+
+    @abstractmethod
+    def snapshot(self, target: str) -> None:
+        """현재 데이터를 target 디렉토리에 일관된 상태로 복사"""
+
+    @abstractmethod
+    def compact(self) -> None:
+        """삭제/재등록으로 생긴 빈 공간 회수"""
+
+
+def create_vector_store(backend: str = None) -> VectorStoreBackend:
+    """
+    설정에 맞는 벡터 저장소 백엔드 생성 (열지는 않음)
+
+    Args:
+        backend: chroma | numpy (기본값: VECTOR_STORE_BACKEND 설정)
+
+    Returns:
+        VectorStoreBackend
+    """
+    settings = get_settings()
+    backend = backend or settings.vector_store_backend
+    if backend not in VECTOR_STORE_BACKENDS:
+        raise ValueError(f"지원하지 않는 벡터 저장소 백엔드입니다: {backend}")
+
+    if backend == "numpy":
+        from .numpy_store import NumpyVectorStore
+        return NumpyVectorStore(
+            persist_directory=settings.numpy_store_directory,
+            dtype=settings.numpy_store_dtype,
+            max_open_stores=settings.numpy_store_max_open_stores
+        )
+
+    from .chroma_store import ChromaVectorStore
+    return ChromaVectorStore(
+        persist_directory=settings.chroma_persist_directory,
+        collection_name=settings.chroma_collection_name,
+        persistent=settings.chroma_mode == "persistent"
+    )
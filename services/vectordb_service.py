@@ -1,56 +1,207 @@
 """
-ChromaDB 서비스
+벡터 DB 서비스
+문서 ID/변경분 계산과 변경 알림, 스냅샷 관리를 맡고 저장/검색은 벡터 저장소 백엔드(chroma | numpy)에 위임합니다.
 """
-import chromadb
-from chromadb.config import Settings as ChromaSettings
-from typing import List, Dict, Any
+import hashlib
+import logging
+import os
+import re
+import shutil
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
 from config import get_settings
+from .metrics import observe_stage
+from .text_utils import normalize_sentence
+from .vector_store import StoreDocumentDiff, VectorStoreBackend, create_vector_store
+
+logger = logging.getLogger(__name__)
+
+_SNAPSHOT_NAME_PATTERN = re.compile(r"^[A-Za-z0-9_\-]+$")
+
+
+class VectorDBAdminError(Exception):
+    """스냅샷/복원/압축 요청을 처리할 수 없는 경우"""
 
 
 class VectorDBService:
-    """ChromaDB 벡터 데이터베이스 서비스"""
+    """벡터 데이터베이스 서비스"""
     
-    def __init__(self):
+    def __init__(self, backend: VectorStoreBackend = None):
+        """
+        Args:
+            backend: 벡터 저장소 백엔드 (기본값: VECTOR_STORE_BACKEND 설정으로 생성)
+        """
         settings = get_settings()
+        self.backend = backend or create_vector_store()
+        self.persistent = self.backend.persistent
+        self.persist_directory = self.backend.persist_directory
+        self.snapshot_directory = settings.chroma_snapshot_directory
         
-        # ChromaDB 클라이언트 초기화
-        self.client = chromadb.Client(ChromaSettings(
-            persist_directory=settings.chroma_persist_directory,
-            anonymized_telemetry=False
-        ))
+        # 쓰기와 스냅샷/복원/압축을 직렬화
+        self._write_lock = threading.RLock()
         
-        # 컬렉션 생성 또는 가져오기
-        self.collection = self.client.get_or_create_collection(
-            name=settings.chroma_collection_name
+        # 가게 문서 변경 시 호출할 리스너 (예: 답변 캐시 무효화)
+        self._change_listeners: List[Callable[[Optional[str]], None]] = []
+        
+        started = time.perf_counter()
+        self.backend.open()
+        stats = self.stats()
+        logger.info(
+            f"벡터 DB 로드 완료 - 백엔드: {self.backend.name}, 영속: {self.persistent}, "
+            f"가게: {stats['stores'] if stats['stores'] is not None else '-'}개, 벡터: {stats['vectors']}개, "
+            f"소요 시간: {time.perf_counter() - started:.2f}초"
         )
     
+    def stats(self) -> Dict[str, Optional[int]]:
+        """
+        저장된 가게 수와 벡터 수
+        
+        Returns:
+            {"stores": int | None, "vectors": int} (chroma 백엔드는 가게 수를 세지 않아 None)
+        """
+        return self.backend.stats()
+    
+    def add_change_listener(self, listener: Callable[[Optional[str]], None]) -> None:
+        """
+        가게 문서가 변경될 때 호출될 리스너 등록
+        
+        Args:
+            listener: store_id를 인자로 받는 함수 (None이면 전체 변경)
+        """
+        self._change_listeners.append(listener)
+    
+    def _notify_change(self, store_id: Optional[str]) -> None:
+        """변경 리스너 호출"""
+        for listener in self._change_listeners:
+            try:
+                listener(store_id)
+            except Exception as e:
+                logger.error(f"변경 리스너 실행 중 에러: {str(e)}")
+    
+    @staticmethod
+    def sentence_id(store_id: str, sentence: str) -> str:
+        """
+        문장 내용 기반 문서 ID 생성 (같은 문장은 항상 같은 ID)
+        
+        Args:
+            store_id: 가게 ID
+            sentence: 문장
+            
+        Returns:
+            "{store_id}_{정규화된 문장의 SHA-1 앞 16자리}"
+        """
+        digest = hashlib.sha1(normalize_sentence(sentence).encode("utf-8")).hexdigest()[:16]
+        return f"{store_id}_{digest}"
+    
+    def plan_update(self, store_id: str, documents: List[str]) -> StoreDocumentDiff:
+        """
+        가게 문서 재등록 시 추가/유지/삭제할 문서 계산
+        
+        Args:
+            store_id: 가게 ID
+            documents: 새 문서 리스트
+            
+        Returns:
+            StoreDocumentDiff
+        """
+        return self.plan_updates({store_id: documents})[store_id]
+    
+    def plan_updates(self, store_documents: Dict[str, List[str]]) -> Dict[str, StoreDocumentDiff]:
+        """
+        여러 가게의 문서 변경분을 한 번의 조회로 계산
+        
+        Args:
+            store_documents: {store_id: 새 문서 리스트}
+            
+        Returns:
+            {store_id: StoreDocumentDiff}
+        """
+        if not store_documents:
+            return {}
+        
+        with observe_stage("vectordb", "plan"):
+            existing_ids = self.backend.existing_ids(list(store_documents.keys()))
+        
+        diffs = {}
+        for store_id, documents in store_documents.items():
+            # 새 문서를 내용 기반 ID로 변환 (중복 문장은 첫 번째만 사용)
+            new_documents: Dict[str, str] = {}
+            for document in documents:
+                new_documents.setdefault(self.sentence_id(store_id, document), document)
+            
+            current = existing_ids[store_id]
+            diffs[store_id] = StoreDocumentDiff(
+                store_id=store_id,
+                added={doc_id: doc for doc_id, doc in new_documents.items() if doc_id not in current},
+                kept=[doc_id for doc_id in new_documents if doc_id in current],
+                removed=[doc_id for doc_id in current if doc_id not in new_documents]
+            )
+        
+        return diffs
+    
+    def _rebase(self, diffs: List[StoreDocumentDiff]) -> None:
+        """
+        쓰기 잠금 아래에서 현재 저장된 ID 기준으로 변경분을 다시 맞춤 (diffs를 직접 수정)
+        
+        plan 이후 다른 요청(다른 프로세스 포함)이 같은 가게를 바꿨어도, 반영 후 가게 문서가
+        이 요청의 문서(added + kept)와 정확히 같아지도록 removed와 added를 다시 계산합니다.
+        """
+        current_ids = self.backend.existing_ids([diff.store_id for diff in diffs])
+        for diff in diffs:
+            current = current_ids[diff.store_id]
+            wanted = set(diff.added) | set(diff.kept)
+            diff.removed = [doc_id for doc_id in current if doc_id not in wanted]
+            for doc_id in [doc_id for doc_id in diff.added if doc_id in current]:
+                del diff.added[doc_id]
+                diff.kept.append(doc_id)
+            missing = [doc_id for doc_id in diff.kept if doc_id not in current]
+            if missing:
+                # 임베딩이 없어 다시 추가할 수 없음 (다음 재등록 때 반영됨)
+                logger.warning(f"가게 {diff.store_id}: 계산 이후 다른 요청이 삭제한 문서 {len(missing)}개는 반영되지 않습니다.")
+                diff.kept = [doc_id for doc_id in diff.kept if doc_id in current]
+    
+    def apply_updates(self, diffs: List[StoreDocumentDiff], embeddings: Dict[str, List[float]]) -> None:
+        """
+        계산된 변경분을 한 번의 삭제와 한 번의 추가로 반영
+        
+        반영 직전에 쓰기 잠금 아래에서 변경분을 현재 상태 기준으로 다시 맞추므로,
+        같은 가게를 동시에 등록해도 두 요청의 문장이 합쳐지지 않고 마지막 반영이 이깁니다.
+        
+        Args:
+            diffs: plan_update(s) 결과 (현재 상태 기준으로 수정됨)
+            embeddings: {문서 ID: 임베딩 벡터} (추가되는 문서만 필요)
+        """
+        with observe_stage("vectordb", "write"), self._write_lock:
+            self._rebase(diffs)
+            self.backend.apply(diffs, embeddings)
+        
+        for diff in diffs:
+            if diff.changed:
+                self._notify_change(diff.store_id)
+    
     def add_documents(
         self,
         store_id: str,
         documents: List[str],
         embeddings: List[List[float]]
-    ) -> None:
+    ) -> StoreDocumentDiff:
         """
-        문서를 벡터 DB에 추가
+        문서를 벡터 DB에 저장 (기존 문서 중 없어진 것은 삭제)
         
         Args:
             store_id: 가게 ID
             documents: 문서 리스트
             embeddings: 임베딩 벡터 리스트
+            
+        Returns:
+            반영된 StoreDocumentDiff
         """
-        # 기존 데이터 삭제
-        self.delete_store_documents(store_id)
-        
-        # 새로운 데이터 추가
-        ids = [f"{store_id}_sent_{i}" for i in range(len(documents))]
-        metadatas = [{"store_id": store_id} for _ in documents]
-        
-        self.collection.add(
-            embeddings=embeddings,
-            documents=documents,
-            metadatas=metadatas,
-            ids=ids
-        )
+        diff = self.plan_update(store_id, documents)
+        vectors = {self.sentence_id(store_id, doc): emb for doc, emb in zip(documents, embeddings)}
+        self.apply_updates([diff], vectors)
+        return diff
     
     def delete_store_documents(self, store_id: str) -> None:
         """
@@ -60,17 +211,19 @@ class VectorDBService:
             store_id: 가게 ID
         """
         try:
-            existing = self.collection.get(where={"store_id": store_id})
-            if existing['ids']:
-                self.collection.delete(ids=existing['ids'])
+            with self._write_lock:
+                self.backend.delete_store(store_id)
         except Exception:
             pass
+        finally:
+            self._notify_change(store_id)
     
     def search_similar(
         self,
         store_id: str,
         query_embedding: List[List[float]],
-        n_results: int = 5
+        n_results: int = 5,
+        include_embeddings: bool = False
     ) -> Dict[str, Any]:
         """
         유사한 문서 검색
@@ -79,14 +232,144 @@ class VectorDBService:
             store_id: 가게 ID
             query_embedding: 질문 임베딩
             n_results: 반환할 결과 개수
+            include_embeddings: 결과에 문서 임베딩도 포함할지 여부 (중복 문장 제거용)
+            
+        Returns:
+            ChromaDB query 형식의 검색 결과 (코사인 거리)
+        """
+        with observe_stage("vectordb", "search"):
+            return self.backend.query(store_id, query_embedding, n_results, include_embeddings=include_embeddings)
+    
+    # ------------------------------------------------------------------
+    # 스냅샷 / 복원 / 압축 (영속 모드 전용)
+    # ------------------------------------------------------------------
+    
+    def _require_persistent(self) -> None:
+        if not self.persistent:
+            raise VectorDBAdminError("영속 모드에서만 사용할 수 있습니다. (CHROMA_MODE=memory)")
+    
+    def _snapshot_path(self, name: str) -> str:
+        if not _SNAPSHOT_NAME_PATTERN.match(name):
+            raise VectorDBAdminError(f"잘못된 스냅샷 이름입니다: {name}")
+        return os.path.join(self.snapshot_directory, name)
+    
+    @staticmethod
+    def _directory_size(path: str) -> int:
+        total = 0
+        for root, _, files in os.walk(path):
+            for filename in files:
+                total += os.path.getsize(os.path.join(root, filename))
+        return total
+    
+    def list_snapshots(self) -> List[Dict[str, Any]]:
+        """
+        저장된 스냅샷 목록
+        
+        Returns:
+            [{"name": str, "size_bytes": int, "created_at": str}]
+        """
+        if not os.path.isdir(self.snapshot_directory):
+            return []
+        
+        snapshots = []
+        for name in sorted(os.listdir(self.snapshot_directory)):
+            path = os.path.join(self.snapshot_directory, name)
+            if os.path.isdir(path):
+                snapshots.append({
+                    "name": name,
+                    "size_bytes": self._directory_size(path),
+                    "created_at": datetime.fromtimestamp(os.path.getmtime(path)).isoformat()
+                })
+        return snapshots
+    
+    def create_snapshot(self, name: str = None) -> Dict[str, Any]:
+        """
+        현재 벡터 DB의 스냅샷 생성
+        
+        쓰기를 잠시 막은 상태에서 백엔드가 SQLite는 온라인 백업 API로, 나머지 파일은 복사로 저장합니다.
+        
+        Args:
+            name: 스냅샷 이름 (기본값: 현재 시각)
             
         Returns:
-            검색 결과
+            {"name": str, "size_bytes": int, "created_at": str}
         """
-        results = self.collection.query(
-            query_embeddings=query_embedding,
-            where={"store_id": store_id},
-            n_results=n_results
+        self._require_persistent()
+        name = name or datetime.now().strftime("%Y%m%d-%H%M%S")
+        target = self._snapshot_path(name)
+        if os.path.exists(target):
+            raise VectorDBAdminError(f"이미 존재하는 스냅샷입니다: {name}")
+        
+        started = time.perf_counter()
+        with self._write_lock:
+            self.backend.snapshot(target)
+        
+        logger.info(f"벡터 DB 스냅샷 생성 - {name}, 소요 시간: {time.perf_counter() - started:.2f}초")
+        return {
+            "name": name,
+            "size_bytes": self._directory_size(target),
+            "created_at": datetime.now().isoformat()
+        }
+    
+    def restore_snapshot(self, name: str) -> Dict[str, int]:
+        """
+        스냅샷으로 벡터 DB 복원
+        
+        기존 데이터는 "{persist_directory}.before-restore-{시각}"으로 옮겨 둡니다.
+        복원하는 동안 들어온 검색 요청은 실패할 수 있습니다.
+        
+        Args:
+            name: 스냅샷 이름
+            
+        Returns:
+            복원 후 {"stores": int | None, "vectors": int}
+        """
+        self._require_persistent()
+        source = self._snapshot_path(name)
+        if not os.path.isdir(source):
+            raise VectorDBAdminError(f"스냅샷을 찾을 수 없습니다: {name}")
+        if not os.path.exists(os.path.join(source, self.backend.marker_filename)):
+            raise VectorDBAdminError(f"현재 백엔드({self.backend.name})의 스냅샷이 아닙니다: {name}")
+        
+        started = time.perf_counter()
+        with self._write_lock:
+            self.backend.close()
+            backup = f"{self.persist_directory.rstrip(os.sep)}.before-restore-{datetime.now():%Y%m%d-%H%M%S}"
+            try:
+                os.rename(self.persist_directory, backup)
+                shutil.copytree(source, self.persist_directory)
+            finally:
+                self.backend.open()
+        
+        self._notify_change(None)
+        stats = self.stats()
+        logger.info(
+            f"벡터 DB 스냅샷 복원 - {name}, 가게: {stats['stores'] if stats['stores'] is not None else '-'}개, 벡터: {stats['vectors']}개, "
+            f"소요 시간: {time.perf_counter() - started:.2f}초 (이전 데이터: {backup})"
         )
+        return stats
+    
+    def compact(self) -> Dict[str, int]:
+        """
+        벡터 DB 온라인 압축
         
-        return results
+        쓰기를 잠시 막고 삭제/재등록으로 생긴 빈 공간을 회수합니다.
+        (chroma: SQLite VACUUM, numpy: 참조되지 않는 행렬 파일 삭제 + 인덱스 VACUUM)
+        검색은 계속 처리됩니다.
+        
+        Returns:
+            {"size_before": int, "size_after": int}
+        """
+        self._require_persistent()
+        size_before = self._directory_size(self.persist_directory)
+        
+        started = time.perf_counter()
+        with self._write_lock:
+            self.backend.compact()
+        
+        size_after = self._directory_size(self.persist_directory)
+        logger.info(
+            f"벡터 DB 압축 - {size_before} -> {size_after} bytes, "
+            f"소요 시간: {time.perf_counter() - started:.2f}초"
+        )
+        return {"size_before": size_before, "size_after": size_after}
@@ -0,0 +1,113 @@
+"""
+테스트 공통 설정
+.env 없이도 Settings를 만들 수 있도록 필수 환경 변수에 기본값을 넣습니다 (실제 서비스에는 연결하지 않음).
+/store 라우터 테스트는 store_api 픽스처로 모델/Gemma 없이 실행합니다.
+"""
+import os
+import zlib
+from types import SimpleNamespace
+from typing import List
+import numpy as np
+import pytest
+
+for name, value in {
+    "GEMMA_API": "http://localhost:0",
+    "GEMMA_MODEL": "test",
+    "EMBEDDING_MODEL_NAME": "test",
+    "CHROMA_PERSIST_DIRECTORY": "./chroma_db",
+    "CHROMA_COLLECTION_NAME": "test",
+    "API_HOST": "127.0.0.1",
+    "API_PORT": "8000",
+}.items():
+    os.environ.setdefault(name, value)
+
+EMBEDDING_DIM = 64
+
+
+class FakeEmbeddingService:
+    """글자 해시 기반 결정적 임베딩 (같은 글자를 많이 공유할수록 가까움)"""
+
+    def __init__(self):
+        self.encoded: List[List[str]] = []
+
+    def encode(self, texts: List[str], batch_size: int = None) -> np.ndarray:
+        self.encoded.append(list(texts))
+        vectors = np.zeros((len(texts), EMBEDDING_DIM), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for char in text.replace(" ", ""):
+                vectors[row, zlib.crc32(char.encode("utf-8")) % EMBEDDING_DIM] += 1.0
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def get_cached_query(self, text: str):
+        return None
+
+    def cache_query(self, text: str, embedding) -> None:
+        pass
+
+    def cache_stats(self) -> dict:
+        return {}
+
+
+class FakeGemmaService:
+    """정해진 답변을 돌려주는 GemmaService 대역"""
+
+    def __init__(self, tokens: List[str] = None):
+        self.tokens = tokens or ["영업시간은 ", "10시부터입니다."]
+        self.calls: List[str] = []
+        self.stream_error: Exception = None
+
+    async def generate_answer(self, context: str, question: str, stats: dict = None) -> str:
+        self.calls.append(question)
+        return "".join(self.tokens)
+
+    async def stream_answer(self, context: str, question: str, stats: dict = None):
+        self.calls.append(question)
+        for token in self.tokens:
+            yield token
+        if self.stream_error is not None:
+            raise self.stream_error
+
+    async def parse_text_to_sentences(self, description: str) -> List[str]:
+        return [line.strip() for line in description.splitlines() if line.strip()]
+
+
+@pytest.fixture
+def store_api(tmp_path, monkeypatch):
+    """
+    가짜 임베딩/Gemma와 임시 디렉토리의 NumPy 벡터 저장소로 구성한 /store 라우터
+
+    Returns:
+        client(TestClient), vectordb, embedding, gemma
+    """
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from api import store_routes
+    from services.answer_cache import AnswerCache
+    from services.embedding_batcher import EmbeddingBatcher
+    from services.numpy_store import NumpyVectorStore
+    from services.sentence_segmenter import SentenceParser
+    from services.single_flight import SingleFlight
+    from services.vectordb_service import VectorDBService
+
+    embedding = FakeEmbeddingService()
+    gemma = FakeGemmaService()
+    answer_cache = AnswerCache()
+    vectordb = VectorDBService(backend=NumpyVectorStore(str(tmp_path / "vectordb")))
+    vectordb.add_change_listener(answer_cache.invalidate)
+    batcher = EmbeddingBatcher(embedding, max_batch_size=32, max_wait_ms=0)
+    parser = SentenceParser(gemma, mode="local")
+
+    monkeypatch.setattr(store_routes, "answer_cache", answer_cache)
+    monkeypatch.setattr(store_routes, "question_flight", SingleFlight("question"))
+    monkeypatch.setattr(store_routes, "get_vectordb_service", lambda: vectordb)
+    monkeypatch.setattr(store_routes, "get_embedding_service", lambda: embedding)
+    monkeypatch.setattr(store_routes, "get_embedding_batcher", lambda: batcher)
+    monkeypatch.setattr(store_routes, "get_gemma_service", lambda: gemma)
+    monkeypatch.setattr(store_routes, "get_sentence_parser", lambda: parser)
+
+    app = FastAPI()
+    app.include_router(store_routes.router)
+    with TestClient(app) as client:
+        yield SimpleNamespace(client=client, vectordb=vectordb, embedding=embedding, gemma=gemma)
+    vectordb.backend.close()
@@ -0,0 +1,98 @@
+"""
+관리자 API 토큰 확인과 벡터 DB 스냅샷/복원 테스트 (임시 디렉토리의 NumPy 백엔드 사용)
+"""
+import os
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from api import admin_routes
+from services.numpy_store import NumpyVectorStore
+from services.vectordb_service import VectorDBAdminError, VectorDBService
+
+TOKEN = "secret-token"
+
+
+@pytest.fixture
+def vectordb(tmp_path):
+    service = VectorDBService(backend=NumpyVectorStore(str(tmp_path / "vectordb")))
+    service.snapshot_directory = str(tmp_path / "snapshots")
+    yield service
+    service.backend.close()
+
+
+@pytest.fixture
+def admin_client(vectordb, monkeypatch):
+    monkeypatch.setattr(admin_routes.settings, "admin_token", TOKEN)
+    monkeypatch.setattr(admin_routes, "get_vectordb_service", lambda: vectordb)
+    app = FastAPI()
+    app.include_router(admin_routes.router)
+    with TestClient(app) as client:
+        yield client
+
+
+def register(service: VectorDBService, store_id: str, documents):
+    diff = service.plan_update(store_id, documents)
+    service.apply_updates([diff], {doc_id: [1.0, 0.0, 0.0] for doc_id in diff.added})
+
+
+def test_admin_api_disabled_without_token(admin_client, monkeypatch):
+    monkeypatch.setattr(admin_routes.settings, "admin_token", "")
+
+    response = admin_client.get("/admin/vectordb", headers={"X-Admin-Token": ""})
+
+    assert response.status_code == 403
+
+
+def test_admin_api_rejects_wrong_token(admin_client):
+    assert admin_client.get("/admin/vectordb").status_code == 401
+    assert admin_client.get("/admin/vectordb", headers={"X-Admin-Token": "wrong"}).status_code == 401
+
+
+def test_admin_api_accepts_token(admin_client, vectordb):
+    register(vectordb, "cafe", ["라떼", "케이크"])
+
+    response = admin_client.get("/admin/vectordb", headers={"X-Admin-Token": TOKEN})
+
+    assert response.status_code == 200
+    assert response.json() == {"stores": 1, "vectors": 2}
+
+
+def test_snapshot_and_restore_round_trip(admin_client, vectordb):
+    headers = {"X-Admin-Token": TOKEN}
+    register(vectordb, "cafe", ["라떼", "케이크"])
+
+    response = admin_client.post("/admin/snapshots", json={"name": "before"}, headers=headers)
+    assert response.status_code == 200
+    assert [snapshot["name"] for snapshot in admin_client.get("/admin/snapshots", headers=headers).json()] == ["before"]
+
+    register(vectordb, "cafe", ["아메리카노"])
+    register(vectordb, "bakery", ["소금빵"])
+    assert vectordb.stats() == {"stores": 2, "vectors": 2}
+
+    response = admin_client.post("/admin/snapshots/restore", json={"name": "before"}, headers=headers)
+
+    assert response.status_code == 200
+    assert response.json() == {"stores": 1, "vectors": 2}
+    assert vectordb.backend.existing_ids(["cafe"])["cafe"] == {
+        VectorDBService.sentence_id("cafe", "라떼"),
+        VectorDBService.sentence_id("cafe", "케이크")
+    }
+    # 이전 데이터는 옆 디렉토리로 옮겨 둠
+    parent = os.path.dirname(vectordb.persist_directory)
+    assert any(name.startswith("vectordb.before-restore-") for name in os.listdir(parent))
+
+
+def test_snapshot_rejects_duplicate_or_invalid_names(admin_client):
+    headers = {"X-Admin-Token": TOKEN}
+    assert admin_client.post("/admin/snapshots", json={"name": "s1"}, headers=headers).status_code == 200
+
+    assert admin_client.post("/admin/snapshots", json={"name": "s1"}, headers=headers).status_code == 400
+    assert admin_client.post("/admin/snapshots", json={"name": "../etc"}, headers=headers).status_code == 400
+    assert admin_client.post("/admin/snapshots/restore", json={"name": "missing"}, headers=headers).status_code == 400
+
+
+def test_restore_requires_snapshot_of_current_backend(vectordb):
+    os.makedirs(os.path.join(vectordb.snapshot_directory, "foreign"))
+
+    with pytest.raises(VectorDBAdminError):
+        vectordb.restore_snapshot("foreign")
@@ -0,0 +1,69 @@
+"""
+AnswerCache 무효화 세대 테스트
+"""
+import numpy as np
+from services.answer_cache import AnswerCache
+
+QUESTION = np.array([1.0, 0.0, 0.0], dtype=np.float32)
+CONTEXT = AnswerCache.make_context_key(["s1_a", "s1_b"])
+
+
+def make_cache() -> AnswerCache:
+    return AnswerCache(similarity_threshold=0.9, max_entries_per_store=8, max_stores=8, ttl_seconds=0)
+
+
+def test_lookup_hits_similar_question_with_same_context():
+    cache = make_cache()
+    cache.store("s1", QUESTION, CONTEXT, "10시에 엽니다", cache.generation("s1"))
+
+    assert cache.lookup("s1", np.array([0.99, 0.05, 0.0]), CONTEXT) == "10시에 엽니다"
+    assert cache.lookup("s1", QUESTION, AnswerCache.make_context_key(["s1_a"])) is None
+    assert cache.lookup("s2", QUESTION, CONTEXT) is None
+
+
+def test_invalidate_store_drops_entries():
+    cache = make_cache()
+    cache.store("s1", QUESTION, CONTEXT, "answer", cache.generation("s1"))
+    cache.store("s2", QUESTION, CONTEXT, "other", cache.generation("s2"))
+
+    cache.invalidate("s1")
+
+    assert cache.lookup("s1", QUESTION, CONTEXT) is None
+    assert cache.lookup("s2", QUESTION, CONTEXT) == "other"
+
+
+def test_store_skipped_when_store_invalidated_during_generation():
+    cache = make_cache()
+    generation = cache.generation("s1")
+
+    # 답변을 만드는 동안 가게 정보가 다시 등록됨
+    cache.invalidate("s1")
+    cache.store("s1", QUESTION, CONTEXT, "stale", generation)
+
+    assert cache.lookup("s1", QUESTION, CONTEXT) is None
+
+    cache.store("s1", QUESTION, CONTEXT, "fresh", cache.generation("s1"))
+    assert cache.lookup("s1", QUESTION, CONTEXT) == "fresh"
+
+
+def test_other_store_invalidation_does_not_block_store():
+    cache = make_cache()
+    generation = cache.generation("s1")
+
+    cache.invalidate("s2")
+    cache.store("s1", QUESTION, CONTEXT, "answer", generation)
+
+    assert cache.lookup("s1", QUESTION, CONTEXT) == "answer"
+
+
+def test_global_invalidation_blocks_pending_stores():
+    cache = make_cache()
+    cache.store("s1", QUESTION, CONTEXT, "answer", cache.generation("s1"))
+    generation = cache.generation("s2")
+
+    cache.invalidate()
+    cache.store("s2", QUESTION, CONTEXT, "stale", generation)
+
+    assert cache.lookup("s1", QUESTION, CONTEXT) is None
+    assert cache.lookup("s2", QUESTION, CONTEXT) is None
+    assert cache.stats()["invalidations"] == 1
@@ -0,0 +1,89 @@
+"""
+LRUCache 제거 정책 테스트 (항목 수, 크기, TTL)
+"""
+import pytest
+from services import cache as cache_module
+from services.cache import LRUCache
+
+
+class FakeClock:
+    """time.monotonic 대체 (테스트에서 시간을 직접 진행)"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(cache_module, "time", clock)
+    return clock
+
+
+def test_evicts_least_recently_used_entry():
+    cache = LRUCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # a를 최근 사용으로
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.evictions == 1
+
+
+def test_overwrite_does_not_evict():
+    cache = LRUCache(max_entries=2, sizeof=len)
+    cache.put("a", "x")
+    cache.put("b", "y")
+    cache.put("a", "zzz")
+
+    assert len(cache) == 2
+    assert cache.current_bytes == 4
+    assert cache.evictions == 0
+
+
+def test_evicts_by_total_bytes():
+    cache = LRUCache(max_entries=100, max_bytes=10, sizeof=len)
+    cache.put("a", "aaaa")
+    cache.put("b", "bbbb")
+    cache.put("c", "cccc")
+
+    assert cache.get("a") is None
+    assert cache.current_bytes == 8
+    assert cache.stats()["evictions"] == 1
+
+
+def test_skips_value_larger_than_max_bytes():
+    cache = LRUCache(max_entries=100, max_bytes=4, sizeof=len)
+    cache.put("a", "aa")
+    cache.put("big", "x" * 5)
+
+    assert cache.get("big") is None
+    assert cache.get("a") == "aa"
+    assert cache.evictions == 0
+
+
+def test_expires_entries_after_ttl(clock):
+    cache = LRUCache(max_entries=10, ttl_seconds=60, sizeof=len)
+    cache.put("a", "aa")
+
+    clock.now += 59
+    assert cache.get("a") == "aa"
+
+    clock.now += 2
+    assert cache.get("a") is None
+    assert len(cache) == 0
+    assert cache.current_bytes == 0
+    assert cache.stats()["misses"] == 1
+
+
+def test_zero_ttl_never_expires(clock):
+    cache = LRUCache(max_entries=10, ttl_seconds=0)
+    cache.put("a", 1)
+    clock.now += 10 ** 9
+    assert cache.get("a") == 1
@@ -0,0 +1,71 @@
+"""
+ContextBuilder 중복 제거 / 토큰 예산 테스트
+"""
+from services.context_builder import ContextBuilder, estimate_tokens
+
+
+def make_builder(**overrides) -> ContextBuilder:
+    options = dict(max_distance=0.6, duplicate_similarity=0.95, token_budget=0, chars_per_token=1.0)
+    options.update(overrides)
+    return ContextBuilder(**options)
+
+
+def test_estimate_tokens_rounds_up():
+    assert estimate_tokens("", 1.5) == 0
+    assert estimate_tokens("가나다", 1.5) == 2
+
+
+def test_drops_near_duplicate_sentences():
+    built = make_builder().build(
+        ids=["a", "b", "c"],
+        documents=["주차 가능합니다", "주차가 가능해요", "10시에 엽니다"],
+        distances=[0.1, 0.12, 0.2],
+        embeddings=[[1.0, 0.0], [0.99, 0.01], [0.0, 1.0]]
+    )
+
+    assert built.document_ids == ["a", "c"]
+    assert built.stats["dropped_duplicate"] == 1
+    assert built.context == "주차 가능합니다\n10시에 엽니다"
+
+
+def test_keeps_all_without_embeddings():
+    built = make_builder().build(
+        ids=["a", "b"],
+        documents=["주차 가능합니다", "주차가 가능해요"],
+        distances=[0.1, 0.12]
+    )
+    assert built.document_ids == ["a", "b"]
+
+
+def test_drops_sentences_beyond_max_distance():
+    built = make_builder().build(
+        ids=["a", "b", "c"],
+        documents=["가", "나", "다"],
+        distances=[0.1, 0.7, 0.8]
+    )
+
+    assert built.document_ids == ["a"]
+    assert built.stats["dropped_distance"] == 2
+
+
+def test_token_budget_skips_long_sentence_but_keeps_shorter_ones():
+    built = make_builder(token_budget=6).build(
+        ids=["a", "b", "c"],
+        documents=["가나다", "가나다라마바", "라마"],
+        distances=[0.1, 0.2, 0.3]
+    )
+
+    assert built.document_ids == ["a", "c"]
+    assert built.stats["dropped_budget"] == 1
+    assert built.stats["context_tokens"] == 5
+
+
+def test_closest_sentence_always_kept():
+    built = make_builder(max_distance=0.1, token_budget=1).build(
+        ids=["a"],
+        documents=["아주 긴 첫 문장입니다"],
+        distances=[0.9]
+    )
+
+    assert built.document_ids == ["a"]
+    assert built.stats["kept"] == 1
@@ -0,0 +1,152 @@
+"""
+EmbeddingBatcher 배치 묶기 / 결과 분배 / 워커 재시작 테스트
+"""
+import asyncio
+import numpy as np
+import pytest
+from services.embedding_batcher import EmbeddingBatcher
+
+
+class RowIndexEmbedding:
+    """행 번호를 값으로 돌려주는 임베딩 (배치 안 위치 확인용)"""
+
+    def __init__(self):
+        self.batches = []
+        self.error: Exception = None
+
+    def encode(self, texts):
+        self.batches.append(list(texts))
+        if self.error is not None:
+            raise self.error
+        return np.asarray([[float(len(text))] for text in texts], dtype=np.float32)
+
+    def get_cached_query(self, text):
+        return None
+
+    def cache_query(self, text, embedding):
+        pass
+
+
+def test_concurrent_requests_share_one_batch_and_get_their_rows():
+    async def scenario():
+        service = RowIndexEmbedding()
+        batcher = EmbeddingBatcher(service, max_batch_size=32, max_wait_ms=50)
+        try:
+            results = await asyncio.gather(
+                batcher.encode(["a"]),
+                batcher.encode(["bb", "ccc"]),
+                batcher.encode(["dddd"])
+            )
+        finally:
+            await batcher.aclose()
+        return service, batcher, results
+
+    service, batcher, results = asyncio.run(scenario())
+
+    assert service.batches == [["a", "bb", "ccc", "dddd"]]
+    assert [r.ravel().tolist() for r in results] == [[1.0], [2.0, 3.0], [4.0]]
+    assert batcher.stats()["batches"] == 1
+    assert batcher.stats()["batch_size_histogram"] == {4: 1}
+
+
+def test_batch_closes_at_max_batch_size():
+    async def scenario():
+        service = RowIndexEmbedding()
+        batcher = EmbeddingBatcher(service, max_batch_size=2, max_wait_ms=50)
+        try:
+            await asyncio.gather(*(batcher.encode([text]) for text in ["a", "b", "c", "d", "e"]))
+        finally:
+            await batcher.aclose()
+        return service
+
+    service = asyncio.run(scenario())
+
+    assert [len(batch) for batch in service.batches] == [2, 2, 1]
+
+
+def test_encode_error_fails_only_that_batch():
+    async def scenario():
+        service = RowIndexEmbedding()
+        batcher = EmbeddingBatcher(service, max_batch_size=32, max_wait_ms=0)
+        try:
+            service.error = RuntimeError("encode 실패")
+            with pytest.raises(RuntimeError):
+                await batcher.encode(["a"])
+            service.error = None
+            worker = batcher._worker
+            result = await batcher.encode(["bb"])
+            return worker is batcher._worker, result
+        finally:
+            await batcher.aclose()
+
+    same_worker, result = asyncio.run(scenario())
+
+    assert same_worker
+    assert result.ravel().tolist() == [2.0]
+
+
+def test_restarted_worker_keeps_queued_requests():
+    async def scenario():
+        service = RowIndexEmbedding()
+        batcher = EmbeddingBatcher(service, max_batch_size=32, max_wait_ms=0)
+        try:
+            await batcher.encode(["warm"])
+            queue = batcher._queue
+
+            # 워커가 멈춘 사이에 큐에 들어간 요청
+            batcher._worker.cancel()
+            await asyncio.sleep(0)
+            orphan = asyncio.get_running_loop().create_future()
+            queue.put_nowait((["abc"], orphan, 0.0))
+
+            result = await batcher.encode(["z"])
+            return batcher._queue is queue, await orphan, result
+        finally:
+            await batcher.aclose()
+
+    same_queue, orphan_result, result = asyncio.run(scenario())
+
+    assert same_queue
+    assert orphan_result.ravel().tolist() == [3.0]
+    assert result.ravel().tolist() == [1.0]
+
+
+def test_aclose_cancels_waiting_requests():
+    async def scenario():
+        service = RowIndexEmbedding()
+        batcher = EmbeddingBatcher(service, max_batch_size=32, max_wait_ms=10_000)
+        task = asyncio.ensure_future(batcher.encode(["a"]))
+        await asyncio.sleep(0.01)
+        await batcher.aclose()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(scenario())
+
+
+def test_encode_single_uses_query_cache():
+    class CachedEmbedding(RowIndexEmbedding):
+        def __init__(self):
+            super().__init__()
+            self.cache = {}
+
+        def get_cached_query(self, text):
+            return self.cache.get(text)
+
+        def cache_query(self, text, embedding):
+            self.cache[text] = embedding
+
+    async def scenario():
+        service = CachedEmbedding()
+        batcher = EmbeddingBatcher(service, max_batch_size=32, max_wait_ms=0)
+        try:
+            first = await batcher.encode_single("질문")
+            second = await batcher.encode_single("질문")
+        finally:
+            await batcher.aclose()
+        return service, first, second
+
+    service, first, second = asyncio.run(scenario())
+
+    assert len(service.batches) == 1
+    assert first.tolist() == second.tolist() == [2.0]
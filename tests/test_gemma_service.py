@@ -0,0 +1,159 @@
+"""
+GemmaService 재시도/백오프와 동시 실행 제한 테스트 (httpx MockTransport 사용)
+"""
+import asyncio
+import json
+import httpx
+import pytest
+from services import gemma_service as gemma_module
+from services.gemma_service import GemmaService
+
+
+def make_service(handler, max_retries: int = 2, max_concurrency: int = 8) -> GemmaService:
+    service = GemmaService()
+    service.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    service.max_retries = max_retries
+    service.retry_backoff = 0.5
+    service._semaphore = asyncio.Semaphore(max_concurrency)
+    return service
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """재시도 대기 시간 기록 (실제로는 기다리지 않음)"""
+    recorded = []
+    real_sleep = asyncio.sleep
+
+    async def fake_sleep(delay):
+        recorded.append(delay)
+        await real_sleep(0)
+
+    monkeypatch.setattr(gemma_module.asyncio, "sleep", fake_sleep)
+    return recorded
+
+
+def test_retries_retryable_status_with_exponential_backoff(sleeps):
+    statuses = [503, 429, 200]
+
+    def handler(request):
+        status = statuses.pop(0)
+        return httpx.Response(status, json={"response": "안녕하세요"} if status == 200 else {})
+
+    async def scenario():
+        service = make_service(handler)
+        try:
+            return await service.generate_answer("가게 정보", "질문")
+        finally:
+            await service.aclose()
+
+    assert asyncio.run(scenario()) == "안녕하세요"
+    assert statuses == []
+    assert sleeps == [0.5, 1.0]
+
+
+def test_retries_transport_errors(sleeps):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            raise httpx.ConnectError("refused", request=request)
+        return httpx.Response(200, json={"response": "1. 첫 문장\n- 둘째 문장\n"})
+
+    async def scenario():
+        service = make_service(handler)
+        try:
+            return await service.parse_text_to_sentences("소개")
+        finally:
+            await service.aclose()
+
+    assert asyncio.run(scenario()) == ["첫 문장", "둘째 문장"]
+    assert len(calls) == 2
+    assert sleeps == [0.5]
+
+
+def test_gives_up_after_max_retries(sleeps):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(503)
+
+    async def scenario():
+        service = make_service(handler, max_retries=2)
+        try:
+            await service.generate_answer("가게 정보", "질문")
+        finally:
+            await service.aclose()
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(scenario())
+    assert len(calls) == 3
+    assert sleeps == [0.5, 1.0]
+
+
+def test_does_not_retry_client_errors(sleeps):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(400)
+
+    async def scenario():
+        service = make_service(handler)
+        try:
+            await service.generate_answer("가게 정보", "질문")
+        finally:
+            await service.aclose()
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(scenario())
+    assert len(calls) == 1
+    assert sleeps == []
+
+
+def test_semaphore_limits_concurrent_requests():
+    state = {"active": 0, "peak": 0}
+
+    async def handler(request):
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        await asyncio.sleep(0.01)
+        state["active"] -= 1
+        return httpx.Response(200, json={"response": "ok"})
+
+    async def scenario():
+        service = make_service(handler, max_concurrency=2)
+        try:
+            return await asyncio.gather(*(service.generate_answer("c", f"q{i}") for i in range(6)))
+        finally:
+            await service.aclose()
+
+    assert asyncio.run(scenario()) == ["ok"] * 6
+    assert state["peak"] == 2
+
+
+def test_stream_answer_yields_tokens_and_records_prompt_stats():
+    lines = [
+        {"response": "안녕", "done": False},
+        {"response": "하세요", "done": False},
+        {"response": "", "done": True, "prompt_eval_count": 12, "prompt_eval_duration": 3_000_000},
+    ]
+
+    def handler(request):
+        body = "\n".join(json.dumps(line) for line in lines) + "\n"
+        return httpx.Response(200, content=body.encode("utf-8"))
+
+    async def scenario():
+        service = make_service(handler)
+        stats = {}
+        try:
+            tokens = [token async for token in service.stream_answer("가게 정보", "질문", stats=stats)]
+        finally:
+            await service.aclose()
+        return tokens, stats
+
+    tokens, stats = asyncio.run(scenario())
+    assert tokens == ["안녕", "하세요"]
+    assert stats["prompt_tokens"] == 12
+    assert stats["prefill_ms"] == 3.0
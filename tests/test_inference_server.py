@@ -0,0 +1,209 @@
+"""
+추론 서버 프로토콜 왕복과 클라이언트 로컬 대체(fallback) 테스트
+모델 대신 가짜 임베딩/OCR 구성 요소를 등록한 추론 서버를 스레드에서 실행합니다.
+"""
+import asyncio
+import os
+import socket
+import threading
+import time
+import numpy as np
+import pytest
+from services.embedding_service import EmbeddingService
+from services.inference_client import (
+    InferenceClient,
+    InferenceServerUnavailable,
+    RemoteEmbeddingService,
+    RemoteOCRPool
+)
+from services.inference_protocol import (
+    encode_frame,
+    pack_array,
+    pack_blobs,
+    read_frame,
+    unpack_array,
+    unpack_blobs
+)
+from services.inference_server import InferenceServer
+from services.ocr_pool import OCRQueueFullError
+from services.service_registry import ServiceNotReadyError, ServiceRegistry
+
+
+class LengthEmbedding:
+    """[글자 수, 1]을 임베딩으로 돌려줌"""
+
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, texts, batch_size=None):
+        self.encoded.append(list(texts))
+        return np.asarray([[float(len(text)), 1.0] for text in texts], dtype=np.float32)
+
+
+class FullOCRPool:
+    capacity = 3
+
+    async def extract_business_info(self, image_bytes):
+        raise OCRQueueFullError(9)
+
+    async def extract_business_info_batch(self, images):
+        return [{"info": {"size": len(image)}, "error": None} for image in images]
+
+
+def _fail_to_load():
+    raise RuntimeError("모델 로드 실패")
+
+
+def test_frame_round_trip_over_socket():
+    left, right = socket.socketpair()
+    try:
+        array = np.arange(6, dtype=np.float32).reshape(2, 3)
+        header, payload = pack_array(array)
+        left.sendall(encode_frame({**header, "op": "embed", "text": "한글", "score": np.float32(0.5)}, payload))
+
+        received_header, received_payload = read_frame(right)
+    finally:
+        left.close()
+        right.close()
+
+    assert received_header["op"] == "embed"
+    assert received_header["text"] == "한글"
+    assert received_header["score"] == 0.5
+    np.testing.assert_array_equal(unpack_array(received_header, received_payload), array)
+
+
+def test_blobs_round_trip():
+    blobs = [b"abc", b"", b"\x00\x01"]
+    header, payload = pack_blobs(blobs)
+
+    assert unpack_blobs(header, payload) == blobs
+    with pytest.raises(ValueError):
+        unpack_blobs(header, payload + b"x")
+
+
+@pytest.fixture
+def inference_server(tmp_path):
+    """가짜 구성 요소로 구성한 추론 서버를 백그라운드 스레드에서 실행"""
+    socket_path = str(tmp_path / "inference.sock")
+    server = InferenceServer(socket_path)
+    embedding = LengthEmbedding()
+    server.registry = ServiceRegistry()
+    server.registry.register("embedding", lambda: embedding)
+    server.registry.register("ocr", lambda: FullOCRPool())
+
+    loop = asyncio.new_event_loop()
+    task = loop.create_task(server.serve())
+
+    def run():
+        try:
+            loop.run_until_complete(task)
+        except asyncio.CancelledError:
+            pass
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 5
+    while not os.path.exists(socket_path):
+        assert time.monotonic() < deadline, "추론 서버가 시작되지 않았습니다."
+        time.sleep(0.01)
+
+    client = InferenceClient(socket_path=socket_path, timeout=5, max_connections=2)
+    yield server, client, embedding
+
+    client.close()
+    loop.call_soon_threadsafe(task.cancel)
+    thread.join(5)
+    loop.close()
+
+
+def test_remote_embedding_round_trip(inference_server):
+    _, client, embedding = inference_server
+    service = RemoteEmbeddingService(client, fallback=False)
+
+    result = service.encode(["가", "나다"])
+
+    np.testing.assert_array_equal(result, [[1.0, 1.0], [2.0, 1.0]])
+    assert embedding.encoded == [["가", "나다"]]
+    # 요청이 끝난 연결은 재사용
+    assert len(client._idle) == 1
+    service.encode(["라"])
+    assert len(client._idle) == 1
+
+
+def test_server_errors_map_to_client_exceptions(inference_server):
+    _, client, _ = inference_server
+    pool = RemoteOCRPool(client, fallback=False)
+
+    async def scenario():
+        with pytest.raises(OCRQueueFullError) as exc_info:
+            await pool.extract_business_info(b"image")
+        entries = await pool.extract_business_info_batch([b"a", b"bcd"])
+        return exc_info.value.retry_after, entries
+
+    try:
+        retry_after, entries = asyncio.run(scenario())
+    finally:
+        pool.shutdown()
+
+    assert retry_after == 9
+    assert [entry["info"]["size"] for entry in entries] == [1, 3]
+
+
+def test_component_not_ready_raises_service_not_ready(tmp_path):
+    socket_path = str(tmp_path / "inference.sock")
+    server = InferenceServer(socket_path)
+    server.registry = ServiceRegistry()
+    server.registry.register("embedding", _fail_to_load)
+
+    async def scenario():
+        serving = asyncio.ensure_future(server.serve())
+        while not os.path.exists(socket_path):
+            await asyncio.sleep(0.01)
+        client = InferenceClient(socket_path=socket_path, timeout=5, max_connections=1)
+        try:
+            await asyncio.to_thread(client.call, "embed", {"texts": ["가"]})
+        finally:
+            client.close()
+            serving.cancel()
+
+    with pytest.raises(ServiceNotReadyError):
+        asyncio.run(scenario())
+
+
+def test_remote_embedding_falls_back_to_local_model(tmp_path):
+    client = InferenceClient(socket_path=str(tmp_path / "missing.sock"), timeout=1, max_connections=1)
+    service = RemoteEmbeddingService(client, fallback=True)
+    local = LengthEmbedding()
+    service._local = local
+
+    result = service.encode(["가나"])
+
+    np.testing.assert_array_equal(result, [[2.0, 1.0]])
+    assert local.encoded == [["가나"]]
+
+
+def test_remote_embedding_without_fallback_raises(tmp_path):
+    client = InferenceClient(socket_path=str(tmp_path / "missing.sock"), timeout=1, max_connections=1)
+    service = RemoteEmbeddingService(client, fallback=False)
+
+    with pytest.raises(InferenceServerUnavailable):
+        service.encode(["가나"])
+
+
+def test_remote_embedding_query_cache_uses_model_and_backend_key(tmp_path, monkeypatch):
+    client = InferenceClient(socket_path=str(tmp_path / "missing.sock"), timeout=1, max_connections=1)
+    service = RemoteEmbeddingService(client, fallback=True)
+    local = LengthEmbedding()
+    service._local = local
+
+    first = service.encode_single("영업 시간이  어떻게 되나요?")
+    second = service.encode_single("영업 시간이 어떻게 되나요?")
+
+    np.testing.assert_array_equal(first, second)
+    assert len(local.encoded) == 1
+    assert service._query_cache_key("질문") == EmbeddingService._query_cache_key(service, "질문")
+    assert service._query_cache_key("질문")[:2] == (service.model_name, service.backend)
+
+    # 백엔드가 바뀌면 이전 임베딩을 재사용하지 않음
+    monkeypatch.setattr(service, "backend", "onnx")
+    assert service.get_cached_query("영업 시간이 어떻게 되나요?") is None
@@ -0,0 +1,142 @@
+"""
+NumPy 벡터 저장소 반영/검색/압축 테스트
+"""
+import os
+import numpy as np
+import pytest
+from services.numpy_store import NumpyVectorStore
+from services.vector_store import StoreDocumentDiff
+
+
+@pytest.fixture
+def store(tmp_path):
+    backend = NumpyVectorStore(str(tmp_path / "vectordb"))
+    backend.open()
+    yield backend
+    backend.close()
+
+
+def diff(store_id, added=None, kept=None, removed=None) -> StoreDocumentDiff:
+    return StoreDocumentDiff(store_id=store_id, added=added or {}, kept=kept or [], removed=removed or [])
+
+
+def matrix_files(store: NumpyVectorStore):
+    return sorted(
+        os.path.relpath(os.path.join(root, filename), store._vectors_directory)
+        for root, _, filenames in os.walk(store._vectors_directory)
+        for filename in filenames
+    )
+
+
+def test_apply_then_query_returns_nearest_documents(store):
+    store.apply(
+        [diff("cafe", added={"a": "라떼", "b": "케이크", "c": "주차"})],
+        {"a": [1.0, 0.0, 0.0], "b": [0.0, 2.0, 0.0], "c": [0.0, 0.0, 3.0]}
+    )
+
+    result = store.query("cafe", [[0.1, 1.0, 0.0]], n_results=2, include_embeddings=True)
+
+    assert result["ids"] == [["b", "a"]]
+    assert result["documents"] == [["케이크", "라떼"]]
+    assert result["distances"][0][0] == pytest.approx(1.0 - 1.0 / np.sqrt(1.01), abs=1e-6)
+    # 저장된 임베딩은 정규화되어 있음
+    np.testing.assert_allclose(result["embeddings"][0][0], [0.0, 1.0, 0.0])
+    assert store.stats() == {"stores": 1, "vectors": 3}
+
+
+def test_apply_keeps_rows_and_replaces_matrix_file(store):
+    store.apply([diff("cafe", added={"a": "라떼", "b": "케이크"})], {"a": [1.0, 0.0], "b": [0.0, 1.0]})
+    first_files = matrix_files(store)
+
+    store.apply([diff("cafe", added={"c": "쿠키"}, kept=["a"], removed=["b"])], {"c": [1.0, 1.0]})
+
+    assert store.existing_ids(["cafe"]) == {"cafe": {"a", "c"}}
+    result = store.query("cafe", [[0.0, 1.0]], n_results=5)
+    assert result["ids"] == [["c", "a"]]
+    # 이전 행렬 파일은 새 인덱스 커밋 후 삭제
+    assert len(matrix_files(store)) == 1
+    assert matrix_files(store) != first_files
+
+
+def test_apply_removing_everything_drops_store(store):
+    store.apply([diff("cafe", added={"a": "라떼"})], {"a": [1.0, 0.0]})
+
+    store.apply([diff("cafe", removed=["a"])], {})
+
+    assert store.stats() == {"stores": 0, "vectors": 0}
+    assert store.query("cafe", [[1.0, 0.0]], n_results=1)["ids"] == [[]]
+    assert matrix_files(store) == []
+
+
+def test_stores_are_isolated(store):
+    store.apply(
+        [diff("cafe", added={"a": "라떼"}), diff("bakery", added={"b": "소금빵"})],
+        {"a": [1.0, 0.0], "b": [1.0, 0.0]}
+    )
+
+    assert store.query("cafe", [[1.0, 0.0]], n_results=5)["ids"] == [["a"]]
+    store.delete_store("cafe")
+    assert store.query("cafe", [[1.0, 0.0]], n_results=5)["ids"] == [[]]
+    assert store.query("bakery", [[1.0, 0.0]], n_results=5)["ids"] == [["b"]]
+
+
+def test_float16_matrix_scores_in_float32(tmp_path):
+    backend = NumpyVectorStore(str(tmp_path / "vectordb"), dtype="float16")
+    backend.open()
+    try:
+        backend.apply([diff("cafe", added={"a": "라떼", "b": "케이크"})], {"a": [1.0, 0.0], "b": [0.6, 0.8]})
+        result = backend.query("cafe", [[1.0, 0.0]], n_results=2)
+    finally:
+        backend.close()
+
+    assert result["ids"] == [["a", "b"]]
+    assert result["distances"][0][1] == pytest.approx(0.4, abs=1e-3)
+
+
+def test_compact_removes_unreferenced_files(store):
+    store.apply([diff("cafe", added={"a": "라떼"})], {"a": [1.0, 0.0]})
+    referenced = matrix_files(store)
+    # 반영 도중 프로세스가 죽어 남은 파일
+    orphan = store._write_matrix(np.zeros((1, 2), dtype=np.float32))
+
+    store.compact()
+
+    assert matrix_files(store) == referenced
+    assert orphan not in matrix_files(store)
+    assert store.query("cafe", [[1.0, 0.0]], n_results=1)["ids"] == [["a"]]
+
+
+def test_data_survives_reopen(tmp_path):
+    directory = str(tmp_path / "vectordb")
+    backend = NumpyVectorStore(directory)
+    backend.open()
+    backend.apply([diff("cafe", added={"a": "라떼"})], {"a": [1.0, 0.0]})
+    backend.close()
+
+    reopened = NumpyVectorStore(directory)
+    reopened.open()
+    try:
+        assert reopened.query("cafe", [[1.0, 0.0]], n_results=1)["documents"] == [["라떼"]]
+    finally:
+        reopened.close()
+
+
+def test_query_reloads_matrix_rewritten_by_another_process(tmp_path):
+    directory = str(tmp_path / "vectordb")
+    worker_a = NumpyVectorStore(directory)
+    worker_b = NumpyVectorStore(directory)
+    worker_a.open()
+    worker_b.open()
+    try:
+        worker_a.apply([diff("cafe", added={"a": "라떼"})], {"a": [1.0, 0.0]})
+        assert worker_b.query("cafe", [[1.0, 0.0]], n_results=5)["ids"] == [["a"]]
+
+        # 다른 워커가 가게를 다시 쓰면 캐시된 행렬 대신 새 파일을 읽음
+        worker_a.apply([diff("cafe", added={"b": "케이크"}, removed=["a"])], {"b": [0.0, 1.0]})
+        assert worker_b.query("cafe", [[1.0, 0.0]], n_results=5)["documents"] == [["케이크"]]
+
+        worker_a.delete_store("cafe")
+        assert worker_b.query("cafe", [[1.0, 0.0]], n_results=5)["ids"] == [[]]
+    finally:
+        worker_a.close()
+        worker_b.close()
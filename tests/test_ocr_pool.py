@@ -0,0 +1,118 @@
+"""
+OCR 워커 풀 입장 제어(admission control)와 대기열 초과 시 503 응답 테스트
+워커 프로세스 대신 스레드 풀에서 작업을 실행합니다 (EasyOCR 로드 없음).
+"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from api import check_company
+from services.ocr_pool import OCRQueueFullError, OCRTimeoutError, OCRWorkerPool
+
+
+@pytest.fixture
+def make_pool():
+    pools = []
+
+    def make(workers: int = 1, max_queue: int = 1, job_timeout: float = 5) -> OCRWorkerPool:
+        pool = OCRWorkerPool(workers=workers, max_queue=max_queue, job_timeout=job_timeout)
+        pool._executor.shutdown(wait=False)
+        pool._executor = ThreadPoolExecutor(max_workers=workers)
+        pools.append(pool)
+        return pool
+
+    yield make
+    for pool in pools:
+        pool._executor.shutdown(wait=True)
+
+
+def test_acquire_slot_rejects_over_capacity(make_pool):
+    pool = make_pool(workers=2, max_queue=1)
+
+    pool._acquire_slot(2)
+    pool._acquire_slot()
+    with pytest.raises(OCRQueueFullError) as exc_info:
+        pool._acquire_slot()
+
+    assert exc_info.value.retry_after == pool.retry_after
+    assert pool.pending == pool.capacity == 3
+
+
+def test_submit_rejects_when_queue_full_and_releases_slots(make_pool):
+    pool = make_pool(workers=1, max_queue=1)
+    gate = threading.Event()
+
+    async def scenario():
+        running = [asyncio.ensure_future(pool.submit(gate.wait, 5)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        with pytest.raises(OCRQueueFullError):
+            await pool.submit(gate.wait, 5)
+        gate.set()
+        await asyncio.gather(*running)
+
+    asyncio.run(scenario())
+
+    assert pool.pending == 0
+
+
+def test_submit_waits_for_slot_when_requested(make_pool):
+    pool = make_pool(workers=1, max_queue=0)
+    gate = threading.Event()
+
+    async def scenario():
+        first = asyncio.ensure_future(pool.submit(gate.wait, 5))
+        await asyncio.sleep(0.01)
+        second = asyncio.ensure_future(pool.submit(lambda: "done", wait_for_slot=True))
+        await asyncio.sleep(0.01)
+        assert not second.done()
+        gate.set()
+        await first
+        return await second
+
+    assert asyncio.run(scenario()) == "done"
+    assert pool.pending == 0
+
+
+def test_submit_times_out_but_keeps_slot_until_job_finishes(make_pool):
+    pool = make_pool(workers=1, max_queue=0, job_timeout=0.01)
+    gate = threading.Event()
+
+    async def scenario():
+        with pytest.raises(OCRTimeoutError):
+            await pool.submit(gate.wait, 5)
+        # 워커에서 아직 실행 중이므로 슬롯을 반환하지 않음
+        assert pool.pending == 1
+        gate.set()
+
+    asyncio.run(scenario())
+    pool._executor.shutdown(wait=True)
+
+    assert pool.pending == 0
+
+
+class PassThroughCache:
+    async def get_or_extract(self, image_bytes, extract):
+        return await extract(image_bytes)
+
+
+class FullPool:
+    async def extract_business_info(self, image_bytes):
+        raise OCRQueueFullError(7)
+
+
+def test_ocr_route_returns_503_with_retry_after(monkeypatch):
+    monkeypatch.setattr(check_company, "get_ocr_cache", lambda: PassThroughCache())
+    monkeypatch.setattr(check_company, "get_ocr_pool", lambda: FullPool())
+    app = FastAPI()
+    app.include_router(check_company.router)
+
+    with TestClient(app) as client:
+        response = client.post(
+            "/company/ocr",
+            files={"file": ("license.png", b"\x89PNG", "image/png")}
+        )
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "7"
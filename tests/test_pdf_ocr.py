@@ -0,0 +1,121 @@
+"""
+PDF OCR 페이지 병렬 처리 한도와 /company/pdf-ocr 응답 테스트
+OCR 워커 풀 대신 인식 중인 페이지 수를 기록하는 가짜 풀을 사용합니다.
+"""
+import asyncio
+import io
+import json
+import pypdfium2 as pdfium
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from api import check_company
+from services.ocr_pool import OCRQueueFullError
+from services.pdf_service import PDFOCRService
+
+
+def make_pdf(page_count: int) -> bytes:
+    pdf = pdfium.PdfDocument.new()
+    for _ in range(page_count):
+        pdf.new_page(72, 72)
+    buffer = io.BytesIO()
+    pdf.save(buffer)
+    pdf.close()
+    return buffer.getvalue()
+
+
+class RecordingPool:
+    """동시에 인식 중인 페이지 수와 슬롯 대기 여부를 기록"""
+
+    def __init__(self, reject_first: bool = False, hold_rest: bool = False):
+        self.reject_first = reject_first
+        self.hold_rest = hold_rest
+        self.active = 0
+        self.peak = 0
+        self.wait_flags = []
+        self.cancelled = 0
+
+    async def extract_page_text(self, image, wait_for_slot: bool = False):
+        if self.reject_first and not wait_for_slot:
+            raise OCRQueueFullError(3)
+        self.wait_flags.append(wait_for_slot)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            if self.hold_rest and wait_for_slot:
+                await asyncio.Event().wait()
+            await asyncio.sleep(0.01)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.active -= 1
+        page = len(self.wait_flags)
+        return {"text": f"page {page}", "results": []}
+
+
+def test_iter_pages_bounds_pages_in_flight():
+    pool = RecordingPool()
+    service = PDFOCRService(pool, dpi=72, max_pages_in_flight=2)
+
+    async def scenario():
+        return [page async for page in service.iter_pages(make_pdf(5))]
+
+    pages = asyncio.run(scenario())
+
+    assert [page["page_number"] for page in pages] == [1, 2, 3, 4, 5]
+    assert pool.peak == 2
+    # 첫 페이지만 대기열이 가득 차면 거절, 나머지는 슬롯을 기다림
+    assert pool.wait_flags == [False, True, True, True, True]
+
+
+def test_closing_iterator_cancels_pages_in_flight():
+    pool = RecordingPool(hold_rest=True)
+    service = PDFOCRService(pool, dpi=72, max_pages_in_flight=3)
+
+    async def scenario():
+        pages = service.iter_pages(make_pdf(5))
+        first = await pages.__anext__()
+        await pages.aclose()
+        await asyncio.sleep(0)
+        return first
+
+    first = asyncio.run(scenario())
+
+    assert first["page_number"] == 1
+    assert pool.cancelled == 2
+
+
+@pytest.fixture
+def pdf_client(monkeypatch):
+    def make(pool):
+        monkeypatch.setattr(check_company, "get_ocr_pool", lambda: pool)
+        app = FastAPI()
+        app.include_router(check_company.router)
+        return TestClient(app)
+
+    return make
+
+
+def test_pdf_ocr_streams_pages_as_ndjson(pdf_client):
+    with pdf_client(RecordingPool()) as client:
+        response = client.post(
+            "/company/pdf-ocr?stream=true",
+            files={"file": ("doc.pdf", make_pdf(3), "application/pdf")}
+        )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["page_number"] for line in lines] == [1, 2, 3]
+
+
+def test_pdf_ocr_rejects_when_first_page_queue_full(pdf_client):
+    with pdf_client(RecordingPool(reject_first=True)) as client:
+        response = client.post(
+            "/company/pdf-ocr",
+            files={"file": ("doc.pdf", make_pdf(2), "application/pdf")}
+        )
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "3"
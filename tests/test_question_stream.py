@@ -0,0 +1,84 @@
+"""
+/store/question/stream SSE 이벤트 형식 테스트
+"""
+import json
+from typing import List, Tuple
+from api.store_routes import _sse_event
+
+
+def parse_events(body: str) -> List[Tuple[str, dict]]:
+    """SSE 본문을 (이벤트 이름, data) 목록으로 변환 (이름이 없으면 message)"""
+    events = []
+    for block in body.split("\n\n"):
+        if not block.strip():
+            continue
+        name, data = "message", None
+        for line in block.split("\n"):
+            field, _, value = line.partition(": ")
+            if field == "event":
+                name = value
+            elif field == "data":
+                data = json.loads(value)
+        events.append((name, data))
+    return events
+
+
+def register(client, store_id: str, description: str) -> None:
+    response = client.post("/store/register", json={"store_id": store_id, "description": description})
+    assert response.status_code == 200, response.text
+
+
+def test_sse_event_framing():
+    assert _sse_event({"token": "안녕"}) == 'data: {"token": "안녕"}\n\n'
+    assert _sse_event({"detail": "x"}, event="error") == 'event: error\ndata: {"detail": "x"}\n\n'
+
+
+def test_sse_event_keeps_newlines_inside_json():
+    message = _sse_event({"token": "첫 줄\n둘째 줄"})
+    assert message.count("\n") == 2
+    assert parse_events(message) == [("message", {"token": "첫 줄\n둘째 줄"})]
+
+
+def test_stream_sends_tokens_then_done(store_api):
+    register(store_api.client, "s1", "매일 10시에 문을 엽니다.\n주차는 건물 지하에 가능합니다.")
+
+    response = store_api.client.post("/store/question/stream", json={"store_id": "s1", "question": "몇 시에 열어요?"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.headers["cache-control"] == "no-cache"
+    events = parse_events(response.text)
+    assert events[:-1] == [("message", {"token": token}) for token in store_api.gemma.tokens]
+    name, done = events[-1]
+    assert name == "done"
+    assert done["answer"] == "".join(store_api.gemma.tokens)
+    assert done["source"] == "llm"
+
+
+def test_stream_second_request_served_from_answer_cache(store_api):
+    register(store_api.client, "s1", "매일 10시에 문을 엽니다.")
+    question = {"store_id": "s1", "question": "몇 시에 열어요?"}
+
+    store_api.client.post("/store/question/stream", json=question)
+    events = parse_events(store_api.client.post("/store/question/stream", json=question).text)
+
+    assert events[0] == ("message", {"token": "".join(store_api.gemma.tokens)})
+    assert events[-1][1]["source"] == "cache"
+    assert len(store_api.gemma.calls) == 1
+
+
+def test_stream_error_mid_generation_sends_error_event(store_api):
+    register(store_api.client, "s1", "매일 10시에 문을 엽니다.")
+    store_api.gemma.stream_error = RuntimeError("연결 끊김")
+
+    response = store_api.client.post("/store/question/stream", json={"store_id": "s1", "question": "몇 시에 열어요?"})
+
+    events = parse_events(response.text)
+    assert [name for name, _ in events] == ["message", "message", "error"]
+    assert "연결 끊김" in events[-1][1]["detail"]
+
+
+def test_stream_unknown_store_fails_before_streaming(store_api):
+    response = store_api.client.post("/store/question/stream", json={"store_id": "none", "question": "몇 시에 열어요?"})
+
+    assert response.status_code == 404
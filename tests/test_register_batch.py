@@ -0,0 +1,54 @@
+"""
+/store/register-batch 일괄 등록 테스트
+"""
+from services.faq import faq_store_id
+
+
+def register_batch(client, stores):
+    response = client.post("/store/register-batch", json={"stores": stores})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_register_batch_embeds_all_new_sentences_at_once(store_api):
+    body = register_batch(store_api.client, [
+        {"store_id": "cafe", "description": "라떼가 맛있습니다.\n매일 10시에 엽니다."},
+        {"store_id": "bakery", "description": "소금빵을 굽습니다."},
+    ])
+
+    assert body["succeeded"] == 2
+    assert body["failed"] == 0
+    assert [item["added_count"] for item in body["results"]] == [2, 1]
+    assert len(store_api.embedding.encoded) == 1
+    assert sorted(store_api.embedding.encoded[0]) == sorted(
+        ["라떼가 맛있습니다.", "매일 10시에 엽니다.", "소금빵을 굽습니다."]
+    )
+
+
+def test_register_batch_reports_failures_per_store(store_api):
+    body = register_batch(store_api.client, [
+        {"store_id": "cafe", "description": "라떼가 맛있습니다."},
+        {"store_id": faq_store_id("cafe"), "description": "잘못된 ID"},
+        {"store_id": "empty", "description": "   "},
+    ])
+
+    assert body["succeeded"] == 1
+    assert body["failed"] == 2
+    results = body["results"]
+    assert results[0]["success"] is True
+    assert results[1]["success"] is False and results[1]["error"]
+    assert results[2]["success"] is False and results[2]["error"]
+
+
+def test_register_batch_only_embeds_changed_sentences(store_api):
+    register_batch(store_api.client, [
+        {"store_id": "cafe", "description": "라떼가 맛있습니다.\n매일 10시에 엽니다."},
+    ])
+
+    body = register_batch(store_api.client, [
+        {"store_id": "cafe", "description": "라떼가 맛있습니다.\n매일 11시에 엽니다."},
+    ])
+
+    item = body["results"][0]
+    assert (item["added_count"], item["kept_count"], item["removed_count"]) == (1, 1, 1)
+    assert store_api.embedding.encoded[-1] == ["매일 11시에 엽니다."]
@@ -0,0 +1,198 @@
+"""
+등록 작업 큐의 작업 가져가기(claim) / 리스 연장 / 이전 실행 결과 무시 테스트
+"""
+import asyncio
+import pytest
+from services import registration_jobs as jobs_module
+from services.registration_jobs import RegistrationJobQueue, RegistrationJobStore
+from services.service_registry import ServiceNotReadyError
+
+
+class FakeClock:
+    """time.time 대체 (테스트에서 시간을 직접 진행)"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(jobs_module, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = RegistrationJobStore(str(tmp_path / "jobs.sqlite3"), lease_seconds=10, max_attempts=2)
+    yield store
+    store.close()
+
+
+def test_claim_takes_oldest_job_once(store, clock):
+    first = store.enqueue("cafe", {"n": 1})
+    clock.now += 1
+    second = store.enqueue("bakery", {"n": 2})
+
+    claimed = [store.claim(), store.claim(), store.claim()]
+
+    assert [job.job_id if job else None for job in claimed] == [first.job_id, second.job_id, None]
+    assert claimed[0].status == "running"
+    assert claimed[0].attempts == 1
+    assert store.counts() == {"queued": 0, "running": 2, "succeeded": 0, "failed": 0}
+
+
+def test_claim_keeps_store_order(store, clock):
+    first = store.enqueue("cafe", {"n": 1})
+    clock.now += 1
+    store.enqueue("cafe", {"n": 2})
+
+    running = store.claim()
+
+    # 같은 가게의 작업이 실행 중이면 다음 작업은 기다림
+    assert running.job_id == first.job_id
+    assert store.claim() is None
+    assert store.complete(running, {"ok": True})
+    assert store.claim().request == {"n": 2}
+
+
+def test_expired_lease_requeues_then_fails_after_max_attempts(store, clock):
+    job = store.enqueue("cafe", {})
+
+    store.claim()
+    clock.now += 11
+    retried = store.claim()
+    assert retried.job_id == job.job_id
+    assert retried.attempts == 2
+
+    clock.now += 11
+    assert store.claim() is None
+    failed = store.get(job.job_id)
+    assert failed.status == "failed"
+    assert failed.error
+
+
+def test_renew_extends_lease(store, clock):
+    store.enqueue("cafe", {})
+    job = store.claim()
+
+    clock.now += 8
+    assert store.renew(job)
+    clock.now += 8
+
+    assert store.claim() is None
+    assert store.get(job.job_id).status == "running"
+
+
+def test_stale_run_cannot_renew_or_complete(store, clock):
+    store.enqueue("cafe", {})
+    old = store.claim()
+    clock.now += 11
+    new = store.claim()
+
+    assert not store.renew(old)
+    assert not store.complete(old, {"from": "old"})
+    assert not store.fail(old, "이전 실행")
+    assert store.complete(new, {"from": "new"})
+
+    finished = store.get(new.job_id)
+    assert finished.status == "succeeded"
+    assert finished.result == {"from": "new"}
+
+
+def test_release_does_not_count_attempt(store, clock):
+    store.enqueue("cafe", {})
+    job = store.claim()
+
+    store.release(job)
+
+    again = store.claim()
+    assert again.attempts == 1
+
+
+def test_queue_runs_jobs_and_stores_results(tmp_path):
+    async def scenario():
+        store = RegistrationJobStore(str(tmp_path / "jobs.sqlite3"), lease_seconds=10, max_attempts=2)
+        queue = RegistrationJobQueue(store=store, concurrency=2, poll_interval=0.05, retention_seconds=0)
+
+        async def handler(request):
+            if request.get("fail"):
+                raise ValueError("등록 실패")
+            return {"store_id": request["store_id"]}
+
+        queue.start(handler)
+        try:
+            ok = await queue.enqueue("cafe", {"store_id": "cafe"})
+            bad = await queue.enqueue("bakery", {"store_id": "bakery", "fail": True})
+            for _ in range(100):
+                jobs = [await queue.get(ok.job_id), await queue.get(bad.job_id)]
+                if all(job.status in ("succeeded", "failed") for job in jobs):
+                    return jobs
+                await asyncio.sleep(0.02)
+            raise AssertionError("작업이 끝나지 않았습니다.")
+        finally:
+            await queue.aclose()
+
+    ok, bad = asyncio.run(scenario())
+
+    assert (ok.status, ok.result) == ("succeeded", {"store_id": "cafe"})
+    assert (bad.status, bad.error) == ("failed", "등록 실패")
+
+
+def test_queue_heartbeat_keeps_long_job_leased(tmp_path):
+    async def scenario():
+        store = RegistrationJobStore(str(tmp_path / "jobs.sqlite3"), lease_seconds=0.3, max_attempts=3)
+        queue = RegistrationJobQueue(store=store, concurrency=2, poll_interval=0.05, retention_seconds=0)
+        runs = []
+
+        async def handler(request):
+            runs.append(request)
+            await asyncio.sleep(1.0)
+            return {"ok": True}
+
+        queue.start(handler)
+        try:
+            job = await queue.enqueue("cafe", {})
+            await asyncio.sleep(1.3)
+            return await queue.get(job.job_id), runs
+        finally:
+            await queue.aclose()
+
+    job, runs = asyncio.run(scenario())
+
+    # 리스보다 오래 걸려도 다른 워커가 다시 가져가지 않음
+    assert job.status == "succeeded"
+    assert job.attempts == 1
+    assert len(runs) == 1
+
+
+def test_queue_releases_job_when_service_not_ready(tmp_path):
+    async def scenario():
+        store = RegistrationJobStore(str(tmp_path / "jobs.sqlite3"), lease_seconds=10, max_attempts=2)
+        queue = RegistrationJobQueue(store=store, concurrency=1, poll_interval=0.02, retention_seconds=0)
+        calls = []
+
+        async def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                raise ServiceNotReadyError("embedding", "loading")
+            return {"ok": True}
+
+        queue.start(handler)
+        try:
+            job = await queue.enqueue("cafe", {})
+            for _ in range(100):
+                current = await queue.get(job.job_id)
+                if current.status == "succeeded":
+                    return current
+                await asyncio.sleep(0.02)
+            raise AssertionError("작업이 끝나지 않았습니다.")
+        finally:
+            await queue.aclose()
+
+    job = asyncio.run(scenario())
+
+    assert job.attempts == 1
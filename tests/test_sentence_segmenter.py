@@ -0,0 +1,64 @@
+"""
+KoreanSentenceSegmenter 경계 사례 테스트
+"""
+from services.sentence_segmenter import KoreanSentenceSegmenter
+
+
+def make_segmenter(min_chars: int = 4, max_chars: int = 80) -> KoreanSentenceSegmenter:
+    return KoreanSentenceSegmenter(min_chars=min_chars, max_chars=max_chars)
+
+
+def test_splits_on_punctuation_and_endings_without_punctuation():
+    text = "저희 가게는 강남역 근처에 있습니다 매일 10시에 문을 엽니다. 주차도 가능해요 편하게 오세요!"
+
+    assert make_segmenter().split(text) == [
+        "저희 가게는 강남역 근처에 있습니다",
+        "매일 10시에 문을 엽니다.",
+        "주차도 가능해요",
+        "편하게 오세요!",
+    ]
+
+
+def test_strips_bullets_and_treats_lines_as_boundaries():
+    text = "- 영업시간: 10시~22시\n• 매주 월요일 휴무\n1. 포장 가능\n2) 배달 가능"
+
+    assert make_segmenter().split(text) == [
+        "영업시간: 10시~22시",
+        "매주 월요일 휴무",
+        "포장 가능",
+        "배달 가능",
+    ]
+
+
+def test_does_not_split_decimal_numbers_or_times():
+    assert make_segmenter().split("커피는 4.5천원부터 시작합니다.") == ["커피는 4.5천원부터 시작합니다."]
+
+
+def test_merges_short_fragments_with_previous_sentence():
+    assert make_segmenter(min_chars=4).split("맛있어요. 네. 또 오세요.") == ["맛있어요. 네.", "또 오세요."]
+
+
+def test_short_first_fragment_merges_with_next():
+    assert make_segmenter(min_chars=4).split("네. 맛있어요.") == ["네. 맛있어요."]
+
+
+def test_long_sentence_split_at_clause_boundaries():
+    text = "파스타와 피자를 주로 판매하며, 주말에는 브런치 메뉴도 준비하고 있고 단체 예약도 받고 있습니다."
+    sentences = make_segmenter(max_chars=30).split(text)
+
+    assert len(sentences) > 1
+    assert all(len(sentence) <= 30 for sentence in sentences)
+    assert " ".join(sentences) == text
+
+
+def test_empty_and_blank_text():
+    assert make_segmenter().split("") == []
+    assert make_segmenter().split(" \n\n  - \n") == []
+
+
+def test_is_unstructured():
+    segmenter = make_segmenter(max_chars=20)
+
+    assert not segmenter.is_unstructured("짧은 소개")
+    assert segmenter.is_unstructured("가" * 50)
+    assert not segmenter.is_unstructured("매일 10시에 엽니다. 주차 가능해요. 예약은 전화로 받습니다.")
@@ -0,0 +1,93 @@
+"""
+SingleFlight 결과 공유 / 예외 전파 테스트
+"""
+import asyncio
+import pytest
+from services.single_flight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    async def scenario():
+        flight = SingleFlight("test")
+        calls = 0
+        release = asyncio.Event()
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return "answer"
+
+        waiters = [asyncio.ensure_future(flight.do("key", work)) for _ in range(3)]
+        await asyncio.sleep(0)
+        assert flight.in_flight == 1
+        release.set()
+        results = await asyncio.gather(*waiters)
+        return flight, calls, results
+
+    flight, calls, results = asyncio.run(scenario())
+
+    assert calls == 1
+    assert results == ["answer"] * 3
+    assert flight.stats() == {"in_flight": 0, "executions": 1, "coalesced": 2}
+
+
+def test_different_keys_run_separately():
+    async def scenario():
+        flight = SingleFlight("test")
+
+        async def work(value):
+            await asyncio.sleep(0)
+            return value
+
+        return await asyncio.gather(flight.do("a", lambda: work(1)), flight.do("b", lambda: work(2)))
+
+    assert asyncio.run(scenario()) == [1, 2]
+
+
+def test_exception_propagates_to_all_waiters_and_is_not_cached():
+    async def scenario():
+        flight = SingleFlight("test")
+        release = asyncio.Event()
+
+        async def fail():
+            await release.wait()
+            raise ValueError("boom")
+
+        waiters = [asyncio.ensure_future(flight.do("key", fail)) for _ in range(2)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*waiters, return_exceptions=True)
+
+        async def succeed():
+            return "ok"
+
+        # 실패한 작업은 남지 않으므로 다음 호출은 새로 실행
+        retry = await flight.do("key", succeed)
+        return results, retry
+
+    results, retry = asyncio.run(scenario())
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert retry == "ok"
+
+
+def test_cancelled_waiter_does_not_cancel_shared_work():
+    async def scenario():
+        flight = SingleFlight("test")
+        release = asyncio.Event()
+
+        async def work():
+            await release.wait()
+            return "done"
+
+        first = asyncio.ensure_future(flight.do("key", work))
+        second = asyncio.ensure_future(flight.do("key", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        release.set()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(scenario()) == "done"
@@ -0,0 +1,134 @@
+"""
+VectorDBService 변경분 계산 테스트 (메모리 백엔드 사용)
+"""
+from typing import Any, Dict, List, Set
+from services.vector_store import StoreDocumentDiff, VectorStoreBackend, empty_query_result
+from services.vectordb_service import VectorDBService
+
+
+class MemoryVectorStore(VectorStoreBackend):
+    """{store_id: {문서 ID: 문장}}만 보관하는 테스트용 백엔드"""
+
+    name = "memory"
+
+    def __init__(self):
+        super().__init__(persist_directory="", persistent=False)
+        self.documents: Dict[str, Dict[str, str]] = {}
+        self.applied: List[List[StoreDocumentDiff]] = []
+
+    def open(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def stats(self) -> Dict[str, int]:
+        return {"stores": len(self.documents), "vectors": sum(len(d) for d in self.documents.values())}
+
+    def existing_ids(self, store_ids: List[str]) -> Dict[str, Set[str]]:
+        return {store_id: set(self.documents.get(store_id, {})) for store_id in store_ids}
+
+    def apply(self, diffs: List[StoreDocumentDiff], embeddings: Dict[str, List[float]]) -> None:
+        self.applied.append(diffs)
+        for diff in diffs:
+            documents = self.documents.setdefault(diff.store_id, {})
+            for doc_id in diff.removed:
+                documents.pop(doc_id)
+            for doc_id, document in diff.added.items():
+                assert doc_id in embeddings
+                documents[doc_id] = document
+
+    def delete_store(self, store_id: str) -> None:
+        self.documents.pop(store_id, None)
+
+    def query(self, store_id, query_embeddings, n_results, include_embeddings=False) -> Dict[str, Any]:
+        return empty_query_result()
+
+    def snapshot(self, target: str) -> None:
+        pass
+
+    def compact(self) -> None:
+        pass
+
+
+def register(service: VectorDBService, store_id: str, documents: List[str]) -> StoreDocumentDiff:
+    diff = service.plan_update(store_id, documents)
+    service.apply_updates([diff], {doc_id: [0.0] for doc_id in diff.added})
+    return diff
+
+
+def test_sentence_id_ignores_whitespace_and_is_store_scoped():
+    assert VectorDBService.sentence_id("s1", "주차  가능합니다 ") == VectorDBService.sentence_id("s1", "주차 가능합니다")
+    assert VectorDBService.sentence_id("s1", "주차 가능합니다") != VectorDBService.sentence_id("s2", "주차 가능합니다")
+    assert VectorDBService.sentence_id("s1", "주차 가능합니다").startswith("s1_")
+
+
+def test_plan_for_new_store_adds_everything_once():
+    service = VectorDBService(backend=MemoryVectorStore())
+
+    diff = service.plan_update("s1", ["가", "나", "가"])
+
+    assert sorted(diff.added.values()) == ["가", "나"]
+    assert diff.kept == []
+    assert diff.removed == []
+
+
+def test_plan_diff_added_kept_removed():
+    backend = MemoryVectorStore()
+    service = VectorDBService(backend=backend)
+    register(service, "s1", ["가", "나", "다"])
+
+    diff = service.plan_update("s1", ["나", "다", "라"])
+
+    assert list(diff.added.values()) == ["라"]
+    assert sorted(diff.kept) == sorted(service.sentence_id("s1", s) for s in ["나", "다"])
+    assert diff.removed == [service.sentence_id("s1", "가")]
+    assert diff.changed
+
+
+def test_plan_unchanged_store_is_not_changed():
+    service = VectorDBService(backend=MemoryVectorStore())
+    register(service, "s1", ["가", "나"])
+
+    diff = service.plan_update("s1", ["나", "가"])
+
+    assert not diff.changed
+    assert len(diff.kept) == 2
+
+
+def test_plan_updates_multiple_stores_independently():
+    service = VectorDBService(backend=MemoryVectorStore())
+    register(service, "s1", ["가"])
+
+    diffs = service.plan_updates({"s1": ["나"], "s2": ["가"]})
+
+    assert list(diffs["s1"].added.values()) == ["나"]
+    assert diffs["s1"].removed == [service.sentence_id("s1", "가")]
+    assert list(diffs["s2"].added.values()) == ["가"]
+    assert diffs["s2"].removed == []
+
+
+def test_apply_rebases_stale_plans_to_last_writer():
+    backend = MemoryVectorStore()
+    service = VectorDBService(backend=backend)
+    register(service, "s1", ["가"])
+
+    # 두 요청이 같은 이전 상태로 계산한 뒤 차례로 반영
+    first = service.plan_update("s1", ["나"])
+    second = service.plan_update("s1", ["다"])
+    service.apply_updates([first], {doc_id: [0.0] for doc_id in first.added})
+    service.apply_updates([second], {doc_id: [0.0] for doc_id in second.added})
+
+    assert sorted(backend.documents["s1"].values()) == ["다"]
+    assert sorted(second.removed) == [service.sentence_id("s1", "나")]
+
+
+def test_change_listener_called_only_for_changed_stores():
+    service = VectorDBService(backend=MemoryVectorStore())
+    changed = []
+    service.add_change_listener(changed.append)
+
+    register(service, "s1", ["가"])
+    register(service, "s1", ["가"])
+
+    assert changed == ["s1"]